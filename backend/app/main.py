@@ -1,10 +1,39 @@
-from fastapi import FastAPI, HTTPException
+import asyncio
+import codecs
+import json
+import logging
+import os
+import sqlite3
+import time
+from fastapi import FastAPI, File, HTTPException, Query, Request, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List
-from pydantic import BaseModel
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from starlette.routing import Match
+from typing import Any, Dict, List, Literal, Optional, Set, Tuple
+from pydantic import BaseModel, Field
 from .models.user import UserProfile
-from .services.db import DatabaseService
+from .services.storage import create_database_service
 from .services.groq_search import GroqSearchService
+from .services.keyword_index import KeywordIndex, tokenize
+from .services.facets import FACET_FIELDS, FacetClause, FacetIndex
+from .services.taxonomy import taxonomy
+from .services.embeddings import HashingEmbedder, VectorIndex
+from .services.vector_store import VectorStore
+from .services.neighbors import NeighborIndex
+from .services.retrieval import CandidateRetriever
+from .services.search_cache import SearchCache
+from .services.concurrency import ConcurrencyLimiter, Overloaded, SingleFlight, run_blocking
+from .services.groq_clients import hash_api_key
+from .services.bulk_import import BulkImporter, detect_format, iter_records
+from .services.serialization import FastJSONResponse, dumps
+from .services.metrics import REQUEST_DURATION, REQUESTS_TOTAL, format_spans, registry, request_spans, span
+
+# Log verbosity is controlled by LOG_LEVEL (DEBUG, INFO, WARNING, ...)
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+)
+logger = logging.getLogger(__name__)
 
 app = FastAPI(title="100xEngineers Discovery Platform")
 
@@ -15,68 +44,529 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Total-Count"],
 )
 
+# Requests slower than this are logged at INFO with their per-stage timings
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "1000"))
+
+def _route_template(request: Request) -> str:
+    """Route path with placeholders (e.g. /api/profiles/{profile_id}) so metrics labels stay bounded."""
+    for route in request.app.routes:
+        match, _ = route.matches(request.scope)
+        if match == Match.FULL:
+            return route.path
+    return "unmatched"
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    with request_spans() as spans:
+        start = time.perf_counter()
+        response = await call_next(request)
+        elapsed = time.perf_counter() - start
+    route = _route_template(request)
+    status = str(response.status_code)
+    REQUEST_DURATION.observe(elapsed, request.method, route, status)
+    REQUESTS_TOTAL.inc(request.method, route, status)
+    # Only slow requests are logged above DEBUG so the hot path does not pay for a log line per request
+    level = logging.INFO if elapsed * 1000 >= SLOW_REQUEST_MS else logging.DEBUG
+    logger.log(level, "%s %s %s %.1fms %s", request.method, route, status, elapsed * 1000, format_spans(spans))
+    return response
+
 # Initialize services
-db = DatabaseService()
+db = create_database_service()
 groq_service = GroqSearchService()
+keyword_index = KeywordIndex()
+vector_index = VectorIndex(store=VectorStore.from_env(HashingEmbedder().dim))
+facet_index = FacetIndex()
+candidate_retriever = CandidateRetriever(keyword_index, vector_index)
+# Neighbours precomputed per profile for GET /api/profiles/{id}/similar
+SIMILAR_PROFILES_K = int(os.getenv("SIMILAR_PROFILES_K", "20"))
+neighbor_index = NeighborIndex(
+    vector_index,
+    max_neighbors=SIMILAR_PROFILES_K,
+    tag_weight=float(os.getenv("SIMILAR_TAG_WEIGHT", "0.5")),
+    max_cached=int(os.getenv("SIMILAR_TABLE_SIZE", "10000")),
+)
+
+# Optional path for persisting the keyword index between restarts (profile vectors use VECTOR_INDEX_PATH)
+KEYWORD_INDEX_SNAPSHOT = os.getenv("KEYWORD_INDEX_SNAPSHOT")
+SEMANTIC_SEARCH_LIMIT = int(os.getenv("SEMANTIC_SEARCH_LIMIT", "20"))
+KEYWORD_SEARCH_LIMIT = int(os.getenv("KEYWORD_SEARCH_LIMIT", "20"))
+# Number of shortlisted profiles sent to Groq when the request does not set candidate_k
+GROQ_CANDIDATE_K = int(os.getenv("GROQ_CANDIDATE_K", "50"))
+
+search_cache = SearchCache(
+    max_entries=int(os.getenv("SEARCH_CACHE_SIZE", "1000")),
+    ttl_seconds=float(os.getenv("SEARCH_CACHE_TTL", "3600")),
+    path=os.getenv("SEARCH_CACHE_PATH"),
+)
+
+# Identical concurrent Groq searches share one call; distinct ones are capped globally and per API key
+search_flights = SingleFlight()
+search_limiter = ConcurrencyLimiter.from_env()
+
+# Seconds between syncs of the in-memory profile store with the database (0 disables)
+PROFILE_RECONCILE_INTERVAL = float(os.getenv("PROFILE_RECONCILE_INTERVAL", "60"))
+reconcile_task: asyncio.Task | None = None
+
+registry.gauge("search_cache_hits", "Search cache hits since startup", lambda: search_cache.stats()["hits"])
+registry.gauge("search_cache_misses", "Search cache misses since startup", lambda: search_cache.stats()["misses"])
+registry.gauge("search_cache_entries", "Entries in the search cache", lambda: search_cache.stats()["size"])
+registry.gauge("profile_store_size", "Profiles held in the in-memory store", lambda: db.profile_store.stats()["size"])
+registry.gauge("profile_store_hit_rate", "Profile store lookup hit rate", lambda: db.profile_store.stats()["hit_rate"])
+registry.gauge("keyword_index_profiles", "Profiles in the keyword index", lambda: len(keyword_index))
+registry.gauge("similar_profiles_cached", "Profiles with a cached neighbour list", lambda: neighbor_index.cached())
+registry.gauge("groq_clients", "Pooled Groq clients", lambda: groq_service.client_registry.stats()["clients"])
+registry.gauge("search_coalesced", "Groq searches that joined an identical in-flight search", lambda: search_flights.joined)
+registry.gauge("search_active", "Groq searches holding a concurrency slot", lambda: search_limiter.active)
+registry.gauge("search_queued", "Groq searches waiting for a concurrency slot", lambda: search_limiter.waiting)
+registry.gauge("search_rejected", "Groq searches rejected with 429 since startup", lambda: search_limiter.rejected)
+
+def index_profiles(profiles: List[UserProfile]) -> None:
+    for profile in profiles:
+        keyword_index.add(profile)
+        vector_index.add(profile)
+        facet_index.add(profile)
+        neighbor_index.add(profile)
+
+async def reconcile_profiles() -> None:
+    """Pick up profiles written by other processes and add them to the search indexes."""
+    try:
+        new_profiles = await db.reconcile_async()
+    except Exception as e:
+        logger.warning("Profile reconciliation failed: %s", e)
+        return
+    if new_profiles:
+        await run_blocking(index_profiles, new_profiles)
+        logger.info("Reconciled %d new profiles from the database", len(new_profiles))
+
+async def reconcile_periodically() -> None:
+    while True:
+        await asyncio.sleep(PROFILE_RECONCILE_INTERVAL)
+        await reconcile_profiles()
+
+@app.on_event("startup")
+async def build_search_indexes():
+    global vector_index
+    loaded = False
+    if KEYWORD_INDEX_SNAPSHOT and os.path.exists(KEYWORD_INDEX_SNAPSHOT):
+        try:
+            keyword_index.load_snapshot(KEYWORD_INDEX_SNAPSHOT)
+            loaded = True
+            logger.info("Loaded keyword index snapshot with %d profiles", len(keyword_index))
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Failed to load keyword index snapshot: %s", e)
+    if loaded:
+        # Seed the profile store from the snapshot and fetch only what it is missing
+        db.seed(keyword_index.profiles())
+        for profile in await db.reconcile_async():
+            keyword_index.add(profile)
+        profiles = keyword_index.profiles()
+    else:
+        profiles = await db.warm_async()
+        keyword_index.build(profiles)
+        logger.info("Built keyword index with %d profiles", len(keyword_index))
+        if KEYWORD_INDEX_SNAPSHOT:
+            keyword_index.save_snapshot(KEYWORD_INDEX_SNAPSHOT)
+
+    try:
+        embedded = vector_index.build(profiles)
+    except (OSError, ValueError) as e:
+        logger.warning("Failed to open the profile vector store, keeping vectors in memory: %s", e)
+        vector_index = candidate_retriever.vector_index = neighbor_index.vector_index = VectorIndex()
+        embedded = vector_index.build(profiles)
+    logger.info("Indexed %d profile vectors (%d newly embedded)", len(vector_index), embedded)
+    facet_index.build(profiles)
+    neighbor_index.build(profiles)
+
+@app.on_event("startup")
+async def start_profile_reconciliation():
+    global reconcile_task
+    if PROFILE_RECONCILE_INTERVAL > 0:
+        reconcile_task = asyncio.create_task(reconcile_periodically())
+
+@app.on_event("shutdown")
+async def stop_profile_reconciliation():
+    if reconcile_task:
+        reconcile_task.cancel()
+
+@app.on_event("shutdown")
+async def close_groq_clients():
+    groq_service.client_registry.close()
+
+@app.on_event("shutdown")
+async def save_search_indexes():
+    if KEYWORD_INDEX_SNAPSHOT:
+        keyword_index.save_snapshot(KEYWORD_INDEX_SNAPSHOT)
+
+def keyword_search(query: str, allowed: Optional[Set[str]] = None) -> List[Tuple[UserProfile, float]]:
+    with span("keyword_search"):
+        return keyword_index.search(query, limit=KEYWORD_SEARCH_LIMIT, allowed=allowed)
+
+def too_many_searches() -> HTTPException:
+    return HTTPException(status_code=429, detail="Too many concurrent searches, retry shortly", headers={"Retry-After": "1"})
+
+async def cache_get(key: str) -> Optional[Any]:
+    """Search cache lookup; the SQLite tier is read off the event loop and a failing read counts as a miss."""
+    try:
+        if search_cache.path:
+            return await run_blocking(search_cache.get, key)
+        return search_cache.get(key)
+    except sqlite3.Error as e:
+        logger.warning("Search cache read failed: %s", e)
+        return None
+
+async def cache_set(key: str, value: Any) -> None:
+    """Store a search result; a failing cache write is logged and never fails the search."""
+    try:
+        if search_cache.path:
+            await run_blocking(search_cache.set, key, value)
+        else:
+            search_cache.set(key, value)
+    except sqlite3.Error as e:
+        logger.warning("Search cache write failed: %s", e)
+
+def serialize_results(results: List[BaseModel]) -> FastJSONResponse:
+    with span("response_serialization"):
+        return FastJSONResponse(results)
+
+class FacetFilter(BaseModel):
+    values: List[str] = Field(min_length=1)
+    # "all" requires every value (AND), "any" at least one of them (OR)
+    match: Literal["all", "any"] = "all"
+
+class SearchFilters(BaseModel):
+    """Exact-match filters on profile tags; clauses for different fields are ANDed together."""
+    technical_skills: FacetFilter | None = None
+    ai_expertise: FacetFilter | None = None
+    collaboration_interests: FacetFilter | None = None
+
+    def clauses(self) -> List[FacetClause]:
+        return [
+            (field, clause.values, clause.match == "all")
+            for field in FACET_FIELDS
+            if (clause := getattr(self, field)) is not None
+        ]
+
+    def cache_key(self) -> str:
+        # Keyed on canonical tag ids so spelling variants of the same filter share cache entries
+        key = {
+            field: {"values": sorted(taxonomy.canonical_ids(clause.values)), "match": clause.match}
+            for field in FACET_FIELDS
+            if (clause := getattr(self, field)) is not None
+        }
+        return json.dumps(key, sort_keys=True, separators=(",", ":"))
 
 class SearchRequest(BaseModel):
     query: str
     use_groq: bool = False
+    use_semantic: bool = False
     groq_api_key: str | None = None
+    candidate_k: int | None = Field(default=None, ge=1, le=500)
+    filters: SearchFilters | None = None
+
+def filter_bits(filters: SearchFilters | None) -> Optional[int]:
+    """Bitset of profiles passing the filters, or None when the request has no filters."""
+    if filters is None or not (clauses := filters.clauses()):
+        return None
+    with span("facet_filter"):
+        return facet_index.match(clauses)
+
+def filter_only_results(bits: int) -> Tuple[List["SearchResponse"], int]:
+    """
+    Results for a filtered search without a query: the first KEYWORD_SEARCH_LIMIT matching
+    profiles, unranked, so a broad filter never serializes the whole profile set.
+    Returns: Tuple of (results, number of profiles matching the filters)
+    """
+    profiles = facet_index.profiles(bits, limit=KEYWORD_SEARCH_LIMIT)
+    return [SearchResponse(profile=profile, explanation="Matched filters") for profile in profiles], bits.bit_count()
+
+def stored_results(entries: List[Dict[str, Any]]) -> List["SearchResponse"]:
+    """Search results from cached (or coalesced) Groq match entries, skipping profiles no longer indexed."""
+    return [
+        SearchResponse(profile=profile, explanation=entry["explanation"], score=entry.get("score"))
+        for entry in entries
+        if (profile := keyword_index.get(entry["profile_id"]))
+    ]
 
 class SearchResponse(BaseModel):
     profile: UserProfile
     explanation: str
+    # Groq match score (0-100), cosine similarity for semantic search or BM25 score for keyword search
+    score: float | None = None
+
+class SimilarProfile(BaseModel):
+    profile: UserProfile
+    score: float
+    # Labels of the skills, expertise and interests both profiles share
+    shared_tags: List[str] = []
+
+class ProfilePage(BaseModel):
+    items: List[Dict[str, Any]]
+    next_cursor: str | None = None
 
 @app.post("/api/profiles", response_model=UserProfile)
 async def create_profile(profile: UserProfile):
-    return db.create_profile(profile)
+    created = await db.create_profile_async(profile)
+    await run_blocking(index_profiles, [created])
+    return created
 
-@app.get("/api/profiles", response_model=List[UserProfile])
-async def list_profiles():
-    return db.list_profiles()
+@app.post("/api/profiles/bulk")
+async def bulk_create_profiles(
+    file: UploadFile = File(..., description="CSV (list fields comma-separated) or JSONL file of profiles"),
+    batch_size: int = Query(default=500, ge=1, le=5000),
+):
+    """Import profiles from an uploaded file, reporting per-row errors instead of failing the whole import."""
+    try:
+        fmt = detect_format(file.filename or "")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    importer = BulkImporter(db, batch_size=batch_size, on_batch=index_profiles)
+    # Decode line by line instead of wrapping the upload in a TextIOWrapper, which needs
+    # file methods SpooledTemporaryFile lacks before Python 3.11
+    lines = codecs.iterdecode(file.file, "utf-8")
+    report = await run_blocking(importer.run, iter_records(lines, fmt))
+    logger.info("Bulk import finished - %d imported, %d failed, %.1f rows/sec",
+                report.imported, report.failed, report.rows_per_second)
+    return report.to_dict()
+
+@app.get("/api/profiles", response_model=ProfilePage)
+async def list_profiles(
+    limit: int = Query(default=20, ge=1, le=100),
+    cursor: str | None = None,
+    fields: str | None = Query(default=None, description="Comma-separated profile fields to return, e.g. name,technical_skills"),
+):
+    field_list = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+    try:
+        items, next_cursor = await db.list_profiles_page_async(limit, cursor, field_list)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # Rows come straight from storage and are encoded without building models
+    with span("response_serialization"):
+        return FastJSONResponse({"items": items, "next_cursor": next_cursor})
 
 @app.get("/api/profiles/{profile_id}", response_model=UserProfile)
 async def get_profile(profile_id: str):
-    profile = db.get_profile(profile_id)
+    profile = await db.get_profile_async(profile_id)
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
-    return profile
+    return FastJSONResponse(profile)
+
+@app.get("/api/profiles/{profile_id}/similar", response_model=List[SimilarProfile])
+async def similar_profiles(profile_id: str, limit: int = Query(default=10, ge=1, le=SIMILAR_PROFILES_K)):
+    """Profiles most similar to the given one by shared tags and profile vectors, e.g. for collaborator suggestions."""
+    with span("similar_profiles"):
+        neighbors = neighbor_index.similar(profile_id, limit)
+    if neighbors is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return serialize_results([
+        SimilarProfile(profile=profile, score=score, shared_tags=shared_tags)
+        for profile, score, shared_tags in neighbors
+    ])
 
 @app.post("/api/search", response_model=List[SearchResponse])
 async def search_profiles(search: SearchRequest):
-    print(f"Debug: Received search request - Query: {search.query}, Use Groq: {search.use_groq}")
-    profiles = db.list_profiles()
-    print(f"Debug: Found {len(profiles)} total profiles")
-    
+    logger.debug("Received search request - Query: %s, Use Groq: %s", search.query, search.use_groq)
+
+    bits = filter_bits(search.filters)
+    allowed = facet_index.ids(bits) if bits is not None else None
+    if bits is not None and not tokenize(search.query):
+        # Filters without a query: the first matching profiles, with the full count in a header
+        results, total = filter_only_results(bits)
+        response = serialize_results(results)
+        response.headers["X-Total-Count"] = str(total)
+        return response
+
     if search.use_groq:
         if not search.groq_api_key:
-            print("Debug: No Groq API key provided")
             raise HTTPException(status_code=400, detail="Groq API key is required for semantic search")
         try:
-            print("Debug: Attempting Groq search...")
-            # Use Groq for semantic search
-            matches = groq_service.search_profiles(search.query, profiles, search.groq_api_key)
-            print(f"Debug: Groq search returned {len(matches)} matches")
-            return [SearchResponse(profile=profile, explanation=explanation) for profile, explanation in matches]
+            candidate_k = search.candidate_k or GROQ_CANDIDATE_K
+            cache_key = SearchCache.make_key(
+                search.query, db.version, mode="groq", k=candidate_k,
+                filters=search.filters.cache_key() if search.filters else "",
+            )
+            cached = await cache_get(cache_key)
+            if cached is not None:
+                logger.debug("Search cache hit for key %s", cache_key)
+                return serialize_results(stored_results(cached))
+
+            if (flight := search_flights.join(cache_key)) is not None:
+                # An identical search is already calling Groq; share its result
+                with span("coalesced_wait"):
+                    entries = await asyncio.shield(flight)
+                if entries is None:
+                    raise RuntimeError("the coalesced Groq search failed")
+                return serialize_results(stored_results(entries))
+
+            with search_flights.lead(cache_key) as flight:
+                async with search_limiter.slot(hash_api_key(search.groq_api_key)):
+                    with span("candidate_shortlist"):
+                        profiles = candidate_retriever.shortlist(search.query, candidate_k, allowed)
+                    logger.debug("Shortlisted %d candidate profiles (k=%d)", len(profiles), candidate_k)
+                    # Use Groq for semantic search
+                    matches = await groq_service.search_profiles_async(search.query, profiles, search.groq_api_key)
+                entries = [
+                    {"profile_id": str(profile.id), "score": score, "explanation": explanation}
+                    for profile, score, explanation in matches
+                ]
+                flight.set_result(entries)
+            if entries:
+                # Empty results usually mean the Groq call failed, so they are not cached
+                await cache_set(cache_key, entries)
+            return serialize_results([
+                SearchResponse(profile=profile, explanation=explanation, score=score)
+                for profile, score, explanation in matches
+            ])
+        except Overloaded:
+            raise too_many_searches()
         except Exception as e:
-            print(f"Debug: Groq search failed with error: {str(e)}")
-            print(f"Debug: Error type: {type(e)}")
             # Fallback to basic search
-            print("Debug: Falling back to basic search")
-            basic_matches = db.search_profiles(search.query)
-            print(f"Debug: Basic search found {len(basic_matches)} matches")
-            return [
-                SearchResponse(profile=profile, explanation="Matched based on keyword search (Groq search failed)")
-                for profile in basic_matches
-            ]
+            logger.warning("Groq search failed (%s), falling back to basic search: %s", type(e).__name__, e)
+            basic_matches = keyword_search(search.query, allowed)
+            return serialize_results([
+                SearchResponse(profile=profile, explanation="Matched based on keyword search (Groq search failed)", score=score)
+                for profile, score in basic_matches
+            ])
+    elif search.use_semantic:
+        with span("vector_search"):
+            semantic_matches = vector_index.search(search.query, limit=SEMANTIC_SEARCH_LIMIT, allowed=allowed)
+        return serialize_results([
+            SearchResponse(profile=profile, explanation=f"Semantic similarity: {score:.2f}", score=score)
+            for profile, score in semantic_matches
+        ])
     else:
-        print("Debug: Using basic search")
-        basic_matches = db.search_profiles(search.query)
-        print(f"Debug: Basic search found {len(basic_matches)} matches")
-        return [
-            SearchResponse(profile=profile, explanation="Matched based on keyword search")
-            for profile in basic_matches
-        ] 
\ No newline at end of file
+        basic_matches = keyword_search(search.query, allowed)
+        return serialize_results([
+            SearchResponse(profile=profile, explanation="Matched based on keyword search", score=score)
+            for profile, score in basic_matches
+        ])
+
+def _ndjson(event: dict) -> bytes:
+    return dumps(event) + b"\n"
+
+@app.post("/api/search/stream")
+async def search_profiles_stream(search: SearchRequest):
+    """
+    Stream search results as newline-delimited JSON events.
+
+    A "provisional" event with keyword matches is sent immediately, followed by one
+    "match" event per Groq (or semantic) match as soon as it is available, and a
+    final "done" event. Failures after the stream has started are reported as an
+    "error" event.
+    """
+    if search.use_groq and not search.groq_api_key:
+        raise HTTPException(status_code=400, detail="Groq API key is required for semantic search")
+
+    bits = filter_bits(search.filters)
+    allowed = facet_index.ids(bits) if bits is not None else None
+
+    cache_key = cached = None
+    if search.use_groq:
+        candidate_k = search.candidate_k or GROQ_CANDIDATE_K
+        # Streamed searches score a single budget-truncated prompt instead of shards, so
+        # their results are cached and coalesced apart from /api/search
+        cache_key = SearchCache.make_key(
+            search.query, db.version, mode="groq", k=candidate_k, stream=True,
+            filters=search.filters.cache_key() if search.filters else "",
+        )
+        cached = await cache_get(cache_key)
+        # Reject before streaming starts when this search would need a Groq call and no slot can be queued for
+        if cached is None and cache_key not in search_flights:
+            try:
+                search_limiter.check(hash_api_key(search.groq_api_key))
+            except Overloaded:
+                raise too_many_searches()
+
+    async def events():
+        if bits is not None and not tokenize(search.query):
+            # Filters without a query: the first matching profiles and their total, nothing left to rank
+            results, total = filter_only_results(bits)
+            yield _ndjson({"type": "provisional", "results": results, "total": total})
+            yield _ndjson({"type": "done", "count": 0})
+            return
+
+        provisional = [
+            SearchResponse(profile=profile, explanation="Matched based on keyword search", score=score)
+            for profile, score in keyword_search(search.query, allowed)
+        ]
+        yield _ndjson({"type": "provisional", "results": provisional})
+
+        count = 0
+        if search.use_groq:
+            entries, joined = cached, False
+            if entries is None and (flight := search_flights.join(cache_key)) is not None:
+                # An identical search is already calling Groq; replay its matches once it finishes
+                entries, joined = await asyncio.shield(flight), True
+            if entries is not None:
+                for result in stored_results(entries):
+                    count += 1
+                    yield _ndjson({"type": "match", "result": result})
+            elif joined:
+                yield _ndjson({"type": "error", "detail": "Groq search failed"})
+            else:
+                with search_flights.lead(cache_key) as flight:
+                    streamed = []
+                    try:
+                        async with search_limiter.slot(hash_api_key(search.groq_api_key)):
+                            profiles = candidate_retriever.shortlist(search.query, candidate_k, allowed)
+                            matches = groq_service.stream_search_profiles(search.query, profiles, search.groq_api_key)
+                            while (match := await run_blocking(next, matches, None)) is not None:
+                                profile, score, explanation = match
+                                streamed.append({"profile_id": str(profile.id), "score": score, "explanation": explanation})
+                                count += 1
+                                yield _ndjson({"type": "match", "result": SearchResponse(profile=profile, explanation=explanation, score=score)})
+                    except Overloaded:
+                        yield _ndjson({"type": "error", "detail": "Too many concurrent searches, retry shortly"})
+                    except Exception as e:
+                        logger.warning("Streaming Groq search failed: %s", e)
+                        yield _ndjson({"type": "error", "detail": "Groq search failed"})
+                    else:
+                        flight.set_result(streamed)
+                        if streamed:
+                            await cache_set(cache_key, streamed)
+        elif search.use_semantic:
+            with span("vector_search"):
+                semantic_matches = vector_index.search(search.query, limit=SEMANTIC_SEARCH_LIMIT, allowed=allowed)
+            for profile, score in semantic_matches:
+                count += 1
+                yield _ndjson({"type": "match", "result": SearchResponse(
+                    profile=profile, explanation=f"Semantic similarity: {score:.2f}", score=score
+                )})
+
+        yield _ndjson({"type": "done", "count": count})
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+@app.get("/api/facets")
+async def facet_counts(
+    technical_skills: List[str] = Query(default=[]),
+    ai_expertise: List[str] = Query(default=[]),
+    collaboration_interests: List[str] = Query(default=[]),
+    match: Literal["all", "any"] = Query(default="all", description="Combine values within a field with AND (all) or OR (any)"),
+    limit: int = Query(default=50, ge=1, le=1000, description="Maximum values returned per field"),
+):
+    """Profile counts per skill, expertise and interest among the profiles matching the given filters."""
+    selected = {"technical_skills": technical_skills, "ai_expertise": ai_expertise, "collaboration_interests": collaboration_interests}
+    filters = SearchFilters(**{field: FacetFilter(values=values, match=match) for field, values in selected.items() if values})
+    bits = filter_bits(filters)
+    counts = facet_index.counts(bits, limit=limit)
+    return {
+        "total": bits.bit_count() if bits is not None else len(facet_index),
+        "facets": {field: [{"value": value, "count": count} for value, count in values] for field, values in counts.items()},
+    }
+
+@app.get("/api/cache/stats")
+async def cache_stats():
+    return {
+        "search": search_cache.stats(),
+        "profiles": db.profile_store.stats(),
+        "groq_clients": groq_service.client_registry.stats(),
+    }
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Request and per-stage latency histograms plus cache gauges in the Prometheus text format."""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
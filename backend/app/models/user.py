@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field, HttpUrl, AnyHttpUrl
-from typing import List, Optional
+from pydantic import BaseModel, Field, HttpUrl, AnyHttpUrl, PrivateAttr, field_serializer
+from typing import Any, List, Optional
 from uuid import UUID, uuid4
 
 class UserProfile(BaseModel):
@@ -11,6 +11,12 @@ class UserProfile(BaseModel):
     mentoring_preferences: str = Field(..., min_length=10, max_length=500)
     collaboration_interests: List[str] = Field(default_factory=list)
     portfolio_url: Optional[str] = None
+    # Canonical skill ids derived from the free-form tag fields when the profile is stored
+    technical_skill_ids: List[str] = Field(default_factory=list)
+    ai_expertise_ids: List[str] = Field(default_factory=list)
+    collaboration_interest_ids: List[str] = Field(default_factory=list)
+    # Derived SearchDocument, attached by app.services.search_document; never serialized
+    _search_document: Any = PrivateAttr(default=None)
 
     class Config:
         json_schema_extra = {
@@ -24,9 +30,7 @@ class UserProfile(BaseModel):
                 "portfolio_url": "https://github.com/johndoe"
             }
         }
-        
-    def model_dump(self, *args, **kwargs):
-        data = super().model_dump(*args, **kwargs)
-        # Convert UUID to string
-        data['id'] = str(data['id'])
-        return data 
\ No newline at end of file
+
+    @field_serializer("id")
+    def _serialize_id(self, value: UUID) -> str:
+        return str(value)
@@ -0,0 +1,173 @@
+import csv
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+from pydantic import ValidationError
+from app.models.user import UserProfile
+
+logger = logging.getLogger(__name__)
+
+LIST_FIELDS = ("technical_skills", "projects", "ai_expertise", "collaboration_interests")
+
+
+@dataclass
+class RowError:
+    row: int
+    error: str
+
+
+@dataclass
+class ImportReport:
+    total: int = 0
+    imported: int = 0
+    failed: int = 0
+    errors: List[RowError] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.total / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "total": self.total,
+            "imported": self.imported,
+            "failed": self.failed,
+            "errors": [{"row": e.row, "error": e.error} for e in self.errors],
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+        }
+
+
+def detect_format(filename: str) -> str:
+    """Infer the import format ("csv" or "jsonl") from a file name."""
+    lowered = filename.lower()
+    if lowered.endswith(".csv"):
+        return "csv"
+    if lowered.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    raise ValueError("Unsupported file type, expected .csv or .jsonl")
+
+
+def _read_rows(rows: Iterator, start: int) -> Iterator[Tuple[int, Optional[Any], Optional[str]]]:
+    """
+    Number the rows of a reader, turning read errors into per-row errors. A
+    malformed CSV row is skipped; undecodable bytes end the import, since the
+    reader cannot resume after them.
+    """
+    row_number = start
+    while True:
+        try:
+            row = next(rows)
+        except StopIteration:
+            return
+        except UnicodeDecodeError as e:
+            yield row_number, None, f"File is not valid UTF-8 ({e.reason}); this and the remaining rows were not read"
+            return
+        except csv.Error as e:
+            yield row_number, None, f"Malformed CSV row: {e}"
+        else:
+            yield row_number, row, None
+        row_number += 1
+
+
+def iter_records(stream: Iterable[str], fmt: str) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """
+    Lazily read records from a CSV or JSONL text stream, or any iterable of its lines with line endings kept.
+    Yields: tuples (row number, record or None, parse error or None)
+    """
+    if fmt == "csv":
+        # Row 1 is the header, so data rows start at 2
+        for row_number, row, read_error in _read_rows(csv.DictReader(stream), start=2):
+            if read_error:
+                yield row_number, None, read_error
+                continue
+            record = {k: v for k, v in row.items() if k and v not in (None, "")}
+            for name in LIST_FIELDS:
+                if name in record:
+                    record[name] = [item.strip() for item in record[name].split(",") if item.strip()]
+            yield row_number, record, None
+    elif fmt == "jsonl":
+        for row_number, line, read_error in _read_rows(iter(stream), start=1):
+            if read_error:
+                yield row_number, None, read_error
+                continue
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield row_number, None, f"Invalid JSON: {e.msg}"
+                continue
+            if not isinstance(record, dict):
+                yield row_number, None, "Expected a JSON object"
+                continue
+            yield row_number, record, None
+    else:
+        raise ValueError(f"Unsupported import format: {fmt}")
+
+
+class BulkImporter:
+    """
+    Validate profile records in chunks and insert them in batches.
+
+    Only one batch is held in memory at a time. A failed batch insert is retried
+    row by row so a single bad row does not sink the rest of its batch.
+    """
+
+    def __init__(
+        self,
+        db,
+        batch_size: int = 500,
+        on_batch: Optional[Callable[[List[UserProfile]], None]] = None,
+        max_errors: int = 1000,
+    ):
+        self.db = db
+        self.batch_size = batch_size
+        self.on_batch = on_batch
+        self.max_errors = max_errors
+
+    def run(self, records: Iterable[Tuple[int, Optional[dict], Optional[str]]]) -> ImportReport:
+        report = ImportReport()
+        start = time.perf_counter()
+        batch: List[Tuple[int, UserProfile]] = []
+        for row_number, record, parse_error in records:
+            report.total += 1
+            if parse_error:
+                self._record_error(report, row_number, parse_error)
+                continue
+            try:
+                batch.append((row_number, UserProfile(**record)))
+            except ValidationError as e:
+                message = "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors())
+                self._record_error(report, row_number, message)
+                continue
+            if len(batch) >= self.batch_size:
+                self._flush(batch, report)
+                batch = []
+        if batch:
+            self._flush(batch, report)
+        report.elapsed_seconds = time.perf_counter() - start
+        return report
+
+    def _flush(self, batch: List[Tuple[int, UserProfile]], report: ImportReport) -> None:
+        try:
+            created = self.db.create_profiles([profile for _, profile in batch])
+        except Exception as e:
+            logger.warning("Batch insert of %d rows failed, retrying row by row: %s", len(batch), e)
+            created = []
+            for row_number, profile in batch:
+                try:
+                    created.append(self.db.create_profile(profile))
+                except Exception as row_error:
+                    self._record_error(report, row_number, str(row_error))
+        report.imported += len(created)
+        if created and self.on_batch:
+            self.on_batch(created)
+
+    def _record_error(self, report: ImportReport, row_number: int, message: str) -> None:
+        report.failed += 1
+        if len(report.errors) < self.max_errors:
+            report.errors.append(RowError(row=row_number, error=message))
@@ -0,0 +1,155 @@
+import asyncio
+import contextvars
+import functools
+import os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Shared, bounded pool for blocking client calls (Supabase, Groq) so they never run on the event loop
+THREADPOOL_SIZE = int(os.getenv("BACKEND_THREADPOOL_SIZE", "32"))
+_executor = ThreadPoolExecutor(max_workers=THREADPOOL_SIZE, thread_name_prefix="backend-io")
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking callable on the shared thread pool and await its result."""
+    loop = asyncio.get_running_loop()
+    # Carry context variables (e.g. the current request's timing spans) over to the worker thread
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(_executor, functools.partial(context.run, func, *args, **kwargs))
+
+
+class Overloaded(Exception):
+    """Raised when no concurrency slot is free and the wait queue is full, or the wait timed out."""
+
+
+class SingleFlight:
+    """
+    Lets concurrent identical requests share one in-flight computation.
+
+    The first request for a key leads: it registers a future, computes and sets
+    the result. Requests for the same key arriving meanwhile join the future
+    instead of computing again. A leader that exits without setting a result
+    resolves the future with None, which joiners treat as a failed computation.
+    All callers must run on the same event loop.
+    """
+
+    def __init__(self):
+        self._flights: Dict[str, asyncio.Future] = {}
+        self.led = 0
+        self.joined = 0
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._flights
+
+    def join(self, key: str) -> Optional[asyncio.Future]:
+        """Future of the in-flight computation for key, or None if there is none to join."""
+        future = self._flights.get(key)
+        if future is not None:
+            self.joined += 1
+        return future
+
+    @contextmanager
+    def lead(self, key: str) -> Iterator[asyncio.Future]:
+        """Register the caller as the computation for key; set the yielded future's result when done."""
+        future = asyncio.get_running_loop().create_future()
+        self._flights[key] = future
+        self.led += 1
+        try:
+            yield future
+        finally:
+            if self._flights.get(key) is future:
+                del self._flights[key]
+            if not future.done():
+                future.set_result(None)
+
+    def stats(self) -> dict:
+        return {"in_flight": len(self._flights), "led": self.led, "joined": self.joined}
+
+
+class ConcurrencyLimiter:
+    """
+    Global and per-key caps on concurrent operations with a bounded wait queue.
+
+    Callers over either cap wait for a slot, at most max_queue of them at a time
+    and for at most queue_timeout seconds. Beyond that they get Overloaded right
+    away, so a spike turns into fast rejections instead of ever-growing latency.
+    """
+
+    def __init__(self, max_concurrent: int = 8, max_per_key: int = 4, max_queue: int = 32, queue_timeout: float = 5.0):
+        self.max_concurrent = max_concurrent
+        self.max_per_key = max_per_key
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._global = asyncio.Semaphore(max_concurrent)
+        self._per_key: Dict[str, asyncio.Semaphore] = {}
+        # Holders and waiters per key, so idle per-key semaphores can be dropped
+        self._users: Dict[str, int] = defaultdict(int)
+        self.active = 0
+        self.waiting = 0
+        self.rejected = 0
+
+    @classmethod
+    def from_env(cls) -> "ConcurrencyLimiter":
+        return cls(
+            max_concurrent=int(os.getenv("SEARCH_MAX_CONCURRENT", "8")),
+            max_per_key=int(os.getenv("SEARCH_MAX_PER_KEY", "4")),
+            max_queue=int(os.getenv("SEARCH_QUEUE_SIZE", "32")),
+            queue_timeout=float(os.getenv("SEARCH_QUEUE_TIMEOUT", "5")),
+        )
+
+    def _must_wait(self, key: str) -> bool:
+        key_slots = self._per_key.get(key)
+        return self._global.locked() or (key_slots is not None and key_slots.locked())
+
+    def check(self, key: str) -> None:
+        """Raise Overloaded if slot(key) would be rejected right now, e.g. before committing to a streamed response."""
+        if self._must_wait(key) and self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise Overloaded("Too many concurrent requests")
+
+    async def _acquire(self, key_slots: asyncio.Semaphore) -> None:
+        await key_slots.acquire()
+        try:
+            await self._global.acquire()
+        except BaseException:
+            key_slots.release()
+            raise
+
+    @asynccontextmanager
+    async def slot(self, key: str) -> AsyncIterator[None]:
+        """Hold one global slot and one slot for key, waiting in the queue if needed. Raises Overloaded."""
+        self.check(key)
+        key_slots = self._per_key.setdefault(key, asyncio.Semaphore(self.max_per_key))
+        self._users[key] += 1
+        try:
+            if self._must_wait(key):
+                self.waiting += 1
+                try:
+                    await asyncio.wait_for(self._acquire(key_slots), self.queue_timeout)
+                except asyncio.TimeoutError:
+                    self.rejected += 1
+                    raise Overloaded(f"No free slot within {self.queue_timeout:g}s") from None
+                finally:
+                    self.waiting -= 1
+            else:
+                # Both semaphores have free slots, so this returns without suspending
+                await self._acquire(key_slots)
+            self.active += 1
+            try:
+                yield
+            finally:
+                self.active -= 1
+                self._global.release()
+                key_slots.release()
+        finally:
+            self._users[key] -= 1
+            if not self._users[key]:
+                del self._users[key]
+                del self._per_key[key]
+
+    def stats(self) -> dict:
+        return {"active": self.active, "waiting": self.waiting, "rejected": self.rejected}
@@ -1,13 +1,11 @@
 from supabase import create_client
-from dotenv import load_dotenv
 import os
-from typing import List, Optional
-from app.models.user import UserProfile
+from typing import Any, Dict, List, Optional, Tuple
+from app.services.storage import ProfileStorage
 
-# Load environment variables
-load_dotenv()
+class DatabaseService(ProfileStorage):
+    """Supabase (PostgREST) implementation of ProfileStorage."""
 
-class DatabaseService:
     def __init__(self):
         supabase_url = os.getenv("SUPABASE_URL")
         supabase_key = os.getenv("SUPABASE_KEY")
@@ -15,54 +13,38 @@ class DatabaseService:
         if not supabase_url or not supabase_key:
             raise ValueError("SUPABASE_URL and SUPABASE_KEY must be set in environment variables")
             
+        super().__init__()
         self.client = create_client(supabase_url, supabase_key)
-        
-    def create_profile(self, profile: UserProfile) -> UserProfile:
-        data = profile.model_dump()
-        result = self.client.table("profiles").insert(data).execute()
-        return UserProfile(**result.data[0])
-        
-    def get_profile(self, profile_id: str) -> Optional[UserProfile]:
+
+    def _insert_rows(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return self.client.table("profiles").insert(rows).execute().data
+
+    def _fetch_by_id(self, profile_id: str) -> Optional[Dict[str, Any]]:
         result = self.client.table("profiles").select("*").eq("id", profile_id).execute()
-        return UserProfile(**result.data[0]) if result.data else None
-        
-    def list_profiles(self) -> List[UserProfile]:
-        result = self.client.table("profiles").select("*").execute()
-        return [UserProfile(**profile) for profile in result.data]
-        
-    def search_profiles(self, query: str) -> List[UserProfile]:
-        # Use Supabase's text search capabilities
-        search_query = f"%{query}%"
-        
-        result = (
-            self.client.table("profiles")
-            .select("*")
-            .ilike("name", search_query)
-            .execute()
-        )
-        
-        # Also search in arrays and text fields
-        result2 = (
+        return result.data[0] if result.data else None
+
+    def _fetch_by_ids(self, profile_ids: List[str]) -> List[Dict[str, Any]]:
+        return self.client.table("profiles").select("*").in_("id", profile_ids).execute().data
+
+    def _fetch_page(
+        self, columns: Optional[List[str]], limit: int, after: Optional[Tuple[str, str]]
+    ) -> List[Dict[str, Any]]:
+        select = ",".join(columns + ["created_at"]) if columns else "*"
+        query = (
             self.client.table("profiles")
-            .select("*")
-            .ilike("mentoring_preferences", search_query)
-            .execute()
+            .select(select)
+            .order("created_at")
+            .order("id")
+            .limit(limit)
         )
-        
-        # Combine results and remove duplicates
-        profiles = []
-        seen_ids = set()
-        
-        for data in [result.data, result2.data]:
-            for profile_data in data:
-                if profile_data["id"] not in seen_ids:
-                    # Also check array fields manually
-                    if (
-                        any(query.lower() in skill.lower() for skill in profile_data["technical_skills"])
-                        or any(query.lower() in exp.lower() for exp in profile_data["ai_expertise"])
-                        or any(query.lower() in interest.lower() for interest in profile_data["collaboration_interests"])
-                    ):
-                        profiles.append(UserProfile(**profile_data))
-                        seen_ids.add(profile_data["id"])
-        
-        return profiles 
\ No newline at end of file
+        if after:
+            created_at, last_id = after
+            query = query.or_(
+                f'created_at.gt."{created_at}",and(created_at.eq."{created_at}",id.gt."{last_id}")'
+            )
+        return query.execute().data
+        
+    def _update_documents(self, rows: List[Dict[str, Any]]) -> None:
+        # One upsert per batch; Postgres checks not-null columns before resolving the
+        # conflict, so the rows carry the whole profile rather than just the document
+        self.client.table("profiles").upsert(rows, on_conflict="id").execute()
@@ -0,0 +1,235 @@
+import math
+import threading
+import zlib
+from collections import OrderedDict, defaultdict
+from heapq import nlargest
+from typing import Collection, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from app.models.user import UserProfile
+from app.services.search_document import search_document, tokenize
+from app.services.vector_store import VectorStore
+
+DEFAULT_DIM = 512
+SUBWORD_SIZE = 4
+SUBWORD_WEIGHT = 0.3
+
+
+class HashingEmbedder:
+    """
+    CPU-only text embedder using the hashing trick.
+
+    Words, word bigrams and character n-grams are hashed into a fixed number of
+    signed buckets, so vectors are stable across processes and never need a
+    vocabulary or model download.
+    """
+
+    def __init__(self, dim: int = DEFAULT_DIM):
+        self.dim = dim
+
+    def _features(self, text: str) -> Dict[str, float]:
+        tokens = tokenize(text)
+        features: Dict[str, float] = defaultdict(float)
+        for token in tokens:
+            features[token] += 1.0
+            padded = f"<{token}>"
+            for i in range(len(padded) - SUBWORD_SIZE + 1):
+                features["#" + padded[i:i + SUBWORD_SIZE]] += SUBWORD_WEIGHT
+        for first, second in zip(tokens, tokens[1:]):
+            features[f"{first} {second}"] += 1.0
+        return features
+
+    def term_vector(self, text: str) -> np.ndarray:
+        """Unnormalized sublinear term-frequency vector for the text."""
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for feature, count in self._features(text).items():
+            h = zlib.crc32(feature.encode("utf-8"))
+            sign = 1.0 if h & 0x80000000 else -1.0
+            vector[h % self.dim] += sign * (1.0 + math.log(count) if count >= 1 else count)
+        return vector
+
+    def embed(self, text: str) -> np.ndarray:
+        """L2-normalized embedding of the text."""
+        vector = self.term_vector(text)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+class VectorIndex:
+    """
+    Semantic search over profile vectors kept in a quantized VectorStore.
+
+    Vectors are stored under the content hash of the profile's search document,
+    so a profile is embedded once per version of its content and never scored
+    against a stale vector. The store is memory-mapped and shared between
+    worker processes when a path is configured. Embedding happens before the
+    store's file lock is taken, which is only held for the append. Profiles are
+    scored block by block with matrix-vector products; bucket document
+    frequencies for query IDF weighting are computed on the first search rather
+    than at startup.
+    """
+
+    def __init__(
+        self,
+        embedder: Optional[HashingEmbedder] = None,
+        store: Optional[VectorStore] = None,
+        query_cache_size: int = 1024,
+    ):
+        self.embedder = embedder or HashingEmbedder()
+        self.store = store if store is not None else VectorStore(self.embedder.dim)
+        if self.store.dim != self.embedder.dim:
+            raise ValueError(f"Vector store has {self.store.dim} dimensions, embedder {self.embedder.dim}")
+        self.query_cache_size = query_cache_size
+        self._lock = threading.RLock()
+        self._ids: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._profiles: Dict[str, UserProfile] = {}
+        # profile id -> store key (content hash) of its vector
+        self._keys: Dict[str, str] = {}
+        # Store record of every indexed profile, aligned with _ids; rebuilt after writes
+        self._rows: Optional[np.ndarray] = None
+        # Number of profiles with a non-zero value in each bucket, used for IDF weighting of queries
+        self._doc_freq: Optional[np.ndarray] = None
+        self._query_vectors: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _register(self, profile: UserProfile) -> None:
+        profile_id = str(profile.id)
+        if profile_id not in self._positions:
+            self._positions[profile_id] = len(self._ids)
+            self._ids.append(profile_id)
+        self._profiles[profile_id] = profile
+        self._keys[profile_id] = search_document(profile).content_hash
+
+    def _embed_missing(self, profiles: List[UserProfile]) -> int:
+        """
+        Embed and store the profiles whose content has no stored vector yet (e.g.
+        one written by another worker process), without holding any lock while embedding.
+        Returns: Number of vectors written
+        """
+        self.store.open()
+        self.store.refresh()
+        missing: Dict[str, UserProfile] = {}
+        for profile in profiles:
+            key = search_document(profile).content_hash
+            if key not in self.store:
+                missing.setdefault(key, profile)
+        if not missing:
+            return 0
+        vectors = [(key, self.embedder.embed(search_document(p).text)) for key, p in missing.items()]
+        return self.store.append(vectors, skip_existing=True)
+
+    def _vector(self, profile_id: str) -> Optional[np.ndarray]:
+        key = self._keys.get(profile_id)
+        return self.store.get(key) if key is not None else None
+
+    def add(self, profile: UserProfile) -> None:
+        """Add a profile, embedding it unless the store already holds a vector for its content."""
+        self._embed_missing([profile])
+        profile_id = str(profile.id)
+        with self._lock:
+            replaced = profile_id in self._positions
+            self._register(profile)
+            self._rows = None
+            if self._doc_freq is not None:
+                if replaced:
+                    self._doc_freq = None
+                else:
+                    self._doc_freq += self._vector(profile_id) != 0
+
+    def build(self, profiles: Iterable[UserProfile]) -> int:
+        """
+        Load profiles into the index, embedding only those without a stored vector for their content.
+        Returns: Number of vectors that had to be embedded
+        """
+        profiles = list(profiles)
+        embedded = self._embed_missing(profiles)
+        with self._lock:
+            for profile in profiles:
+                self._register(profile)
+            self._rows = None
+            self._doc_freq = None
+        return embedded
+
+    def _row_numbers(self) -> np.ndarray:
+        if self._rows is None:
+            self._rows = np.fromiter(
+                (self.store.offset(self._keys[pid]) for pid in self._ids), dtype=np.int64, count=len(self._ids)
+            )
+        return self._rows
+
+    def similarities(self, profile_id: str, other_ids: List[str]) -> np.ndarray:
+        """Cosine similarity between a profile's vector and each of the other profiles' (0 where unknown)."""
+        with self._lock:
+            vector = self._vector(profile_id)
+            offsets = ((i, self.store.offset(self._keys.get(pid, ""))) for i, pid in enumerate(other_ids))
+            known = [(i, offset) for i, offset in offsets if offset is not None]
+            result = np.zeros(len(other_ids), dtype=np.float32)
+            if vector is None or not known:
+                return result
+            positions, rows = (np.array(column, dtype=np.int64) for column in zip(*known))
+            result[positions] = self.store.scores(vector, rows)
+            return result
+
+    def neighbors(self, profile_id: str, limit: int) -> List[Tuple[str, float]]:
+        """
+        Indexed profiles whose vectors are most similar to the given profile's, excluding itself.
+        Returns: List of tuples (profile id, cosine similarity) with positive scores, best first
+        """
+        with self._lock:
+            vector = self._vector(profile_id)
+            if vector is None or not self._ids:
+                return []
+            scores = self.store.scores(vector, self._row_numbers())
+            if profile_id in self._positions:
+                scores[self._positions[profile_id]] = -np.inf
+            count = min(limit, len(scores))
+            top = np.argpartition(-scores, count - 1)[:count]
+            ranked = nlargest(count, ((float(scores[i]), int(i)) for i in top))
+            return [(self._ids[position], score) for score, position in ranked if score > 0]
+
+    def _query_vector(self, query: str) -> np.ndarray:
+        cached = self._query_vectors.get(query)
+        if cached is None:
+            cached = self.embedder.term_vector(query)
+            self._query_vectors[query] = cached
+            while len(self._query_vectors) > self.query_cache_size:
+                self._query_vectors.popitem(last=False)
+        else:
+            self._query_vectors.move_to_end(query)
+        return cached.copy()
+
+    def search(
+        self, query: str, limit: int = 20, allowed: Optional[Collection[str]] = None
+    ) -> List[Tuple[UserProfile, float]]:
+        """
+        Rank profiles by cosine similarity to the IDF-weighted query embedding,
+        optionally only those whose ids are in allowed.
+        Returns: List of tuples (profile, score) with positive scores, best first
+        """
+        with self._lock:
+            if not self._ids:
+                return []
+            rows = self._row_numbers()
+            if self._doc_freq is None:
+                self._doc_freq = self.store.nonzero_counts(rows)
+            query_vector = self._query_vector(query)
+            idf = np.log((1 + len(self._ids)) / (1 + self._doc_freq)) + 1.0
+            query_vector *= idf
+            norm = np.linalg.norm(query_vector)
+            if not norm:
+                return []
+            if allowed is None:
+                positions = np.arange(len(self._ids))
+            else:
+                # Only score the allowed profiles
+                positions = np.fromiter((self._positions[pid] for pid in allowed if pid in self._positions),
+                                        dtype=np.int64)
+                if not len(positions):
+                    return []
+            scores = self.store.scores(query_vector / norm, rows[positions])
+            count = min(limit, len(scores))
+            top = np.argpartition(-scores, count - 1)[:count]
+            ranked = nlargest(count, ((float(scores[i]), int(positions[i])) for i in top))
+            return [(self._profiles[self._ids[position]], score) for score, position in ranked if score > 0]
@@ -0,0 +1,150 @@
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+import numpy as np
+from app.models.user import UserProfile
+from app.services.taxonomy import taxonomy
+
+FACET_FIELDS = ("technical_skills", "ai_expertise", "collaboration_interests")
+
+# (field, values, match_all): match_all=True requires every value (AND), False any of them (OR)
+FacetClause = Tuple[str, Sequence[str], bool]
+
+
+class FacetIndex:
+    """
+    Bitset posting lists for exact filtering on profile tag fields.
+
+    Every profile gets a dense document number and each (field, canonical tag id)
+    pair maps to a Python int whose set bits are the documents carrying that tag,
+    so a filter is a handful of big-integer AND/OR operations and facet counts are
+    popcounts. Tags and filter values are both canonicalized, so filtering on "ML"
+    finds profiles tagged "Machine Learning". Document numbers of removed profiles
+    are not reused.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._doc_ids: List[Optional[str]] = []
+        self._doc_numbers: Dict[str, int] = {}
+        self._profiles: Dict[str, UserProfile] = {}
+        self._live = 0
+        # field -> canonical tag id -> bitset of document numbers
+        self._postings: Dict[str, Dict[str, int]] = {field: defaultdict(int) for field in FACET_FIELDS}
+        # field -> canonical tag id -> display label (taxonomy label, else the first spelling seen)
+        self._labels: Dict[str, Dict[str, str]] = {field: {} for field in FACET_FIELDS}
+
+    def __len__(self) -> int:
+        return len(self._doc_numbers)
+
+    def _values(self, profile: UserProfile, field: str) -> Dict[str, str]:
+        return taxonomy.profile_labels(profile, field)
+
+    @staticmethod
+    def _tag_id(value: str) -> Optional[str]:
+        tag = taxonomy.canonicalize(value)
+        return tag.id if tag else None
+
+    def build(self, profiles: Iterable[UserProfile]) -> None:
+        """Replace the index contents with the given profiles."""
+        with self._lock:
+            self._doc_ids.clear()
+            self._doc_numbers.clear()
+            self._profiles.clear()
+            self._live = 0
+            for field in FACET_FIELDS:
+                self._postings[field].clear()
+                self._labels[field].clear()
+            for profile in profiles:
+                self.add(profile)
+
+    def add(self, profile: UserProfile) -> None:
+        """Index a profile, replacing any previous version of it."""
+        profile_id = str(profile.id)
+        with self._lock:
+            if profile_id in self._doc_numbers:
+                self.remove(profile_id)
+            number = len(self._doc_ids)
+            self._doc_ids.append(profile_id)
+            self._doc_numbers[profile_id] = number
+            self._profiles[profile_id] = profile
+            bit = 1 << number
+            self._live |= bit
+            for field in FACET_FIELDS:
+                for tag_id, label in self._values(profile, field).items():
+                    self._postings[field][tag_id] |= bit
+                    self._labels[field].setdefault(tag_id, label)
+
+    def remove(self, profile_id: str) -> None:
+        """Drop a profile from the index if present."""
+        with self._lock:
+            number = self._doc_numbers.pop(profile_id, None)
+            if number is None:
+                return
+            profile = self._profiles.pop(profile_id)
+            self._doc_ids[number] = None
+            mask = ~(1 << number)
+            self._live &= mask
+            for field in FACET_FIELDS:
+                for tag_id in self._values(profile, field):
+                    bits = self._postings[field].get(tag_id, 0) & mask
+                    if bits:
+                        self._postings[field][tag_id] = bits
+                    else:
+                        self._postings[field].pop(tag_id, None)
+                        self._labels[field].pop(tag_id, None)
+
+    def match(self, clauses: Iterable[FacetClause]) -> int:
+        """
+        Evaluate filter clauses (ANDed together) to a bitset of matching documents.
+        Unknown values match nothing.
+        """
+        with self._lock:
+            result = self._live
+            for field, values, match_all in clauses:
+                if field not in self._postings:
+                    raise ValueError(f"Unknown facet field: {field}")
+                postings = self._postings[field]
+                bitsets = [postings.get(self._tag_id(value), 0) for value in values]
+                if not bitsets:
+                    continue
+                clause = bitsets[0]
+                for bits in bitsets[1:]:
+                    clause = clause & bits if match_all else clause | bits
+                result &= clause
+            return result
+
+    def _numbers(self, bits: int) -> np.ndarray:
+        if not bits:
+            return np.zeros(0, dtype=np.int64)
+        raw = np.frombuffer(bits.to_bytes((bits.bit_length() + 7) // 8, "little"), dtype=np.uint8)
+        return np.flatnonzero(np.unpackbits(raw, bitorder="little"))
+
+    def ids(self, bits: int) -> Set[str]:
+        """Profile ids for the set bits of a match() result."""
+        with self._lock:
+            return {self._doc_ids[number] for number in self._numbers(bits)}
+
+    def profiles(self, bits: int, limit: Optional[int] = None) -> List[UserProfile]:
+        """The first limit (default all) profiles for the set bits of a match() result, in insertion order."""
+        with self._lock:
+            return [self._profiles[self._doc_ids[number]] for number in self._numbers(bits)[:limit]]
+
+    def counts(self, bits: Optional[int] = None, limit: Optional[int] = None) -> Dict[str, List[Tuple[str, int]]]:
+        """
+        Number of matching profiles per value of every facet field, most common first.
+        Returns: {field: [(label, count), ...]} for the documents in bits (all profiles if None)
+        """
+        with self._lock:
+            bits = self._live if bits is None else bits
+            result = {}
+            for field in FACET_FIELDS:
+                labels = self._labels[field]
+                counted = [
+                    (labels[value], count)
+                    for value, postings in self._postings[field].items()
+                    if (count := (postings & bits).bit_count())
+                ]
+                counted.sort(key=lambda item: (-item[1], item[0].lower()))
+                result[field] = counted[:limit] if limit else counted
+            return result
@@ -0,0 +1,83 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+import httpx
+from groq import Groq
+
+
+def hash_api_key(api_key: str) -> str:
+    """Stable, non-reversible identifier for an API key."""
+    return hashlib.sha256(api_key.strip().encode("utf-8")).hexdigest()
+
+
+class GroqClientRegistry:
+    """
+    Bounded LRU registry of Groq clients keyed by a hash of the API key.
+
+    Reusing a client keeps its HTTP connection pool, TLS sessions and keep-alive
+    connections warm across searches. Retries with exponential backoff on 429
+    and 5xx responses are handled by the Groq SDK according to max_retries.
+    """
+
+    def __init__(
+        self,
+        max_clients: int = 64,
+        timeout: float = 30.0,
+        connect_timeout: float = 5.0,
+        max_retries: int = 3,
+        base_url: Optional[str] = None,
+    ):
+        self.max_clients = max_clients
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.max_retries = max_retries
+        self.base_url = base_url
+        self._lock = threading.Lock()
+        self._clients: "OrderedDict[str, Groq]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls) -> "GroqClientRegistry":
+        return cls(
+            max_clients=int(os.getenv("GROQ_CLIENT_CACHE_SIZE", "64")),
+            timeout=float(os.getenv("GROQ_TIMEOUT", "30")),
+            connect_timeout=float(os.getenv("GROQ_CONNECT_TIMEOUT", "5")),
+            max_retries=int(os.getenv("GROQ_MAX_RETRIES", "3")),
+            base_url=os.getenv("GROQ_BASE_URL") or None,
+        )
+
+    def get(self, api_key: str) -> Groq:
+        """Return a warm client for the API key, creating one if needed."""
+        key = hash_api_key(api_key)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self._clients.move_to_end(key)
+                self.hits += 1
+                return client
+
+            self.misses += 1
+            client = Groq(
+                api_key=api_key.strip(),
+                base_url=self.base_url,
+                timeout=self.timeout,
+                max_retries=self.max_retries,
+            )
+            self._clients[key] = client
+            while len(self._clients) > self.max_clients:
+                # Not closed here: a search may still be using it; its pool is released once unreferenced
+                self._clients.popitem(last=False)
+            return client
+
+    def close(self) -> None:
+        """Close all pooled clients."""
+        with self._lock:
+            for client in self._clients.values():
+                client.close()
+            self._clients.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"clients": len(self._clients), "max_clients": self.max_clients, "hits": self.hits, "misses": self.misses}
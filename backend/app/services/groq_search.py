@@ -1,27 +1,96 @@
+import contextvars
+import logging
 import os
-from typing import List, Tuple
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Iterator, List, Optional, Tuple
 from groq import Groq
 from app.models.user import UserProfile
-import json
+from app.services.concurrency import run_blocking
+from app.services.groq_clients import GroqClientRegistry
+from app.services.metrics import registry, span
+from app.services.prompt_builder import BuiltPrompt, PromptBuilder, estimate_tokens
+from app.services.match_parser import LLMMatch, parse_matches, validate_match
+from app.services.stream_parser import MatchStreamParser
+
+logger = logging.getLogger(__name__)
+
+GROQ_MODEL = "llama3-8b-8192"
+# Completion budget per request; the prompt gets whatever is left of the model's context window
+GROQ_MAX_COMPLETION_TOKENS = int(os.getenv("GROQ_MAX_COMPLETION_TOKENS", "4000"))
+# Chat template tokens added around each message by the model
+MESSAGE_OVERHEAD_TOKENS = 16
+# Sharded scoring: candidates that do not fit one prompt are split across parallel requests.
+# GROQ_SHARD_SIZE caps profiles per request (0 = as many as the token budget allows).
+GROQ_SHARD_SIZE = int(os.getenv("GROQ_SHARD_SIZE", "0"))
+GROQ_MAX_SHARDS = int(os.getenv("GROQ_MAX_SHARDS", "4"))
+GROQ_SHARD_CONCURRENCY = int(os.getenv("GROQ_SHARD_CONCURRENCY", "4"))
+GROQ_SHARD_TIMEOUT = float(os.getenv("GROQ_SHARD_TIMEOUT", "20"))
+# Separate from the request pool in concurrency.py: searches running there block waiting on their shards
+_shard_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("GROQ_SHARD_POOL_SIZE", "32")), thread_name_prefix="groq-shard"
+)
+
+# Ask Groq for a syntactically valid JSON object (not available for streamed completions)
+GROQ_JSON_MODE = os.getenv("GROQ_JSON_MODE", "true").lower() in ("1", "true", "yes")
+
+SHARD_OUTCOMES = registry.counter("groq_shards_total", "Sharded Groq scoring requests by outcome", ["outcome"])
+
+SYSTEM_PROMPT = "You are an expert at matching engineers based on their profiles. You always return valid JSON in the exact format requested."
+
+# (profile, match score 0-100, explanation)
+ScoredMatch = Tuple[UserProfile, float, str]
+
+
+def format_explanation(match: LLMMatch) -> str:
+    return f"Match Score: {match.match_score:g}%\n{match.explanation}"
 
 class GroqSearchService:
-    def _create_profile_context(self, profile: UserProfile) -> str:
-        """Create a searchable context string from a profile."""
-        return f"""
-Profile ID: {profile.id}
-Name: {profile.name}
-Technical Skills: {', '.join(profile.technical_skills)}
-Projects: {', '.join(profile.projects)}
-AI Expertise: {', '.join(profile.ai_expertise)}
-Mentoring Preferences: {profile.mentoring_preferences}
-Collaboration Interests: {', '.join(profile.collaboration_interests)}
-Portfolio: {profile.portfolio_url if profile.portfolio_url else 'Not provided'}
-"""
-
-    def search_profiles(self, query: str, profiles: List[UserProfile], api_key: str) -> List[Tuple[UserProfile, str]]:
+    def __init__(
+        self,
+        client_registry: Optional[GroqClientRegistry] = None,
+        prompt_builder: Optional[PromptBuilder] = None,
+        shard_size: int = GROQ_SHARD_SIZE,
+        max_shards: int = GROQ_MAX_SHARDS,
+        shard_concurrency: int = GROQ_SHARD_CONCURRENCY,
+        shard_timeout: float = GROQ_SHARD_TIMEOUT,
+    ):
+        self.client_registry = client_registry or GroqClientRegistry.from_env()
+        self.prompt_builder = prompt_builder or PromptBuilder.from_env(
+            GROQ_MAX_COMPLETION_TOKENS + estimate_tokens(SYSTEM_PROMPT) + MESSAGE_OVERHEAD_TOKENS
+        )
+        self.shard_size = shard_size
+        self.max_shards = max_shards
+        self.shard_concurrency = shard_concurrency
+        self.shard_timeout = shard_timeout
+
+    def _build_prompt(self, query: str, profiles: List[UserProfile]) -> BuiltPrompt:
+        """Build the matching prompt for the given query, fitting as many candidates as the token budget allows."""
+        built = self.prompt_builder.build(query, profiles)
+        if built.included < built.total:
+            logger.info("Prompt budget fit %d of %d candidate profiles", built.included, built.total)
+        return built
+
+    def _build_messages(self, prompt: str) -> List[dict]:
+        return [
+            {
+                "role": "system",
+                "content": SYSTEM_PROMPT
+            },
+            {
+                "role": "user",
+                "content": prompt,
+            }
+        ]
+
+    def search_profiles(self, query: str, profiles: List[UserProfile], api_key: str) -> List[ScoredMatch]:
         """
         Search profiles using Groq LLM and return matches with explanations.
-        Returns: List of tuples (profile, explanation)
+
+        Candidates that do not fit one prompt are split into shards scored by
+        concurrent Groq requests and merged by match score. Shards that fail or
+        miss the shard timeout are left out, so the result may be partial.
+        Returns: List of tuples (profile, match score, explanation), best match first
         """
         if not profiles:
             return []
@@ -29,135 +98,142 @@ Portfolio: {profile.portfolio_url if profile.portfolio_url else 'Not provided'}
         if not api_key:
             raise ValueError("Groq API key is required for semantic search")
             
-        # Debug: Check API key format
-        print(f"Debug: API key length: {len(api_key)}")
-        print(f"Debug: API key prefix: {api_key[:10]}...")
-        
         try:
-            # Initialize Groq client with provided API key
-            client = Groq(api_key=api_key.strip())  # Ensure no whitespace
-            print("Debug: Groq client initialized successfully")
+            # Reuse a pooled Groq client for this API key
+            client = self.client_registry.get(api_key)
 
-            # Create context from all profiles
-            profile_contexts = {str(p.id): self._create_profile_context(p) for p in profiles}
-            print(f"Debug: Created context for {len(profiles)} profiles")
-            
-            # Create the prompt for Groq
-            prompt = f"""You are an expert at matching engineers based on their profiles. Your task is to find the most relevant profiles that match the given search query.
-
-Search Query: "{query}"
-
-Available Engineer Profiles:
-{'-' * 80}
-"""
-            for pid, context in profile_contexts.items():
-                prompt += f"\nProfile ID: {pid}\n{context}\n{'-' * 80}"
-
-            prompt += """\nInstructions:
-1. Analyze the search query to understand the key requirements and preferences.
-2. For each profile, evaluate:
-   - Direct skill matches
-   - Related expertise and experience
-   - Project relevance
-   - Mentoring compatibility
-   - Collaboration potential
-   - Overall fit for the query
-3. Score each profile (0-100) based on:
-   - Exact matches: +40 points
-   - Related/Similar matches: +30 points
-   - Soft skill alignment: +20 points
-   - Additional relevant factors: +10 points
-
-Return your analysis in the following JSON format:
-{
-  "matches": [
-    {
-      "profile_id": "exact-profile-uuid-from-above",
-      "match_score": number-between-0-and-100,
-      "explanation": "Detailed explanation of why this profile matches"
-    }
-  ]
-}
-
-Important:
-- Include ANY profile with a score > 30
-- Be thorough but concise in explanations
-- Focus on the most relevant aspects for the query
-- Sort by match_score in descending order
-- Return valid JSON only"""
-
-            print("Debug: Sending request to Groq API...")
-            # Get response from Groq
+            with span("prompt_build"):
+                shards = self.prompt_builder.shard(query, profiles, self.shard_size or None, self.max_shards)
+            if not shards:
+                logger.warning("Prompt budget of %d tokens is too small for any candidate profile",
+                               self.prompt_builder.max_prompt_tokens)
+                return []
+            included = sum(shard.included for shard in shards)
+            if included < len(profiles):
+                logger.info("Prompt budget fit %d of %d candidate profiles in %d shards",
+                            included, len(profiles), len(shards))
+
+            if len(shards) == 1:
+                scored = self._score_prompt(client, shards[0])
+            else:
+                scored = self._score_shards(client, shards)
+
+            scored.sort(key=lambda match: match[1], reverse=True)
+            return scored
+
+        except Exception as e:
+            status = getattr(getattr(e, "response", None), "status_code", None)
+            logger.error("Groq search failed (%s, status %s): %s", type(e).__name__, status, e)
+            return []
+
+    def _score_prompt(self, client: Groq, built: BuiltPrompt, timeout: Optional[float] = None) -> List[ScoredMatch]:
+        """
+        Send one prompt to Groq and resolve the returned matches.
+        Returns: List of tuples (profile, match score, explanation), empty if the response cannot be parsed
+        """
+        logger.debug("Sending request to Groq API with %d profiles (~%d prompt tokens)", built.included, built.tokens)
+        # A per-request timeout overrides the client default so shard threads do not outlive the search
+        options = {"timeout": timeout} if timeout is not None else {}
+        if GROQ_JSON_MODE:
+            options["response_format"] = {"type": "json_object"}
+        # Get response from Groq
+        with span("groq_call"):
             chat_completion = client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert at matching engineers based on their profiles. You always return valid JSON in the exact format requested."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt,
-                    }
-                ],
-                model="llama3-8b-8192",
+                messages=self._build_messages(built.prompt),
+                model=GROQ_MODEL,
                 temperature=0.3,
-                max_tokens=4000,
+                max_tokens=GROQ_MAX_COMPLETION_TOKENS,
+                **options,
             )
-            print("Debug: Received response from Groq API")
-            
-            response_text = chat_completion.choices[0].message.content.strip()
-            print(f"Debug: Response length: {len(response_text)}")
-            
-            # Parse JSON response
-            try:
-                # Find the first occurrence of '{'
-                json_start = response_text.find('{')
-                if json_start == -1:
-                    print("Debug: No JSON found in response")
-                    return []
-                
-                # Find the last occurrence of '}'
-                json_end = response_text.rfind('}') + 1
-                if json_end == 0:
-                    print("Debug: No closing brace found in response")
-                    return []
-                    
-                # Extract only the complete JSON object
-                json_text = response_text[json_start:json_end]
-                print(f"Debug: Extracted JSON text: {json_text[:200]}...")
-                
-                # Clean the JSON text
-                json_text = json_text.strip()
-                
-                matches = json.loads(json_text)["matches"]
-                print(f"Debug: Successfully parsed {len(matches)} matches")
-            except (json.JSONDecodeError, KeyError) as e:
-                print(f"Debug: Failed to parse response - {str(e)}")
-                print(f"Debug: Response text: {response_text[:200]}...")
-                return []
-            
-            # Convert to list of tuples (profile, explanation)
+
+        response_text = chat_completion.choices[0].message.content or ""
+        logger.debug("Received Groq response of %d characters", len(response_text))
+
+        with span("json_parse"):
+            matches = parse_matches(response_text)
             results = []
             for match in matches:
-                profile_id = match.get("profile_id")
-                explanation = match.get("explanation", "")
-                score = match.get("match_score", 0)
-                
-                # Find the profile with this ID
-                profile = next((p for p in profiles if str(p.id) == profile_id), None)
+                # Map the reference the model echoed back (alias or UUID) to the profile
+                profile = built.resolve(match.profile_id)
                 if profile:
-                    results.append((
-                        profile, 
-                        f"Match Score: {score}%\n{explanation}"
-                    ))
-            
-            print(f"Debug: Returning {len(results)} results")
-            return sorted(results, key=lambda x: float(x[1].split('%')[0].split(': ')[1]), reverse=True)
-                
-        except Exception as e:
-            print(f"Debug: Error during Groq search: {str(e)}")
-            print(f"Debug: Error type: {type(e)}")
-            if hasattr(e, 'response'):
-                print(f"Debug: Response status: {e.response.status_code}")
-                print(f"Debug: Response body: {e.response.text}")
-            return [] 
\ No newline at end of file
+                    results.append((profile, match.match_score, format_explanation(match)))
+
+        logger.debug("Groq returned %d of %d parsed matches", len(results), len(matches))
+        return results
+
+    def _score_shards(self, client: Groq, shards: List[BuiltPrompt]) -> List[ScoredMatch]:
+        """Score shards concurrently, at most shard_concurrency at a time, until the shard timeout expires."""
+        deadline = time.monotonic() + self.shard_timeout
+        queued = list(shards)
+        pending = set()
+        results: List[ScoredMatch] = []
+
+        while queued or pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            while queued and len(pending) < self.shard_concurrency:
+                # Run each shard in a copy of this context so its timing spans attach to the current request
+                context = contextvars.copy_context()
+                pending.add(_shard_executor.submit(context.run, self._score_prompt, client, queued.pop(0), remaining))
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    results.extend(future.result())
+                    SHARD_OUTCOMES.inc("ok")
+                except Exception as e:
+                    SHARD_OUTCOMES.inc("failed")
+                    logger.warning("Groq shard failed (%s): %s", type(e).__name__, e)
+
+        if queued or pending:
+            for future in pending:
+                future.cancel()
+            SHARD_OUTCOMES.inc("timeout", amount=len(queued) + len(pending))
+            logger.warning("Returning partial Groq results: %d of %d shards missed the %.1fs timeout",
+                           len(queued) + len(pending), len(shards), self.shard_timeout)
+        return results
+
+    async def search_profiles_async(self, query: str, profiles: List[UserProfile], api_key: str) -> List[ScoredMatch]:
+        """Non-blocking variant of search_profiles that runs the Groq call on the shared thread pool."""
+        return await run_blocking(self.search_profiles, query, profiles, api_key)
+
+    def stream_search_profiles(self, query: str, profiles: List[UserProfile], api_key: str) -> Iterator[ScoredMatch]:
+        """
+        Stream the Groq completion and yield each match as soon as its JSON object is complete.
+        Yields: tuples (profile, match score, explanation) in the order the model emits them
+        """
+        if not profiles:
+            return
+
+        if not api_key:
+            raise ValueError("Groq API key is required for semantic search")
+
+        client = self.client_registry.get(api_key)
+        with span("prompt_build"):
+            built = self._build_prompt(query, profiles)
+        if not built.included:
+            logger.warning("Prompt budget of %d tokens is too small for any candidate profile",
+                           self.prompt_builder.max_prompt_tokens)
+            return
+
+        logger.debug("Streaming request to Groq API with %d of %d candidate profiles (~%d prompt tokens)",
+                     built.included, built.total, built.tokens)
+        stream = client.chat.completions.create(
+            messages=self._build_messages(built.prompt),
+            model=GROQ_MODEL,
+            temperature=0.3,
+            max_tokens=GROQ_MAX_COMPLETION_TOKENS,
+            stream=True,
+        )
+        parser = MatchStreamParser()
+        emitted = set()
+        for chunk in stream:
+            content = chunk.choices[0].delta.content if chunk.choices else None
+            if not content:
+                continue
+            for item in parser.feed(content):
+                match = validate_match(item)
+                profile = built.resolve(match.profile_id) if match else None
+                if profile and profile.id not in emitted:
+                    emitted.add(profile.id)
+                    yield profile, match.match_score, format_explanation(match)
@@ -0,0 +1,172 @@
+import json
+import math
+import os
+import threading
+from collections import defaultdict
+from heapq import nlargest
+from typing import Collection, Dict, Iterable, List, Optional, Tuple
+from app.models.user import UserProfile
+from app.services.search_document import TAG_TERM_PREFIX, search_document, tokenize
+from app.services.taxonomy import taxonomy
+
+SNAPSHOT_VERSION = 2
+
+# Query words that carry no signal about a profile: English function words and the
+# phrasing of natural-language requests ("find someone experienced in ...")
+STOPWORDS = frozenset("""
+a about all also an and any anyone are as at be been but by can could do does for from has have help
+i in interested into is it its looking me my need of on or our person people please really
+someone somebody that the their them they this to us want we who whom with would you your
+find experience experienced expert
+""".split())
+
+
+def query_terms(tokens: List[str]) -> List[str]:
+    """Query tokens without stopwords, or all of them if nothing else is left."""
+    return [token for token in tokens if token not in STOPWORDS] or tokens
+
+
+class KeywordIndex:
+    """
+    In-memory inverted index over profile fields with BM25 ranking.
+
+    Results scoring below min_score_ratio times the best score are dropped, so
+    profiles that only share a generic word with the query are not returned.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, min_score_ratio: float = 0.2):
+        self.k1 = k1
+        self.b = b
+        self.min_score_ratio = min_score_ratio
+        self._lock = threading.RLock()
+        self._profiles: Dict[str, UserProfile] = {}
+        # term -> {profile_id: weighted term frequency}
+        self._postings: Dict[str, Dict[str, float]] = defaultdict(dict)
+        self._doc_lengths: Dict[str, float] = {}
+        self._total_length = 0.0
+
+    def __len__(self) -> int:
+        return len(self._profiles)
+
+    def get(self, profile_id: str) -> Optional[UserProfile]:
+        """Return an indexed profile by id."""
+        return self._profiles.get(profile_id)
+
+    def profiles(self) -> List[UserProfile]:
+        """Return all indexed profiles."""
+        with self._lock:
+            return list(self._profiles.values())
+
+    def build(self, profiles: Iterable[UserProfile]) -> None:
+        """Replace the index contents with the given profiles."""
+        with self._lock:
+            self._profiles.clear()
+            self._postings.clear()
+            self._doc_lengths.clear()
+            self._total_length = 0.0
+            for profile in profiles:
+                self.add(profile)
+
+    def add(self, profile: UserProfile) -> None:
+        """Index a single profile, replacing any previous version of it."""
+        profile_id = str(profile.id)
+        # Weighted term frequencies are precomputed in the profile's search document
+        frequencies = search_document(profile).terms
+        with self._lock:
+            if profile_id in self._profiles:
+                self.remove(profile_id)
+            self._profiles[profile_id] = profile
+            for term, frequency in frequencies.items():
+                self._postings[term][profile_id] = frequency
+            length = sum(frequencies.values())
+            self._doc_lengths[profile_id] = length
+            self._total_length += length
+
+    def remove(self, profile_id: str) -> None:
+        """Drop a profile from the index if present."""
+        with self._lock:
+            profile = self._profiles.pop(profile_id, None)
+            if profile is None:
+                return
+            for term in search_document(profile).terms:
+                postings = self._postings.get(term)
+                if postings is not None:
+                    postings.pop(profile_id, None)
+                    if not postings:
+                        del self._postings[term]
+            self._total_length -= self._doc_lengths.pop(profile_id, 0.0)
+
+    def search(
+        self,
+        query: str,
+        limit: Optional[int] = None,
+        allowed: Optional[Collection[str]] = None,
+        min_score_ratio: Optional[float] = None,
+    ) -> List[Tuple[UserProfile, float]]:
+        """
+        Rank indexed profiles against the query using BM25, optionally only those whose ids are in allowed.
+        min_score_ratio overrides the index's relative score floor (0 keeps every match).
+        Returns: List of tuples (profile, score) sorted by score, best first
+        """
+        tokens = tokenize(query)
+        terms = set(query_terms(tokens))
+        terms.update(TAG_TERM_PREFIX + tag_id for tag_id in taxonomy.find_in_text(query, tokens))
+        with self._lock:
+            doc_count = len(self._profiles)
+            if not terms or not doc_count:
+                return []
+            avg_length = self._total_length / doc_count or 1.0
+            scores: Dict[str, float] = defaultdict(float)
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                df = len(postings)
+                idf = math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+                for profile_id, tf in postings.items():
+                    if allowed is not None and profile_id not in allowed:
+                        continue
+                    norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[profile_id] / avg_length)
+                    scores[profile_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+
+            ratio = self.min_score_ratio if min_score_ratio is None else min_score_ratio
+            if scores and ratio > 0:
+                floor = ratio * max(scores.values())
+                scores = {pid: score for pid, score in scores.items() if score >= floor}
+            if limit is None:
+                ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+            else:
+                ranked = nlargest(limit, scores.items(), key=lambda item: item[1])
+            return [(self._profiles[pid], score) for pid, score in ranked]
+
+    def save_snapshot(self, path: str) -> None:
+        """Atomically write the index and its profiles to a JSON snapshot file."""
+        with self._lock:
+            snapshot = {
+                "version": SNAPSHOT_VERSION,
+                "k1": self.k1,
+                "b": self.b,
+                "profiles": [p.model_dump() for p in self._profiles.values()],
+                "postings": self._postings,
+                "doc_lengths": self._doc_lengths,
+            }
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f)
+            os.replace(tmp_path, path)
+
+    def load_snapshot(self, path: str) -> None:
+        """Replace the index contents with a snapshot written by save_snapshot."""
+        with open(path, encoding="utf-8") as f:
+            snapshot = json.load(f)
+        if snapshot.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported keyword index snapshot version: {snapshot.get('version')}")
+
+        profiles = [UserProfile(**data) for data in snapshot["profiles"]]
+        with self._lock:
+            self.k1 = snapshot["k1"]
+            self.b = snapshot["b"]
+            self._profiles = {str(p.id): p for p in profiles}
+            self._postings = defaultdict(dict, snapshot["postings"])
+            self._doc_lengths = snapshot["doc_lengths"]
+            self._total_length = sum(self._doc_lengths.values())
@@ -0,0 +1,94 @@
+import json
+import logging
+import re
+from typing import Any, List, Optional
+from pydantic import BaseModel, ValidationError, field_validator
+from app.services.stream_parser import MatchStreamParser
+
+logger = logging.getLogger(__name__)
+
+CODE_FENCE_PATTERN = re.compile(r"^```(?:json)?\s*|\s*```$")
+TRAILING_COMMA_PATTERN = re.compile(r",\s*([}\]])")
+
+
+class LLMMatch(BaseModel):
+    """One match as returned by the model, normalised to the types the search path relies on."""
+    profile_id: str
+    match_score: float = 0.0
+    explanation: str = ""
+
+    @field_validator("profile_id", mode="before")
+    @classmethod
+    def _coerce_profile_id(cls, value: Any) -> str:
+        # Compact prompts use integer references, which models return as numbers or strings
+        if isinstance(value, (int, str)) and not isinstance(value, bool):
+            return str(value).strip()
+        raise ValueError("profile_id must be a string or integer")
+
+    @field_validator("match_score", mode="before")
+    @classmethod
+    def _coerce_score(cls, value: Any) -> float:
+        if isinstance(value, str):
+            value = value.strip().rstrip("%")
+        elif value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))):
+            # float() raises TypeError for these, which pydantic would not turn into a ValidationError
+            raise ValueError("match_score must be a number or string")
+        return min(100.0, max(0.0, float(value or 0)))
+
+    @field_validator("explanation", mode="before")
+    @classmethod
+    def _coerce_explanation(cls, value: Any) -> str:
+        return "" if value is None else str(value)
+
+
+def _load_document(text: str) -> Optional[Any]:
+    """Decode the model output, repairing code fences, surrounding prose and trailing commas."""
+    text = CODE_FENCE_PATTERN.sub("", text.strip())
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        pass
+    start = text.find("{")
+    if start == -1:
+        return None
+    candidate = TRAILING_COMMA_PATTERN.sub(r"\1", text[start:])
+    try:
+        document, _ = json.JSONDecoder().raw_decode(candidate)
+        return document
+    except json.JSONDecodeError:
+        return None
+
+
+def validate_match(item: Any) -> Optional[LLMMatch]:
+    try:
+        return LLMMatch.model_validate(item)
+    except ValidationError as e:
+        logger.debug("Dropping invalid match %r: %s", item, e)
+        return None
+
+
+def parse_matches(text: str) -> List[LLMMatch]:
+    """
+    Parse an LLM response of the form {"matches": [...]} into validated matches.
+
+    Invalid entries are dropped individually. If the document cannot be decoded
+    at all (e.g. the completion was cut off at max_tokens), every match object
+    that was completed before the damage is salvaged.
+    """
+    document = _load_document(text)
+    if isinstance(document, dict):
+        items = document.get("matches")
+    elif isinstance(document, list):
+        items = document
+    else:
+        items = None
+
+    if not isinstance(items, list):
+        items = MatchStreamParser().feed(text)
+        if items:
+            logger.warning("Salvaged %d matches from a malformed Groq response", len(items))
+        else:
+            logger.warning("No matches found in Groq response")
+            logger.debug("Groq response text: %s", text[:200])
+
+    return [match for item in items if (match := validate_match(item))]
@@ -0,0 +1,162 @@
+import threading
+from array import array
+from collections import OrderedDict, defaultdict
+from heapq import nlargest
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+import numpy as np
+from app.models.user import UserProfile
+from app.services.embeddings import VectorIndex
+from app.services.taxonomy import TAG_ID_FIELDS, taxonomy
+
+
+class Neighbor(NamedTuple):
+    profile_id: str
+    score: float
+
+
+def profile_tags(profile: UserProfile) -> Dict[str, str]:
+    """Canonical tag id -> label for the skills, expertise and interests of a profile."""
+    tags: Dict[str, str] = {}
+    for field in TAG_ID_FIELDS:
+        for tag_id, label in taxonomy.profile_labels(profile, field).items():
+            tags.setdefault(tag_id, label)
+    return tags
+
+
+class NeighborIndex:
+    """
+    Nearest-neighbour table behind "similar profiles".
+
+    Similarity blends tag overlap (Jaccard over canonical skill, expertise and
+    interest ids) with cosine similarity of the profile vectors. A profile's
+    list is scored over the union of its best tag-overlap and best vector
+    candidates the first time it is requested and then served from the table.
+    Adding a profile scores it against every cached list owner and inserts it
+    where it makes the cut, so cached lists stay current without being
+    recomputed. Profiles are treated as immutable.
+    """
+
+    def __init__(
+        self,
+        vector_index: VectorIndex,
+        max_neighbors: int = 20,
+        tag_weight: float = 0.5,
+        candidates: int = 100,
+        max_cached: int = 10000,
+    ):
+        self.vector_index = vector_index
+        self.max_neighbors = max_neighbors
+        self.tag_weight = tag_weight
+        self.candidates = candidates
+        self.max_cached = max_cached
+        self._lock = threading.RLock()
+        self._ids: List[str] = []
+        self._numbers: Dict[str, int] = {}
+        self._profiles: Dict[str, UserProfile] = {}
+        self._tags: List[Dict[str, str]] = []
+        # tag id -> document numbers carrying it; tag count per document
+        self._postings: Dict[str, array] = defaultdict(lambda: array("i"))
+        self._tag_counts = array("i")
+        # profile id -> neighbours, best first
+        self._table: "OrderedDict[str, List[Neighbor]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def cached(self) -> int:
+        return len(self._table)
+
+    def build(self, profiles: Iterable[UserProfile]) -> None:
+        """Replace the index contents. Neighbour lists are computed on first request."""
+        with self._lock:
+            self._ids.clear()
+            self._numbers.clear()
+            self._profiles.clear()
+            self._tags.clear()
+            self._postings.clear()
+            self._tag_counts = array("i")
+            self._table.clear()
+            for profile in profiles:
+                self._register(profile)
+
+    def _register(self, profile: UserProfile) -> Optional[int]:
+        profile_id = str(profile.id)
+        self._profiles[profile_id] = profile
+        if profile_id in self._numbers:
+            return None
+        number = len(self._ids)
+        self._ids.append(profile_id)
+        self._numbers[profile_id] = number
+        tags = profile_tags(profile)
+        self._tags.append(tags)
+        self._tag_counts.append(len(tags))
+        for tag_id in tags:
+            self._postings[tag_id].append(number)
+        return number
+
+    def add(self, profile: UserProfile) -> None:
+        """Index a new profile and insert it into the cached lists it belongs in."""
+        with self._lock:
+            number = self._register(profile)
+            if number is None or not self._table:
+                return
+            owners = list(self._table)
+            for owner, score in zip(owners, self._scores(number, owners)):
+                neighbors = self._table[owner]
+                if score > 0 and (len(neighbors) < self.max_neighbors or score > neighbors[-1].score):
+                    neighbors.append(Neighbor(self._ids[number], float(score)))
+                    neighbors.sort(key=lambda neighbor: neighbor.score, reverse=True)
+                    del neighbors[self.max_neighbors:]
+
+    def _jaccard(self, number: int, others: np.ndarray) -> np.ndarray:
+        tags = self._tags[number]
+        if not tags or not len(others):
+            return np.zeros(len(others), dtype=np.float32)
+        postings = [np.frombuffer(self._postings[tag_id], dtype=np.int32) for tag_id in tags]
+        shared = np.bincount(np.concatenate(postings), minlength=len(self._ids))[others]
+        union = len(tags) + np.frombuffer(self._tag_counts, dtype=np.int32)[others] - shared
+        return np.divide(shared, union, out=np.zeros(len(others), dtype=np.float32), where=union > 0)
+
+    def _scores(self, number: int, other_ids: List[str]) -> np.ndarray:
+        others = np.fromiter((self._numbers[pid] for pid in other_ids), dtype=np.int64, count=len(other_ids))
+        cosine = np.maximum(self.vector_index.similarities(self._ids[number], other_ids), 0)
+        return self.tag_weight * self._jaccard(number, others) + (1 - self.tag_weight) * cosine
+
+    def _compute(self, number: int) -> List[Neighbor]:
+        profile_id = self._ids[number]
+        everyone = np.arange(len(self._ids))
+        jaccard = self._jaccard(number, everyone)
+        jaccard[number] = 0
+        count = min(self.candidates, len(jaccard))
+        by_tags = [int(i) for i in np.argpartition(-jaccard, count - 1)[:count] if jaccard[i] > 0] if count else []
+        by_vector = [pid for pid, _ in self.vector_index.neighbors(profile_id, self.candidates) if pid in self._numbers]
+        candidates = list(dict.fromkeys([self._ids[i] for i in by_tags] + by_vector))
+        if not candidates:
+            return []
+        scores = self._scores(number, candidates)
+        ranked = nlargest(self.max_neighbors, zip(candidates, scores.tolist()), key=lambda item: item[1])
+        return [Neighbor(pid, score) for pid, score in ranked if score > 0]
+
+    def similar(self, profile_id: str, limit: int) -> Optional[List[Tuple[UserProfile, float, List[str]]]]:
+        """
+        Most similar profiles to the given one.
+        Returns: List of tuples (profile, score, shared tag labels) best first, or None for unknown profiles
+        """
+        with self._lock:
+            number = self._numbers.get(profile_id)
+            if number is None:
+                return None
+            neighbors = self._table.get(profile_id)
+            if neighbors is None:
+                neighbors = self._compute(number)
+                self._table[profile_id] = neighbors
+                while len(self._table) > self.max_cached:
+                    self._table.popitem(last=False)
+            else:
+                self._table.move_to_end(profile_id)
+            tags = self._tags[number]
+            return [
+                (self._profiles[neighbor.profile_id], neighbor.score,
+                 [label for tag_id, label in tags.items() if tag_id in self._tags[self._numbers[neighbor.profile_id]]])
+                for neighbor in neighbors[:limit]
+            ]
@@ -0,0 +1,81 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, List, Optional
+from app.models.user import UserProfile
+
+
+class ProfileStore:
+    """
+    Bounded in-memory copy of the profiles table.
+
+    The store is "complete" when it holds every profile in the table, which lets
+    list_profiles be answered from memory. Once more than max_profiles have been
+    seen it degrades to an LRU cache for get_profile lookups only.
+    """
+
+    def __init__(self, max_profiles: int = 50000):
+        self.max_profiles = max_profiles
+        self._lock = threading.Lock()
+        self._profiles: "OrderedDict[str, UserProfile]" = OrderedDict()
+        self.complete = False
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.last_reconciled_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._profiles)
+
+    def __contains__(self, profile_id: str) -> bool:
+        return profile_id in self._profiles
+
+    def get(self, profile_id: str) -> Optional[UserProfile]:
+        with self._lock:
+            profile = self._profiles.get(profile_id)
+            if profile is None:
+                self.misses += 1
+                return None
+            self._profiles.move_to_end(profile_id)
+            self.hits += 1
+            return profile
+
+    def put(self, profile: UserProfile) -> None:
+        with self._lock:
+            profile_id = str(profile.id)
+            self._profiles[profile_id] = profile
+            self._profiles.move_to_end(profile_id)
+            while len(self._profiles) > self.max_profiles:
+                self._profiles.popitem(last=False)
+                self.evictions += 1
+                self.complete = False
+
+    def load(self, profiles: Iterable[UserProfile]) -> None:
+        """Replace the contents with a full snapshot of the table."""
+        with self._lock:
+            self._profiles.clear()
+            self.complete = True
+        for profile in profiles:
+            self.put(profile)
+
+    def values(self) -> List[UserProfile]:
+        with self._lock:
+            return list(self._profiles.values())
+
+    def mark_reconciled(self) -> None:
+        self.last_reconciled_at = time.time()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._profiles),
+                "max_profiles": self.max_profiles,
+                "complete": self.complete,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "last_reconciled_at": self.last_reconciled_at,
+                "staleness_seconds": time.time() - self.last_reconciled_at if self.last_reconciled_at else None,
+            }
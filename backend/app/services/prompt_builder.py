@@ -0,0 +1,206 @@
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from app.models.user import UserProfile
+from app.services.metrics import registry
+from app.services.search_document import estimate_tokens, search_document
+
+logger = logging.getLogger(__name__)
+
+PROMPT_TOKENS = registry.histogram(
+    "groq_prompt_tokens", "Estimated prompt tokens sent to Groq",
+    buckets=(250, 500, 1000, 2000, 4000, 6000, 8000, 16000, 32000),
+)
+PROMPT_PROFILES = registry.histogram(
+    "groq_prompt_profiles", "Candidate profiles included in a Groq prompt",
+    buckets=(1, 5, 10, 20, 50, 100, 200, 500),
+)
+
+COMPACT_HEADER = """Find the engineer profiles that best match the search query.
+
+Search Query: "{query}"
+
+Profiles, one per line as ref|name|technical skills|AI expertise|projects|collaboration interests|mentoring preferences:
+"""
+
+COMPACT_INSTRUCTIONS = """
+Score each profile 0-100: exact skill/expertise matches +40, related matches +30, mentoring and collaboration fit +20, other relevant factors +10.
+Return only JSON in this format, sorted by match_score descending, including every profile scoring above 30:
+{"matches": [{"profile_id": <ref number from the list>, "match_score": <0-100>, "explanation": "<one or two sentences>"}]}"""
+
+VERBOSE_HEADER = """You are an expert at matching engineers based on their profiles. Your task is to find the most relevant profiles that match the given search query.
+
+Search Query: "{query}"
+
+Available Engineer Profiles:
+"""
+
+VERBOSE_INSTRUCTIONS = """
+Instructions:
+1. Analyze the search query to understand the key requirements and preferences.
+2. For each profile, evaluate:
+   - Direct skill matches
+   - Related expertise and experience
+   - Project relevance
+   - Mentoring compatibility
+   - Collaboration potential
+   - Overall fit for the query
+3. Score each profile (0-100) based on:
+   - Exact matches: +40 points
+   - Related/Similar matches: +30 points
+   - Soft skill alignment: +20 points
+   - Additional relevant factors: +10 points
+
+Return your analysis in the following JSON format:
+{
+  "matches": [
+    {
+      "profile_id": "exact-profile-uuid-from-above",
+      "match_score": number-between-0-and-100,
+      "explanation": "Detailed explanation of why this profile matches"
+    }
+  ]
+}
+
+Important:
+- Include ANY profile with a score > 30
+- Be thorough but concise in explanations
+- Focus on the most relevant aspects for the query
+- Sort by match_score in descending order
+- Return valid JSON only"""
+
+
+def verbose_profile_context(profile: UserProfile) -> str:
+    """Multi-line context block for a profile, as used by the original prompt."""
+    return f"""Name: {profile.name}
+Technical Skills: {', '.join(profile.technical_skills)}
+Projects: {', '.join(profile.projects)}
+AI Expertise: {', '.join(profile.ai_expertise)}
+Mentoring Preferences: {profile.mentoring_preferences}
+Collaboration Interests: {', '.join(profile.collaboration_interests)}
+Portfolio: {profile.portfolio_url if profile.portfolio_url else 'Not provided'}
+"""
+
+
+@dataclass
+class BuiltPrompt:
+    prompt: str
+    # Reference used in the prompt (alias or UUID) -> profile
+    refs: Dict[str, UserProfile] = field(default_factory=dict)
+    total: int = 0
+    tokens: int = 0
+
+    @property
+    def included(self) -> int:
+        return len(self.refs)
+
+    def resolve(self, ref) -> Optional[UserProfile]:
+        """Map a profile reference returned by the model back to the profile."""
+        return self.refs.get(str(ref).strip()) if ref is not None else None
+
+
+class PromptBuilder:
+    """
+    Builds Groq matching prompts within a token budget.
+
+    In compact mode every profile is one tabular line prefixed with a short
+    integer alias that the model echoes back instead of the UUID; verbose mode
+    keeps the original multi-line blocks. Profiles are added in the order given
+    (best candidates first) until the budget is used up. Compact contexts and
+    their token counts come from each profile's search document; verbose ones
+    are cached here, since profiles do not change between queries.
+    """
+
+    def __init__(self, mode: str = "compact", max_prompt_tokens: int = 4000, cache_size: int = 50000):
+        if mode not in ("compact", "verbose"):
+            raise ValueError(f"Unknown prompt mode: {mode} (expected 'compact' or 'verbose')")
+        self.mode = mode
+        self.max_prompt_tokens = max_prompt_tokens
+        self.cache_size = cache_size
+        self._contexts: "OrderedDict[str, Tuple[str, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, reserved_tokens: int) -> "PromptBuilder":
+        """Budget whatever the model context leaves after reserved_tokens (completion, system prompt, message framing)."""
+        context_tokens = int(os.getenv("GROQ_CONTEXT_TOKENS", "8192"))
+        return cls(
+            mode=os.getenv("GROQ_PROMPT_MODE", "compact").lower(),
+            max_prompt_tokens=int(os.getenv("GROQ_MAX_PROMPT_TOKENS", str(context_tokens - reserved_tokens))),
+            cache_size=int(os.getenv("PROMPT_CONTEXT_CACHE_SIZE", "50000")),
+        )
+
+    def context(self, profile: UserProfile) -> Tuple[str, int]:
+        """Cached (context string, estimated tokens) for a profile."""
+        if self.mode == "compact":
+            document = search_document(profile)
+            return document.context, document.context_tokens
+        key = str(profile.id)
+        with self._lock:
+            cached = self._contexts.get(key)
+            if cached is not None:
+                self._contexts.move_to_end(key)
+                return cached
+        text = verbose_profile_context(profile)
+        entry = (text, estimate_tokens(text))
+        with self._lock:
+            self._contexts[key] = entry
+            while len(self._contexts) > self.cache_size:
+                self._contexts.popitem(last=False)
+        return entry
+
+    def build(self, query: str, profiles: List[UserProfile], max_profiles: Optional[int] = None) -> BuiltPrompt:
+        """Build one prompt from the leading profiles that fit the budget (and max_profiles, if set)."""
+        header_template, instructions = (
+            (COMPACT_HEADER, COMPACT_INSTRUCTIONS) if self.mode == "compact" else (VERBOSE_HEADER, VERBOSE_INSTRUCTIONS)
+        )
+        header = header_template.format(query=query)
+        tokens = estimate_tokens(header) + estimate_tokens(instructions)
+        built = BuiltPrompt(prompt="", total=len(profiles))
+        parts = [header]
+
+        for alias, profile in enumerate(profiles, start=1):
+            text, text_tokens = self.context(profile)
+            if self.mode == "compact":
+                ref = str(alias)
+                prefix, suffix = f"{ref}|", "\n"
+            else:
+                ref = str(profile.id)
+                prefix, suffix = f"Profile ID: {ref}\n", "---\n"
+            line_tokens = text_tokens + estimate_tokens(prefix + suffix)
+            if tokens + line_tokens > self.max_prompt_tokens or (max_profiles and alias > max_profiles):
+                break
+            parts.append(prefix + text + suffix)
+            built.refs[ref] = profile
+            tokens += line_tokens
+
+        parts.append(instructions)
+        built.prompt = "".join(parts)
+        built.tokens = tokens
+        PROMPT_TOKENS.observe(tokens)
+        PROMPT_PROFILES.observe(built.included)
+        return built
+
+    def shard(
+        self, query: str, profiles: List[UserProfile], max_profiles: Optional[int] = None, max_shards: Optional[int] = None
+    ) -> List[BuiltPrompt]:
+        """
+        Split profiles into consecutive prompts that each fit the budget, so they can be scored in parallel.
+        Profiles left over once max_shards prompts have been built are dropped.
+        """
+        shards: List[BuiltPrompt] = []
+        remaining = profiles
+        while remaining and (not max_shards or len(shards) < max_shards):
+            built = self.build(query, remaining, max_profiles)
+            if not built.included:
+                # A single profile larger than the whole budget; skip it instead of looping forever
+                logger.warning("Profile %s does not fit the prompt budget of %d tokens",
+                               remaining[0].id, self.max_prompt_tokens)
+                remaining = remaining[1:]
+                continue
+            shards.append(built)
+            remaining = remaining[built.included:]
+        return shards
@@ -0,0 +1,48 @@
+from collections import defaultdict
+from typing import Collection, Dict, List, Optional
+from app.models.user import UserProfile
+from app.services.embeddings import VectorIndex
+from app.services.keyword_index import KeywordIndex
+
+
+class CandidateRetriever:
+    """
+    First stage of LLM search: shortlist the top-K profiles cheaply from the
+    in-memory keyword and vector indexes so only those are sent to Groq.
+    """
+
+    def __init__(self, keyword_index: KeywordIndex, vector_index: VectorIndex, rrf_k: int = 60):
+        self.keyword_index = keyword_index
+        self.vector_index = vector_index
+        self.rrf_k = rrf_k
+
+    def shortlist(self, query: str, k: int, allowed: Optional[Collection[str]] = None) -> List[UserProfile]:
+        """
+        Return at most k candidate profiles for the query, optionally restricted to the ids in allowed.
+
+        Keyword and vector rankings are merged with reciprocal rank fusion. When
+        the whole community (or every allowed profile) fits in k, all of them
+        are candidates.
+        """
+        if allowed is None:
+            profiles = self.keyword_index.profiles()
+            if len(profiles) <= k:
+                return profiles
+        elif len(allowed) <= k:
+            return [profile for profile_id in allowed if (profile := self.keyword_index.get(profile_id))]
+
+        fused: Dict[str, float] = defaultdict(float)
+        by_id: Dict[str, UserProfile] = {}
+        rankings = (
+            # No score floor here: weak keyword matches still help recall before reranking
+            self.keyword_index.search(query, limit=k, allowed=allowed, min_score_ratio=0),
+            self.vector_index.search(query, limit=k, allowed=allowed),
+        )
+        for ranking in rankings:
+            for rank, (profile, _) in enumerate(ranking):
+                profile_id = str(profile.id)
+                fused[profile_id] += 1.0 / (self.rrf_k + rank + 1)
+                by_id[profile_id] = profile
+
+        ranked = sorted(fused, key=fused.get, reverse=True)[:k]
+        return [by_id[profile_id] for profile_id in ranked]
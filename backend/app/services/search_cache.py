@@ -0,0 +1,120 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+from app.services.keyword_index import tokenize
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query so trivially different phrasings share a cache entry."""
+    return " ".join(tokenize(query))
+
+
+class SearchCache:
+    """
+    LRU + TTL cache for search results.
+
+    Entries live in memory and, when a path is given, are written through to a
+    SQLite file so the cache survives restarts. Both tiers are bounded by
+    max_entries.
+    """
+
+    def __init__(self, max_entries: int = 1000, ttl_seconds: float = 3600, path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._conn = None
+        if path:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute(
+                "create table if not exists search_cache ("
+                "key text primary key, value text not null, expires_at real not null, last_access real not null)"
+            )
+            self._conn.execute("create index if not exists search_cache_access_idx on search_cache (last_access)")
+            self._conn.execute("delete from search_cache where expires_at < ?", (time.time(),))
+            self._conn.commit()
+
+    @staticmethod
+    def make_key(query: str, version: str, **params: Any) -> str:
+        """Build a cache key from the normalized query, profile-set version and search parameters."""
+        extra = "|".join(f"{name}={params[name]}" for name in sorted(params))
+        return f"v{version}|{normalize_query(query)}|{extra}"
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss or expired entry."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < now:
+                del self._entries[key]
+                entry = None
+            if entry is None and self._conn is not None:
+                row = self._conn.execute(
+                    "select value, expires_at from search_cache where key = ? and expires_at >= ?", (key, now)
+                ).fetchone()
+                if row:
+                    entry = (row[1], json.loads(row[0]))
+                    self._entries[key] = entry
+                    self._conn.execute("update search_cache set last_access = ? where key = ?", (now, key))
+                    self._conn.commit()
+                    self._evict_memory()
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable value under key."""
+        now = time.time()
+        expires_at = now + self.ttl_seconds
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            self._evict_memory()
+            if self._conn is not None:
+                self._conn.execute(
+                    "insert or replace into search_cache (key, value, expires_at, last_access) values (?, ?, ?, ?)",
+                    (key, json.dumps(value), expires_at, now),
+                )
+                self._conn.execute(
+                    "delete from search_cache where key in ("
+                    "select key from search_cache order by last_access desc limit -1 offset ?)",
+                    (self.max_entries,),
+                )
+                self._conn.commit()
+
+    def _evict_memory(self) -> None:
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        with self._lock:
+            self._entries.clear()
+            if self._conn is not None:
+                self._conn.execute("delete from search_cache")
+                self._conn.commit()
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "persistent": self._conn is not None,
+            }
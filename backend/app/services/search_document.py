@@ -0,0 +1,156 @@
+import hashlib
+import json
+import math
+import re
+from collections import defaultdict
+from typing import Any, Dict, List, NamedTuple, Optional
+from app.models.user import UserProfile
+from app.services.taxonomy import TAG_ID_FIELDS, taxonomy
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+# Words, digit runs and single punctuation marks, roughly how BPE tokenizers split text
+TOKEN_PIECE_PATTERN = re.compile(r"[^\W\d_]+|\d+|[^\w\s]|_")
+
+# Searchable fields in document order, with the boosts applied to their term
+# frequencies; skills matter more than free text.
+FIELD_WEIGHTS = {
+    "name": 2.0,
+    "technical_skills": 3.0,
+    "ai_expertise": 3.0,
+    "collaboration_interests": 2.0,
+    "projects": 1.5,
+    "mentoring_preferences": 1.0,
+}
+
+# Prefix of the terms indexing canonical skill ids; tokens never contain a colon
+TAG_TERM_PREFIX = "tag:"
+
+# Bump when the document format changes so stored documents are rebuilt
+DOCUMENT_VERSION = 1
+
+# Row columns holding a profile's stored search document
+DOCUMENT_COLUMNS = ("search_text", "search_terms", "search_context", "search_context_tokens", "content_hash")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase search tokens."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Conservative token count for Llama-style BPE tokenizers.
+
+    Every word is charged one token per four letters, digit runs one token per
+    three digits and each punctuation mark a full token, which overestimates
+    typical English text slightly so budgeted prompts stay within the context.
+    """
+    tokens = 0
+    for piece in TOKEN_PIECE_PATTERN.findall(text):
+        if piece[0].isdigit():
+            tokens += math.ceil(len(piece) / 3)
+        elif piece[0].isalpha():
+            tokens += math.ceil(len(piece) / 4)
+        else:
+            tokens += 1
+    return tokens
+
+
+def _truncate(text: str, limit: int) -> str:
+    text = " ".join(text.replace("|", "/").split())
+    return text if len(text) <= limit else text[:limit - 3].rstrip() + "..."
+
+
+def _truncate_list(items: List[str], max_items: int, item_limit: int) -> str:
+    shown = [_truncate(item, item_limit) for item in items[:max_items]]
+    if len(items) > max_items:
+        shown.append(f"+{len(items) - max_items} more")
+    return ", ".join(shown) or "-"
+
+
+def compact_profile_context(profile: UserProfile, text_limit: int = 160, max_items: int = 8, item_limit: int = 40) -> str:
+    """One-line tabular context for a profile, without its reference, with long fields truncated."""
+    return "|".join([
+        _truncate(profile.name, 60),
+        _truncate_list(profile.technical_skills, max_items, item_limit),
+        _truncate_list(profile.ai_expertise, max_items, item_limit),
+        _truncate_list(profile.projects, max_items, item_limit),
+        _truncate_list(profile.collaboration_interests, max_items, item_limit),
+        _truncate(profile.mentoring_preferences, text_limit),
+    ])
+
+
+def content_hash(profile: UserProfile) -> str:
+    """Hash of everything a search document is derived from, including the document format version."""
+    content = [DOCUMENT_VERSION] + [getattr(profile, field) for field in FIELD_WEIGHTS]
+    content += [getattr(profile, ids_field) for ids_field in TAG_ID_FIELDS.values()]
+    return hashlib.blake2b(json.dumps(content).encode("utf-8"), digest_size=16).hexdigest()
+
+
+class SearchDocument(NamedTuple):
+    """Search-ready form of a profile, derived once and reused by every search mode."""
+    # Lowercase tokens of the searchable fields in document order, space separated
+    text: str
+    # Field-weighted term frequencies, including tag:<id> terms for canonical skill ids
+    terms: Dict[str, float]
+    # Compact one-line prompt context and its estimated token count
+    context: str
+    context_tokens: int
+    content_hash: str
+
+    @property
+    def length(self) -> float:
+        return sum(self.terms.values())
+
+    def columns(self) -> Dict[str, Any]:
+        """Row values storing the document next to its profile."""
+        return {
+            "search_text": self.text,
+            "search_terms": self.terms,
+            "search_context": self.context,
+            "search_context_tokens": self.context_tokens,
+            "content_hash": self.content_hash,
+        }
+
+
+def build_document(profile: UserProfile) -> SearchDocument:
+    tokens: List[str] = []
+    terms: Dict[str, float] = defaultdict(float)
+    for field, weight in FIELD_WEIGHTS.items():
+        value = getattr(profile, field)
+        field_tokens = tokenize(" ".join(value) if isinstance(value, list) else value or "")
+        tokens.extend(field_tokens)
+        for token in field_tokens:
+            terms[token] += weight
+    # Canonical ids let "ML" in a query match a profile tagged "Machine Learning"
+    for field in TAG_ID_FIELDS:
+        for tag_id in taxonomy.profile_ids(profile, field):
+            terms[TAG_TERM_PREFIX + tag_id] += FIELD_WEIGHTS[field]
+    context = compact_profile_context(profile)
+    return SearchDocument(" ".join(tokens), dict(terms), context, estimate_tokens(context), content_hash(profile))
+
+
+def search_document(profile: UserProfile) -> SearchDocument:
+    """The profile's search document, built on first use and kept on the profile."""
+    document = profile._search_document
+    if document is None:
+        document = build_document(profile)
+        profile._search_document = document
+    return document
+
+
+def stored_document(profile: UserProfile, row: Dict[str, Any]) -> Optional[SearchDocument]:
+    """
+    Attach the document stored with a profile row, unless it is missing or was
+    built from other content or an older format.
+    Returns: The attached document, or None if the row needs a new one
+    """
+    if any(row.get(column) is None for column in DOCUMENT_COLUMNS) or row["content_hash"] != content_hash(profile):
+        return None
+    document = SearchDocument(
+        row["search_text"], row["search_terms"], row["search_context"],
+        row["search_context_tokens"], row["content_hash"],
+    )
+    profile._search_document = document
+    return document
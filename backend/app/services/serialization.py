@@ -0,0 +1,28 @@
+from typing import Any
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode content as JSON with orjson. Pydantic models are dumped as they are, without re-validation."""
+    return orjson.dumps(content, default=_default)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson.
+
+    Returning one from an endpoint also skips FastAPI's response_model
+    validation and jsonable_encoder pass, so use it for bodies built from
+    already-validated profiles or trusted rows.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,140 @@
+import json
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from app.services.search_document import DOCUMENT_COLUMNS
+from app.services.storage import ProfileStorage
+
+# Array fields (and the search document's term frequencies) are stored as JSON text columns
+JSON_FIELDS = ("technical_skills", "projects", "ai_expertise", "collaboration_interests",
+               "technical_skill_ids", "ai_expertise_ids", "collaboration_interest_ids", "search_terms")
+COLUMNS = ("id", "name", "technical_skills", "projects", "ai_expertise",
+           "mentoring_preferences", "collaboration_interests", "portfolio_url",
+           "technical_skill_ids", "ai_expertise_ids", "collaboration_interest_ids",
+           *DOCUMENT_COLUMNS, "created_at")
+# Columns added after the first release, created on databases that predate them
+ADDED_COLUMNS = {
+    "technical_skill_ids": "text not null default '[]'",
+    "ai_expertise_ids": "text not null default '[]'",
+    "collaboration_interest_ids": "text not null default '[]'",
+    "search_text": "text",
+    "search_terms": "text",
+    "search_context": "text",
+    "search_context_tokens": "integer",
+    "content_hash": "text",
+}
+
+SCHEMA = """
+create table if not exists profiles (
+  id text primary key,
+  name text not null,
+  technical_skills text not null default '[]',
+  projects text not null default '[]',
+  ai_expertise text not null default '[]',
+  mentoring_preferences text not null,
+  collaboration_interests text not null default '[]',
+  portfolio_url text,
+  technical_skill_ids text not null default '[]',
+  ai_expertise_ids text not null default '[]',
+  collaboration_interest_ids text not null default '[]',
+  search_text text,
+  search_terms text,
+  search_context text,
+  search_context_tokens integer,
+  content_hash text,
+  created_at text not null default (strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now'))
+);
+
+create index if not exists profiles_created_at_id_idx on profiles (created_at, id);
+"""
+
+
+class SQLiteDatabaseService(ProfileStorage):
+    """
+    Local SQLite implementation of ProfileStorage.
+
+    Array fields and search document terms are stored as JSON columns.
+    Pass ":memory:" for a throwaway database.
+    """
+
+    def __init__(self, path: str = "profiles.db"):
+        super().__init__()
+        self.path = path
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        if path != ":memory:":
+            self.conn.execute("pragma journal_mode=wal")
+        self.conn.executescript(SCHEMA)
+        self._add_missing_columns()
+        self.conn.commit()
+
+    def _add_missing_columns(self) -> None:
+        existing = {row["name"] for row in self.conn.execute("pragma table_info(profiles)")}
+        for name, definition in ADDED_COLUMNS.items():
+            if name not in existing:
+                self.conn.execute(f"alter table profiles add column {name} {definition}")
+
+    def _query(self, sql: str, params: Sequence[Any] = ()) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return [self._decode(row) for row in rows]
+
+    @staticmethod
+    def _decode(row: sqlite3.Row) -> Dict[str, Any]:
+        data = dict(row)
+        for name in JSON_FIELDS:
+            if data.get(name) is not None:
+                data[name] = json.loads(data[name])
+        return data
+
+    @staticmethod
+    def _encode(row: Dict[str, Any], columns: Sequence[str] = COLUMNS[:-1]) -> Tuple[Any, ...]:
+        return tuple(
+            json.dumps(row[name] if row.get(name) is not None else []) if name in JSON_FIELDS else row.get(name)
+            for name in columns
+        )
+
+    def _insert_rows(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        placeholders = ", ".join("?" for _ in COLUMNS[:-1])
+        with self._lock:
+            with self.conn:
+                self.conn.executemany(
+                    f"insert into profiles ({', '.join(COLUMNS[:-1])}) values ({placeholders})",
+                    [self._encode(row) for row in rows],
+                )
+        return self._fetch_by_ids([str(row["id"]) for row in rows])
+
+    def _update_documents(self, rows: List[Dict[str, Any]]) -> None:
+        assignments = ", ".join(f"{name} = ?" for name in DOCUMENT_COLUMNS)
+        with self._lock:
+            with self.conn:
+                self.conn.executemany(
+                    f"update profiles set {assignments} where id = ?",
+                    [(*self._encode(row, DOCUMENT_COLUMNS), row["id"]) for row in rows],
+                )
+
+    def _fetch_by_id(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        rows = self._query("select * from profiles where id = ?", (profile_id,))
+        return rows[0] if rows else None
+
+    def _fetch_by_ids(self, profile_ids: List[str]) -> List[Dict[str, Any]]:
+        if not profile_ids:
+            return []
+        placeholders = ", ".join("?" for _ in profile_ids)
+        return self._query(
+            f"select * from profiles where id in ({placeholders}) order by created_at, id", profile_ids
+        )
+
+    def _fetch_page(
+        self, columns: Optional[List[str]], limit: int, after: Optional[Tuple[str, str]]
+    ) -> List[Dict[str, Any]]:
+        select = ", ".join(columns + ["created_at"]) if columns else "*"
+        if after:
+            created_at, last_id = after
+            return self._query(
+                f"select {select} from profiles where created_at > ? or (created_at = ? and id > ?) "
+                "order by created_at, id limit ?",
+                (created_at, created_at, last_id, limit),
+            )
+        return self._query(f"select {select} from profiles order by created_at, id limit ?", (limit,))
@@ -0,0 +1,330 @@
+from abc import ABC, abstractmethod
+from dotenv import load_dotenv
+import base64
+import hashlib
+import json
+import logging
+import os
+import re
+import uuid
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from app.models.user import UserProfile
+from app.services.concurrency import run_blocking
+from app.services.metrics import span
+from app.services.profile_store import ProfileStore
+from app.services.search_document import SearchDocument, search_document, stored_document
+from app.services.taxonomy import taxonomy
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Ids fetched per request when reconciling profiles missing from memory
+RECONCILE_BATCH_SIZE = 200
+
+PROFILE_FIELDS = tuple(UserProfile.model_fields)
+# Rows per request when reading the whole table. Supabase caps one select at its max-rows
+# setting (1000 by default), so full reads are paged by (created_at, id) until a page comes back empty
+FETCH_PAGE_SIZE = 1000
+# Rows per request when writing search documents for rows stored without one
+DOCUMENT_BACKFILL_BATCH_SIZE = 500
+# Sorts before every profile id, for keyset positions at the start of a timestamp
+NIL_UUID = "00000000-0000-0000-0000-000000000000"
+
+# created_at values as Postgres and the SQLite schema write them; cursors go into PostgREST filters, so nothing else is accepted
+TIMESTAMP_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(\.\d{1,6})?(Z|[+-]\d{2}(:?\d{2})?)?")
+
+def encode_cursor(created_at: str, profile_id: str) -> str:
+    """Encode a keyset position as an opaque URL-safe cursor."""
+    raw = json.dumps([created_at, profile_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """Decode a cursor produced by encode_cursor, checking it holds a timestamp and a profile UUID."""
+    try:
+        created_at, profile_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        if not isinstance(created_at, str) or not TIMESTAMP_PATTERN.fullmatch(created_at):
+            raise ValueError(f"not a timestamp: {created_at!r}")
+        return created_at, str(uuid.UUID(profile_id))
+    except (ValueError, TypeError, AttributeError) as e:
+        raise ValueError("Invalid pagination cursor") from e
+
+def validate_fields(fields: Optional[Sequence[str]]) -> Optional[List[str]]:
+    """Check a field projection against UserProfile and make sure id is included."""
+    if not fields:
+        return None
+    unknown = [f for f in fields if f not in PROFILE_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown profile fields: {', '.join(unknown)}")
+    return ["id"] + [f for f in dict.fromkeys(fields) if f != "id"]
+
+def profile_from_row(row: Dict[str, Any], document: Optional[SearchDocument] = None) -> UserProfile:
+    """
+    Validate a stored row into a profile with the given search document, or
+    else the one stored with the row when it is current.
+    """
+    profile = UserProfile(**row)
+    if document is not None:
+        profile._search_document = document
+    else:
+        stored_document(profile, row)
+    return profile
+
+def document_row(profile: UserProfile) -> Dict[str, Any]:
+    """Row for a profile including its search document columns."""
+    return {**profile.model_dump(), **search_document(profile).columns()}
+
+
+class ProfileStorage(ABC):
+    """
+    Storage interface for profiles.
+
+    Backends implement the row-level _fetch_*/_insert_rows/_update_documents
+    primitives; this base class layers the in-memory profile store,
+    profile-set version, reconciliation and pagination on top of them. Rows are
+    plain dicts with list fields already decoded and a created_at timestamp,
+    and carry the profile's search document columns (see search_document).
+    """
+
+    def __init__(self):
+        # Ids of the stored profiles known to this process and an order-independent
+        # digest of them, from which the profile-set version is derived
+        self._known_ids: set = set()
+        self._ids_digest = 0
+        # Read-through copy of the profiles table, reconciled against the database periodically
+        self.profile_store = ProfileStore(max_profiles=int(os.getenv("PROFILE_CACHE_SIZE", "50000")))
+        # Latest created_at seen from the database; rows from then on are picked up by reconcile()
+        self._high_water_mark: Optional[str] = None
+
+    @property
+    def version(self) -> str:
+        """
+        Identifies the set of stored profiles this process knows about. It is derived
+        from the stored ids rather than counted in memory, so processes that have seen
+        the same rows agree on it and a restarted process never reuses an old version.
+        """
+        return f"{len(self._known_ids)}-{self._ids_digest:016x}"
+
+    def _track(self, profiles: List[UserProfile]) -> None:
+        for profile in profiles:
+            profile_id = str(profile.id)
+            if profile_id not in self._known_ids:
+                self._known_ids.add(profile_id)
+                self._ids_digest ^= int.from_bytes(
+                    hashlib.blake2b(profile_id.encode("utf-8"), digest_size=8).digest(), "big"
+                )
+
+    def _reset_tracking(self) -> None:
+        self._known_ids = set()
+        self._ids_digest = 0
+
+    @abstractmethod
+    def _insert_rows(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Insert rows and return them as stored."""
+
+    @abstractmethod
+    def _fetch_by_id(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        """Fetch a single row by id."""
+
+    @abstractmethod
+    def _fetch_by_ids(self, profile_ids: List[str]) -> List[Dict[str, Any]]:
+        """Fetch the rows with the given ids."""
+
+    @abstractmethod
+    def _fetch_page(
+        self, columns: Optional[List[str]], limit: int, after: Optional[Tuple[str, str]]
+    ) -> List[Dict[str, Any]]:
+        """Fetch up to limit rows ordered by (created_at, id) after the given position, including created_at."""
+
+    def _fetch_all(
+        self, columns: Optional[List[str]] = None, after: Optional[Tuple[str, str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Fetch every row after the given position, oldest first, one page per request."""
+        rows: List[Dict[str, Any]] = []
+        while page := self._fetch_page(columns, FETCH_PAGE_SIZE, after):
+            rows.extend(page)
+            after = (page[-1]["created_at"], str(page[-1]["id"]))
+        return rows
+
+    @abstractmethod
+    def _update_documents(self, rows: List[Dict[str, Any]]) -> None:
+        """
+        Overwrite the search document columns of existing rows, matched by id.
+        Rows are full profile rows (see document_row); other columns may be rewritten unchanged.
+        """
+
+    def create_profile(self, profile: UserProfile) -> UserProfile:
+        with span("tag_canonicalization"):
+            profile = taxonomy.canonicalize_profile(profile)
+        with span("search_document"):
+            row = document_row(profile)
+        with span("db_write"):
+            row = self._insert_rows([row])[0]
+        with span("profile_validation"):
+            created = profile_from_row(row, search_document(profile))
+        self.profile_store.put(created)
+        self._track([created])
+        return created
+
+    def create_profiles(self, profiles: List[UserProfile]) -> List[UserProfile]:
+        """Insert a batch of profiles in a single request."""
+        if not profiles:
+            return []
+        with span("tag_canonicalization"):
+            profiles = [taxonomy.canonicalize_profile(p) for p in profiles]
+        with span("search_document"):
+            rows = [document_row(p) for p in profiles]
+        with span("db_write"):
+            rows = self._insert_rows(rows)
+        documents = {str(p.id): search_document(p) for p in profiles}
+        with span("profile_validation"):
+            created = [profile_from_row(row, documents.get(str(row["id"]))) for row in rows]
+        for profile in created:
+            self.profile_store.put(profile)
+        self._track(created)
+        return created
+
+    def get_profile(self, profile_id: str) -> Optional[UserProfile]:
+        if cached := self.profile_store.get(profile_id):
+            return cached
+        with span("db_fetch"):
+            row = self._fetch_by_id(profile_id)
+        if not row:
+            return None
+        with span("profile_validation"):
+            profile = profile_from_row(row)
+        self.profile_store.put(profile)
+        return profile
+
+    def list_profiles(self) -> List[UserProfile]:
+        if self.profile_store.complete:
+            return self.profile_store.values()
+        return self.warm()
+
+    def warm(self) -> List[UserProfile]:
+        """Load the whole profiles table into memory and return it."""
+        with span("db_fetch"):
+            rows = self._fetch_all()
+        with span("profile_validation"):
+            profiles = [UserProfile(**row) for row in rows]
+        with span("search_document"):
+            stale = [profile for profile, row in zip(profiles, rows) if not stored_document(profile, row)]
+        if stale:
+            self.backfill_documents(stale)
+        self.profile_store.load(profiles)
+        self._reset_tracking()
+        self._track(profiles)
+        self._advance_high_water_mark(rows)
+        self.profile_store.mark_reconciled()
+        return profiles
+
+    def backfill_documents(self, profiles: List[UserProfile]) -> None:
+        """Build and store search documents for profiles whose rows have none or an outdated one."""
+        logger.info("Writing search documents for %d profiles", len(profiles))
+        with span("search_document"):
+            rows = [document_row(p) for p in profiles]
+        with span("db_write"):
+            for i in range(0, len(rows), DOCUMENT_BACKFILL_BATCH_SIZE):
+                self._update_documents(rows[i:i + DOCUMENT_BACKFILL_BATCH_SIZE])
+
+    def seed(self, profiles: List[UserProfile]) -> None:
+        """
+        Populate the store from an external snapshot (e.g. the keyword index) instead of
+        a full table pull. The next reconcile() fetches whatever the snapshot is missing.
+        """
+        self.profile_store.load(profiles)
+        self._reset_tracking()
+        self._track(profiles)
+        self._high_water_mark = None
+
+    def reconcile(self) -> List[UserProfile]:
+        """
+        Pick up profiles written by other processes since the last sync.
+        Returns: Profiles that were not part of the profile set before
+        """
+        with span("db_fetch"):
+            if self._high_water_mark is None:
+                # No high-water mark yet: compare ids, then fetch only the missing rows
+                id_rows = self._fetch_all(["id"])
+                missing = [row["id"] for row in id_rows if row["id"] not in self._known_ids]
+                rows = []
+                for i in range(0, len(missing), RECONCILE_BATCH_SIZE):
+                    rows.extend(self._fetch_by_ids(missing[i:i + RECONCILE_BATCH_SIZE]))
+                self._advance_high_water_mark(id_rows)
+            else:
+                # Rows sharing the mark's timestamp may have landed after it was taken, so
+                # start from the first id at that timestamp; rows already known are skipped below
+                rows = self._fetch_all(after=(self._high_water_mark, NIL_UUID))
+                self._advance_high_water_mark(rows)
+
+        # New means not yet in the profile set, even if get_profile already cached the row
+        new_profiles = []
+        for row in rows:
+            if row["id"] not in self._known_ids:
+                profile = profile_from_row(row)
+                self.profile_store.put(profile)
+                new_profiles.append(profile)
+        self._track(new_profiles)
+        self.profile_store.mark_reconciled()
+        return new_profiles
+
+    def _advance_high_water_mark(self, rows: List[Dict[str, Any]]) -> None:
+        timestamps = [row["created_at"] for row in rows if row.get("created_at")]
+        if timestamps:
+            latest = max(timestamps)
+            if self._high_water_mark is None or latest > self._high_water_mark:
+                self._high_water_mark = latest
+
+    def list_profiles_page(
+        self, limit: int, cursor: Optional[str] = None, fields: Optional[Sequence[str]] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Fetch one page of profiles ordered by (created_at, id) using keyset pagination.
+        Returns: Tuple of (rows limited to the requested fields, cursor for the next page or None)
+        """
+        # Explicit columns keep the search document columns out of listings
+        columns = validate_fields(fields) or list(PROFILE_FIELDS)
+        after = decode_cursor(cursor) if cursor else None
+        with span("db_fetch"):
+            rows = self._fetch_page(columns, limit + 1, after)
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+        for row in rows:
+            row.pop("created_at", None)
+        return rows, next_cursor
+
+    async def create_profile_async(self, profile: UserProfile) -> UserProfile:
+        return await run_blocking(self.create_profile, profile)
+
+    async def get_profile_async(self, profile_id: str) -> Optional[UserProfile]:
+        return await run_blocking(self.get_profile, profile_id)
+
+    async def list_profiles_async(self) -> List[UserProfile]:
+        return await run_blocking(self.list_profiles)
+
+    async def list_profiles_page_async(
+        self, limit: int, cursor: Optional[str] = None, fields: Optional[Sequence[str]] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        return await run_blocking(self.list_profiles_page, limit, cursor, fields)
+
+    async def warm_async(self) -> List[UserProfile]:
+        return await run_blocking(self.warm)
+
+    async def reconcile_async(self) -> List[UserProfile]:
+        return await run_blocking(self.reconcile)
+
+
+def create_database_service() -> ProfileStorage:
+    """Build the storage backend selected by STORAGE_BACKEND ("supabase" or "sqlite")."""
+    backend = os.getenv("STORAGE_BACKEND", "supabase").lower()
+    if backend == "supabase":
+        from app.services.db import DatabaseService
+        return DatabaseService()
+    if backend == "sqlite":
+        from app.services.sqlite_db import SQLiteDatabaseService
+        return SQLiteDatabaseService(os.getenv("SQLITE_PATH", "profiles.db"))
+    raise ValueError(f"Unknown STORAGE_BACKEND: {backend} (expected 'supabase' or 'sqlite')")
@@ -0,0 +1,55 @@
+import json
+from typing import List
+
+
+class MatchStreamParser:
+    """
+    Incremental parser for LLM responses of the form {"matches": [{...}, {...}]}.
+
+    Text is fed in arbitrary chunks as it streams in; every object nested directly
+    inside an array of the top-level object is returned as soon as its closing
+    brace arrives, without waiting for the rest of the document.
+    """
+
+    def __init__(self):
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escaped = False
+        self._buffer: List[str] = []
+        self._capturing = False
+
+    def feed(self, chunk: str) -> List[dict]:
+        """Consume a chunk of text and return any objects completed by it."""
+        completed = []
+        for char in chunk:
+            if self._capturing:
+                self._buffer.append(char)
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                if self._stack:
+                    self._in_string = True
+            elif char in "{[":
+                if char == "{" and self._stack == ["{", "["]:
+                    self._capturing = True
+                    self._buffer = [char]
+                self._stack.append(char)
+            elif char in "}]":
+                if self._stack:
+                    self._stack.pop()
+                if self._capturing and char == "}" and self._stack == ["{", "["]:
+                    self._capturing = False
+                    try:
+                        completed.append(json.loads("".join(self._buffer)))
+                    except json.JSONDecodeError:
+                        pass
+                    self._buffer = []
+        return completed
@@ -0,0 +1,285 @@
+import difflib
+import json
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+from app.models.user import UserProfile
+
+logger = logging.getLogger(__name__)
+
+# Free-form tag field -> field holding its canonical ids
+TAG_ID_FIELDS = {
+    "technical_skills": "technical_skill_ids",
+    "ai_expertise": "ai_expertise_ids",
+    "collaboration_interests": "collaboration_interest_ids",
+}
+
+# Separators that do not change the meaning of a tag ("machine-learning", "node.js", "CI/CD")
+SEPARATOR_PATTERN = re.compile(r"[\s\-_./]+")
+SLUG_PATTERN = re.compile(r"[^a-z0-9+#]+")
+WORD_PATTERN = re.compile(r"[a-z0-9+#]+")
+# Longest alias, in words, looked for when scanning free text for known tags
+MAX_ALIAS_WORDS = 4
+
+# Canonical id -> (display label, aliases). Keys and labels are aliases of themselves.
+DEFAULT_TAXONOMY: Dict[str, tuple] = {
+    # Languages
+    "python": ("Python", ["py", "python3"]),
+    "javascript": ("JavaScript", ["js", "ecmascript", "es6"]),
+    "typescript": ("TypeScript", ["ts"]),
+    "java": ("Java", []),
+    "go": ("Go", ["golang"]),
+    "rust": ("Rust", []),
+    "c++": ("C++", ["cpp", "cplusplus"]),
+    "c#": ("C#", ["csharp", "c sharp"]),
+    "kotlin": ("Kotlin", []),
+    "swift": ("Swift", []),
+    "ruby": ("Ruby", []),
+    "php": ("PHP", []),
+    "r": ("R", ["rlang"]),
+    "scala": ("Scala", []),
+    "sql": ("SQL", []),
+    # Web and backend
+    "react": ("React", ["reactjs", "react js"]),
+    "next-js": ("Next.js", ["nextjs"]),
+    "vue": ("Vue", ["vuejs", "vue js"]),
+    "angular": ("Angular", ["angularjs"]),
+    "node-js": ("Node.js", ["node", "nodejs"]),
+    "fastapi": ("FastAPI", ["fast api"]),
+    "django": ("Django", []),
+    "flask": ("Flask", []),
+    "graphql": ("GraphQL", []),
+    "rest-api": ("REST APIs", ["rest api", "restful apis", "restful api"]),
+    "streamlit": ("Streamlit", []),
+    # Data and infrastructure
+    "postgresql": ("PostgreSQL", ["postgres", "psql"]),
+    "mongodb": ("MongoDB", ["mongo"]),
+    "redis": ("Redis", []),
+    "docker": ("Docker", ["containers"]),
+    "kubernetes": ("Kubernetes", ["k8s", "kube"]),
+    "aws": ("AWS", ["amazon web services"]),
+    "gcp": ("Google Cloud", ["google cloud platform"]),
+    "azure": ("Azure", ["microsoft azure"]),
+    "ci-cd": ("CI/CD", ["cicd", "continuous integration"]),
+    "spark": ("Apache Spark", ["pyspark"]),
+    "data-engineering": ("Data Engineering", []),
+    "data-science": ("Data Science", []),
+    # ML and AI
+    "machine-learning": ("Machine Learning", ["ml"]),
+    "deep-learning": ("Deep Learning", ["dl"]),
+    "artificial-intelligence": ("Artificial Intelligence", ["ai"]),
+    "nlp": ("NLP", ["natural language processing"]),
+    "computer-vision": ("Computer Vision", ["cv"]),
+    "llm": ("LLMs", ["llms", "large language models", "large language model"]),
+    "generative-ai": ("Generative AI", ["genai", "gen ai"]),
+    "rag": ("RAG", ["retrieval augmented generation"]),
+    "prompt-engineering": ("Prompt Engineering", []),
+    "reinforcement-learning": ("Reinforcement Learning", ["rl"]),
+    "mlops": ("MLOps", ["ml ops"]),
+    "ai-agents": ("AI Agents", ["agents", "llm agents", "agentic ai"]),
+    "fine-tuning": ("Fine-tuning", ["finetuning", "llm fine tuning"]),
+    "recommender-systems": ("Recommender Systems", ["recommendation systems", "recsys"]),
+    "speech-recognition": ("Speech Recognition", ["asr"]),
+    "pytorch": ("PyTorch", ["torch"]),
+    "tensorflow": ("TensorFlow", ["tf"]),
+    "scikit-learn": ("scikit-learn", ["sklearn", "scikit"]),
+    "langchain": ("LangChain", []),
+    "hugging-face": ("Hugging Face", ["huggingface", "transformers"]),
+    "openai-api": ("OpenAI API", ["openai"]),
+    # Collaboration
+    "open-source": ("Open Source", ["oss", "open source projects"]),
+    "ai-projects": ("AI Projects", []),
+    "hackathons": ("Hackathons", ["hackathon"]),
+    "startups": ("Startups", ["startup"]),
+    "research": ("Research", ["research papers"]),
+    "mentoring": ("Mentoring", ["mentorship"]),
+}
+
+
+class Tag(NamedTuple):
+    id: str
+    label: str
+    # False for tags outside the taxonomy, which keep a slug of their own spelling as id
+    known: bool
+
+
+def tag_key(value: str) -> str:
+    """Lowercase a tag and collapse separators so spelling variants compare equal."""
+    return SEPARATOR_PATTERN.sub(" ", value.lower()).strip()
+
+
+def _slug(key: str) -> str:
+    return SLUG_PATTERN.sub("-", key).strip("-")
+
+
+class SkillTaxonomy:
+    """
+    Maps free-form tags to canonical ids.
+
+    A tag is looked up by its normalized spelling (case and separators ignored,
+    with and without spaces) in the alias table, then by fuzzy string matching
+    against every alias with the same number of words for typos such as "Pytorhc". Tags that match neither
+    keep a slug of their own spelling as id, so every tag has one. Results are
+    cached since the same tags recur across profiles and queries.
+    """
+
+    def __init__(
+        self,
+        entries: Optional[Dict[str, tuple]] = None,
+        fuzzy_cutoff: float = 0.85,
+        min_fuzzy_length: int = 5,
+        cache_size: int = 20000,
+    ):
+        self.fuzzy_cutoff = fuzzy_cutoff
+        self.min_fuzzy_length = min_fuzzy_length
+        self.cache_size = cache_size
+        self._labels: Dict[str, str] = {}
+        self._aliases: Dict[str, str] = {}
+        self._cache: "OrderedDict[str, Tag]" = OrderedDict()
+        self._lock = threading.Lock()
+        for canonical_id, (label, aliases) in (entries if entries is not None else DEFAULT_TAXONOMY).items():
+            self.add(canonical_id, label, aliases)
+
+    @classmethod
+    def from_env(cls) -> "SkillTaxonomy":
+        """Default taxonomy, extended with the JSON file at SKILL_TAXONOMY_PATH if set."""
+        taxonomy = cls(
+            fuzzy_cutoff=float(os.getenv("SKILL_FUZZY_CUTOFF", "0.85")),
+            cache_size=int(os.getenv("SKILL_TAXONOMY_CACHE_SIZE", "20000")),
+        )
+        path = os.getenv("SKILL_TAXONOMY_PATH")
+        if path:
+            try:
+                taxonomy.load(path)
+            except (OSError, ValueError) as e:
+                logger.warning("Failed to load skill taxonomy from %s: %s", path, e)
+        return taxonomy
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    def add(self, canonical_id: str, label: str, aliases: Iterable[str] = ()) -> None:
+        """Add a canonical tag, or extend an existing one with more aliases."""
+        with self._lock:
+            self._labels.setdefault(canonical_id, label)
+            for alias in (canonical_id, label, *aliases):
+                key = tag_key(alias)
+                if key:
+                    self._aliases.setdefault(key, canonical_id)
+                    self._aliases.setdefault(key.replace(" ", ""), canonical_id)
+            self._cache.clear()
+
+    def load(self, path: str) -> None:
+        """Merge entries from a JSON file of the form {"id": {"label": "...", "aliases": [...]}}."""
+        with open(path, encoding="utf-8") as f:
+            entries = json.load(f)
+        if not isinstance(entries, dict):
+            raise ValueError("Skill taxonomy must be a JSON object keyed by canonical id")
+        for canonical_id, entry in entries.items():
+            self.add(canonical_id, entry.get("label", canonical_id), entry.get("aliases", []))
+        logger.info("Loaded %d skill taxonomy entries from %s", len(entries), path)
+
+    def label(self, canonical_id: str) -> Optional[str]:
+        return self._labels.get(canonical_id)
+
+    def lookup(self, value: str) -> Optional[str]:
+        """Exact alias lookup without fuzzy matching. Returns the canonical id or None."""
+        key = tag_key(value)
+        return self._aliases.get(key) or self._aliases.get(key.replace(" ", ""))
+
+    def canonicalize(self, value: str) -> Optional[Tag]:
+        """Resolve a raw tag. Returns None for blank tags."""
+        key = tag_key(value)
+        if not key:
+            return None
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return cached
+
+        canonical_id = self.lookup(key)
+        if canonical_id is None and len(key) >= self.min_fuzzy_length:
+            canonical_id = self._fuzzy_lookup(key)
+        if canonical_id is not None:
+            tag = Tag(canonical_id, self._labels[canonical_id], True)
+        else:
+            tag = Tag(_slug(key), " ".join(value.split()), False)
+
+        with self._lock:
+            self._cache[key] = tag
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return tag
+
+    def _fuzzy_lookup(self, key: str) -> Optional[str]:
+        """
+        Closest alias whose words each match the tag's words at the fuzzy cutoff.
+        Comparing word by word keeps a typo fixable without letting a shared
+        leading word decide the match ("Generative Art" is not "Generative AI").
+        """
+        words = key.split()
+        for alias in difflib.get_close_matches(key, list(self._aliases), n=3, cutoff=self.fuzzy_cutoff):
+            alias_words = alias.split()
+            if len(alias_words) == len(words) and all(
+                word == alias_word or difflib.SequenceMatcher(None, word, alias_word).ratio() >= self.fuzzy_cutoff
+                for word, alias_word in zip(words, alias_words)
+            ):
+                return self._aliases[alias]
+        return None
+
+    def canonical_ids(self, values: Sequence[str]) -> List[str]:
+        """Canonical ids of raw tags, deduplicated and in order."""
+        return list(dict.fromkeys(tag.id for value in values if (tag := self.canonicalize(value))))
+
+    def canonicalize_profile(self, profile: UserProfile) -> UserProfile:
+        """Copy of the profile with its canonical id fields filled in from the raw tags."""
+        return profile.model_copy(update={
+            id_field: self.canonical_ids(getattr(profile, field)) for field, id_field in TAG_ID_FIELDS.items()
+        })
+
+    def profile_ids(self, profile: UserProfile, field: str) -> List[str]:
+        """Stored canonical ids of a tag field, computed for profiles written before canonicalization."""
+        stored = getattr(profile, TAG_ID_FIELDS[field])
+        if stored or not getattr(profile, field):
+            return stored
+        return self.canonical_ids(getattr(profile, field))
+
+    def profile_labels(self, profile: UserProfile, field: str) -> Dict[str, str]:
+        """
+        Stored canonical ids of a tag field with their display labels: the taxonomy
+        label for known tags, else the profile's own spelling of the tag.
+        """
+        ids = self.profile_ids(profile, field)
+        spellings: Dict[str, str] = {}
+        if any(tag_id not in self._labels for tag_id in ids):
+            for raw in getattr(profile, field):
+                spellings.setdefault(_slug(tag_key(raw)), " ".join(raw.split()))
+        return {tag_id: self._labels.get(tag_id) or spellings.get(tag_id, tag_id) for tag_id in ids}
+
+    def find_in_text(self, text: str, words: Optional[List[str]] = None) -> List[str]:
+        """
+        Canonical ids of known tags mentioned in free text, e.g. a search query.
+        Only exact alias matches count; fuzzy matching every n-gram would add noise.
+        """
+        words = words if words is not None else WORD_PATTERN.findall(text.lower())
+        found = []
+        start = 0
+        while start < len(words):
+            # Longest alias first, so "node js" is one tag rather than "node" and "js"
+            for size in range(min(MAX_ALIAS_WORDS, len(words) - start), 0, -1):
+                canonical_id = self._aliases.get(" ".join(words[start:start + size]))
+                if canonical_id is not None:
+                    if canonical_id not in found:
+                        found.append(canonical_id)
+                    start += size
+                    break
+            else:
+                start += 1
+        return found
+
+
+taxonomy = SkillTaxonomy.from_env()
@@ -0,0 +1,241 @@
+import logging
+import os
+import struct
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are only serialized within one process
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"PVEC"
+FORMAT_VERSION = 1
+# magic, format version, component type, dimensions; records start at HEADER_SIZE
+HEADER = struct.Struct("<4sHHI")
+HEADER_SIZE = 16
+COMPONENT_TYPES = {"int8": 1, "float16": 2}
+# Rows dequantized at a time when scoring, bounding the temporary float32 memory
+BLOCK_ROWS = 8192
+
+
+def record_dtype(dim: int, dtype: str) -> np.dtype:
+    """One stored vector: a float32 scale followed by the quantized components."""
+    component = np.int8 if dtype == "int8" else np.float16
+    return np.dtype([("scale", "<f4"), ("values", component, (dim,))])
+
+
+def quantize(vectors: np.ndarray, dtype: str) -> np.ndarray:
+    """Quantize float vectors (one per row) into records; int8 uses a per-vector scale."""
+    records = np.zeros(len(vectors), dtype=record_dtype(vectors.shape[1], dtype))
+    if dtype == "int8":
+        scale = np.abs(vectors).max(axis=1) / 127
+        scale[scale == 0] = 1.0
+        records["scale"] = scale
+        records["values"] = np.round(vectors / scale[:, None])
+    else:
+        records["scale"] = 1.0
+        records["values"] = vectors
+    return records
+
+
+def dequantize(records: np.ndarray) -> np.ndarray:
+    return records["values"].astype(np.float32) * records["scale"][:, None]
+
+
+class VectorStore:
+    """
+    Append-only store of quantized vectors, each under a string key.
+
+    With a path, vectors live in a memory-mapped file: a 16-byte header followed
+    by fixed-size records (a float32 scale and int8 or float16 components), plus
+    a key table "<path>.ids" whose n-th line is the key of the n-th record.
+    Mapped pages are shared through the OS page cache by every worker process
+    and only read when a vector is used; records appended by other processes
+    are picked up by refresh(). Writing a vector for a known key appends a new
+    record and the key table points at the latest one. Without a path, records
+    are kept in a growable in-memory array.
+    """
+
+    def __init__(self, dim: int, path: Optional[str] = None, dtype: str = "int8"):
+        if dtype not in COMPONENT_TYPES:
+            raise ValueError(f"Unknown vector dtype: {dtype} (expected 'int8' or 'float16')")
+        self.dim = dim
+        self.path = path
+        self.dtype = dtype
+        self.record = record_dtype(dim, dtype)
+        self._lock = threading.RLock()
+        # key -> record number of its latest vector
+        self._offsets: Dict[str, int] = {}
+        self._records = np.zeros(0, dtype=self.record)
+        self._count = 0
+        # Bytes of the key table consumed so far
+        self._ids_read = 0
+        self._opened = False
+        self._lock_depth = 0
+
+    @classmethod
+    def from_env(cls, dim: int) -> "VectorStore":
+        return cls(dim, path=os.getenv("VECTOR_INDEX_PATH"), dtype=os.getenv("VECTOR_DTYPE", "int8").lower())
+
+    @property
+    def ids_path(self) -> str:
+        return f"{self.path}.ids"
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._offsets
+
+    def offset(self, key: str) -> Optional[int]:
+        return self._offsets.get(key)
+
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        """Serialize check-then-append sequences across threads and, where supported, processes."""
+        with self._lock:
+            # Re-entrant: only the outermost call takes the file lock
+            if not self.path or fcntl is None or self._lock_depth:
+                self._lock_depth += 1
+                try:
+                    yield
+                finally:
+                    self._lock_depth -= 1
+                return
+            with open(f"{self.path}.lock", "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                self._lock_depth += 1
+                try:
+                    yield
+                finally:
+                    self._lock_depth -= 1
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def open(self) -> None:
+        """Create or validate the store file and read its key table. Vectors themselves are mapped, not read."""
+        with self._lock:
+            if self._opened:
+                return
+            if self.path:
+                with self.locked():
+                    self._init_file()
+            self._opened = True
+            self.refresh()
+
+    def _init_file(self) -> None:
+        header = HEADER.pack(MAGIC, FORMAT_VERSION, COMPONENT_TYPES[self.dtype], self.dim).ljust(HEADER_SIZE, b"\0")
+        if not os.path.exists(self.path) or os.path.getsize(self.path) < HEADER_SIZE:
+            with open(self.path, "wb") as f:
+                f.write(header)
+            open(self.ids_path, "wb").close()
+            return
+        with open(self.path, "rb") as f:
+            existing = f.read(HEADER_SIZE)
+        if existing != header:
+            raise ValueError(
+                f"{self.path} is not a {self.dtype} vector store with {self.dim} dimensions; "
+                "delete it (and its .ids file) to rebuild"
+            )
+        if not os.path.exists(self.ids_path):
+            open(self.ids_path, "wb").close()
+
+    def refresh(self) -> int:
+        """
+        Map records appended since the last call, including those written by other processes.
+        Returns: Number of new records
+        """
+        with self._lock:
+            if not self.path or not self._opened:
+                return 0
+            available = (os.path.getsize(self.path) - HEADER_SIZE) // self.record.itemsize - self._count
+            with open(self.ids_path, "rb") as f:
+                f.seek(self._ids_read)
+                chunk = f.read()
+            # Records are written before their keys, so every complete key line has its record
+            lines = chunk[:chunk.rfind(b"\n") + 1].splitlines(keepends=True)[:max(available, 0)]
+            if not lines:
+                return 0
+            for number, line in enumerate(lines, start=self._count):
+                self._offsets[line.decode("utf-8").strip()] = number
+            self._ids_read += sum(len(line) for line in lines)
+            self._count += len(lines)
+            self._records = np.memmap(self.path, dtype=self.record, mode="r", offset=HEADER_SIZE, shape=(self._count,))
+            return len(lines)
+
+    def append(self, items: Sequence[Tuple[str, np.ndarray]], skip_existing: bool = False) -> int:
+        """
+        Store vectors under the given keys. With skip_existing, keys that already
+        have a vector (e.g. written meanwhile by another process) are left alone.
+        Returns: Number of vectors written
+        """
+        with self.locked():
+            self.open()
+            self.refresh()
+            if skip_existing:
+                items = [(key, vector) for key, vector in items if key not in self._offsets]
+            if not items:
+                return 0
+            records = quantize(np.stack([vector for _, vector in items]).astype(np.float32), self.dtype)
+            keys = [key for key, _ in items]
+            if not self.path:
+                self._append_in_memory(keys, records)
+                return len(keys)
+            # Drop a partial record left behind by a writer that died before recording its key
+            expected = HEADER_SIZE + self._count * self.record.itemsize
+            if os.path.getsize(self.path) != expected:
+                os.truncate(self.path, expected)
+            with open(self.path, "ab") as f:
+                f.write(records.tobytes())
+            with open(self.ids_path, "ab") as f:
+                f.write("".join(f"{key}\n" for key in keys).encode("utf-8"))
+            self.refresh()
+            return len(keys)
+
+    def _append_in_memory(self, keys: List[str], records: np.ndarray) -> None:
+        needed = self._count + len(records)
+        if needed > len(self._records):
+            grown = np.zeros(max(16, 2 * len(self._records), needed), dtype=self.record)
+            grown[:self._count] = self._records[:self._count]
+            self._records = grown
+        self._records[self._count:needed] = records
+        for number, key in enumerate(keys, start=self._count):
+            self._offsets[key] = number
+        self._count = needed
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Dequantized vector stored under key, or None."""
+        with self._lock:
+            number = self._offsets.get(key)
+            return None if number is None else dequantize(self._records[number:number + 1])[0]
+
+    def _blocks(self, rows: np.ndarray) -> Iterator[Tuple[int, np.ndarray]]:
+        records = self._records
+        # Consecutive records (the common case) are sliced from the mapping instead of gathered
+        contiguous = len(rows) > 0 and rows[-1] - rows[0] + 1 == len(rows) and bool((np.diff(rows) == 1).all())
+        for start in range(0, len(rows), BLOCK_ROWS):
+            if contiguous:
+                first = int(rows[0]) + start
+                yield start, records[first:first + min(BLOCK_ROWS, len(rows) - start)]
+            else:
+                yield start, records[rows[start:start + BLOCK_ROWS]]
+
+    def scores(self, query: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """Dot products of the query with the vectors in the given records, computed block by block."""
+        with self._lock:
+            result = np.empty(len(rows), dtype=np.float32)
+            for start, block in self._blocks(rows):
+                result[start:start + len(block)] = (block["values"].astype(np.float32) @ query) * block["scale"]
+            return result
+
+    def nonzero_counts(self, rows: np.ndarray) -> np.ndarray:
+        """Number of the given records with a non-zero value in each dimension."""
+        with self._lock:
+            counts = np.zeros(self.dim, dtype=np.float32)
+            for _, block in self._blocks(rows):
+                counts += np.count_nonzero(block["values"], axis=0)
+            return counts
@@ -0,0 +1,3 @@
+"""
+100xEngineers Discovery Platform - Backend Benchmarks
+"""
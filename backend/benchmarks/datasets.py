@@ -0,0 +1,63 @@
+"""
+Synthetic profile datasets for benchmarks.
+"""
+import random
+from typing import Iterator, List
+from app.models.user import UserProfile
+
+FIRST_NAMES = ["Aarav", "Priya", "Rohan", "Ananya", "Vikram", "Meera", "Arjun", "Kavya", "Ishaan", "Diya",
+               "Alex", "Sam", "Jordan", "Taylor", "Morgan", "Riley", "Casey", "Jamie", "Avery", "Quinn"]
+LAST_NAMES = ["Sharma", "Patel", "Iyer", "Reddy", "Gupta", "Nair", "Singh", "Das", "Menon", "Rao",
+              "Smith", "Chen", "Garcia", "Kim", "Nguyen", "Lopez", "Brown", "Khan", "Silva", "Mehta"]
+TECHNICAL_SKILLS = ["Python", "FastAPI", "Django", "Flask", "React", "TypeScript", "Node.js", "Go", "Rust", "Java",
+                    "Kotlin", "Swift", "PostgreSQL", "MongoDB", "Redis", "Docker", "Kubernetes", "AWS", "GCP",
+                    "Terraform", "PyTorch", "TensorFlow", "Pandas", "Spark", "Kafka", "GraphQL", "C++", "Streamlit"]
+AI_EXPERTISE = ["NLP", "Computer Vision", "LLMs", "RAG", "Reinforcement Learning", "Recommender Systems",
+                "Speech Recognition", "Time Series", "Generative AI", "MLOps", "Prompt Engineering",
+                "Fine-tuning", "Agents", "Diffusion Models", "Graph Neural Networks"]
+PROJECTS = ["AI Chatbot", "Web Scraping Tool", "Resume Parser", "Fraud Detection", "Image Captioning",
+            "Voice Assistant", "Stock Predictor", "Code Review Bot", "Semantic Search Engine", "Recipe Recommender",
+            "Document QA", "Sentiment Dashboard", "Traffic Sign Classifier", "Meeting Summarizer"]
+INTERESTS = ["Open Source", "AI Projects", "Hackathons", "Startups", "Research Papers", "Teaching",
+             "Developer Tools", "Healthcare AI", "EdTech", "Climate Tech", "Fintech", "Side Projects"]
+MENTORING = [
+    "Available for weekly 1-hour sessions focusing on {skill} and {area}",
+    "Happy to mentor beginners in {skill}, especially around {area} projects",
+    "Looking for a mentor in {area}; can help others with {skill} in return",
+    "Open to pair programming on {skill} and reviewing {area} side projects",
+    "Monthly office hours on career growth, {skill} and applied {area}",
+]
+
+
+def generate_profiles(count: int, seed: int = 42) -> Iterator[UserProfile]:
+    """Yield count reproducible synthetic profiles."""
+    rng = random.Random(seed)
+    for i in range(count):
+        skills = rng.sample(TECHNICAL_SKILLS, rng.randint(2, 6))
+        expertise = rng.sample(AI_EXPERTISE, rng.randint(1, 3))
+        yield UserProfile(
+            name=f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {i}",
+            technical_skills=skills,
+            projects=rng.sample(PROJECTS, rng.randint(1, 3)),
+            ai_expertise=expertise,
+            mentoring_preferences=rng.choice(MENTORING).format(skill=skills[0], area=expertise[0]),
+            collaboration_interests=rng.sample(INTERESTS, rng.randint(1, 3)),
+            portfolio_url=f"https://github.com/engineer{i}" if rng.random() < 0.6 else None,
+        )
+
+
+def generate_queries(count: int, seed: int = 7) -> List[str]:
+    """Reproducible natural-language search queries over the synthetic vocabulary."""
+    rng = random.Random(seed)
+    templates = [
+        "Find someone experienced in {skill} and {area}",
+        "Looking for a mentor in {area}",
+        "Need a collaborator for {interest} using {skill}",
+        "{skill} engineer interested in {interest}",
+    ]
+    return [
+        rng.choice(templates).format(
+            skill=rng.choice(TECHNICAL_SKILLS), area=rng.choice(AI_EXPERTISE), interest=rng.choice(INTERESTS)
+        )
+        for _ in range(count)
+    ]
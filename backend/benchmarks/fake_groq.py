@@ -0,0 +1,100 @@
+"""
+Local stand-in for the Groq chat completions API with configurable latency.
+
+Point the backend at it with GROQ_BASE_URL. It answers with a handful of
+matches picked from the profile ids found in the prompt, supports streaming,
+and records prompt sizes so benchmarks can report token usage.
+"""
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List
+from app.services.prompt_builder import estimate_tokens
+
+UUID_PATTERN = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+# Prompts use integer aliases in compact mode ("3|Name|..."), so fall back to leading numbers
+ALIAS_PATTERN = re.compile(r"^(\d+)\|", re.MULTILINE)
+
+
+class FakeGroqServer:
+    def __init__(self, latency: float = 0.5, matches: int = 5, host: str = "127.0.0.1", port: int = 0):
+        self.latency = latency
+        self.matches = matches
+        self.prompt_tokens: List[int] = []
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                try:
+                    server._handle(self, body)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client gave up (e.g. a shard timeout) before the response was written
+                    pass
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "FakeGroqServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def _completion_text(self, prompt: str) -> str:
+        ids = list(dict.fromkeys(UUID_PATTERN.findall(prompt))) or list(dict.fromkeys(ALIAS_PATTERN.findall(prompt)))
+        matches = [
+            {"profile_id": pid, "match_score": 90 - 5 * i, "explanation": "Strong overlap with the requested skills."}
+            for i, pid in enumerate(ids[:self.matches])
+        ]
+        return json.dumps({"matches": matches})
+
+    def _handle(self, handler: BaseHTTPRequestHandler, body: dict) -> None:
+        prompt = "\n".join(m.get("content", "") for m in body.get("messages", []))
+        prompt_tokens = estimate_tokens(prompt)
+        with self._lock:
+            self.prompt_tokens.append(prompt_tokens)
+        time.sleep(self.latency)
+
+        text = self._completion_text(prompt)
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": estimate_tokens(text),
+                 "total_tokens": prompt_tokens + estimate_tokens(text)}
+        base = {"id": "chatcmpl-fake", "created": int(time.time()), "model": body.get("model", "fake")}
+
+        if body.get("stream"):
+            handler.send_response(200)
+            handler.send_header("Content-Type", "text/event-stream")
+            handler.end_headers()
+            for i in range(0, len(text), 16):
+                chunk = dict(base, object="chat.completion.chunk", choices=[
+                    {"index": 0, "delta": {"content": text[i:i + 16]}, "finish_reason": None}
+                ])
+                handler.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            handler.wfile.write(b"data: [DONE]\n\n")
+            return
+
+        payload = json.dumps(dict(base, object="chat.completion", usage=usage, choices=[{
+            "index": 0,
+            "finish_reason": "stop",
+            "logprobs": {"content": None},
+            "message": {"role": "assistant", "content": text},
+        }])).encode("utf-8")
+        handler.send_response(200)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(payload)))
+        handler.end_headers()
+        handler.wfile.write(payload)
@@ -0,0 +1,121 @@
+"""
+Load test for the search and profile endpoints with simulated slow backends.
+
+Runs the FastAPI app in-process against an in-memory SQLite store and a fake
+Groq service that sleeps for a configurable latency, then fires concurrent
+requests and reports throughput. Each search uses its own Groq key and the
+search limiter is sized by --max-concurrent, so the app's per-key and global
+caps only reject requests (429, counted as an outcome) when asked to. Pass
+--blocking to reproduce the old behaviour of calling the blocking clients
+directly on the event loop.
+
+Usage (from the backend directory):
+    python -m benchmarks.load_test --requests 200 --concurrency 50 --llm-latency 0.5
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from collections import Counter
+import httpx
+from app.services.sqlite_db import SQLiteDatabaseService
+from benchmarks.datasets import generate_profiles
+
+
+class SlowSQLiteDatabaseService(SQLiteDatabaseService):
+    """In-memory SQLite store that adds a fixed delay to every query to simulate network round trips."""
+
+    def __init__(self, latency: float = 0.0):
+        super().__init__(":memory:")
+        self.latency = latency
+
+    def _query(self, sql, params=()):
+        time.sleep(self.latency)
+        return super()._query(sql, params)
+
+
+async def run(args: argparse.Namespace) -> float:
+    # Importing app.main constructs the storage backend, so point it at SQLite first
+    os.environ["STORAGE_BACKEND"] = "sqlite"
+    os.environ["SQLITE_PATH"] = ":memory:"
+    os.environ["PROFILE_RECONCILE_INTERVAL"] = "0"
+    from app import main
+    from app.services.concurrency import ConcurrencyLimiter
+    from app.services.groq_search import GroqSearchService
+
+    llm_latency = args.llm_latency
+
+    class SlowGroqSearchService(GroqSearchService):
+        def search_profiles(self, query, profiles, api_key):
+            time.sleep(llm_latency)
+            return [(p, 50.0, "Match Score: 50%\nSimulated match") for p in profiles[:3]]
+
+    main.groq_service = SlowGroqSearchService()
+    main.db = SlowSQLiteDatabaseService(args.db_latency)
+    main.db.create_profiles(list(generate_profiles(args.profiles)))
+    await main.build_search_indexes()
+    main.search_limiter = ConcurrencyLimiter(
+        max_concurrent=args.max_concurrent or args.concurrency,
+        max_per_key=main.search_limiter.max_per_key,
+        max_queue=main.search_limiter.max_queue,
+        queue_timeout=main.search_limiter.queue_timeout,
+    )
+
+    if args.blocking:
+        # Old request path: blocking calls made directly inside the async handlers
+        async def blocking_search(query, profiles, api_key):
+            return main.groq_service.search_profiles(query, profiles, api_key)
+
+        async def blocking_list(limit, cursor=None, fields=None):
+            return main.db.list_profiles_page(limit, cursor, fields)
+
+        main.groq_service.search_profiles_async = blocking_search
+        main.db.list_profiles_page_async = blocking_list
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    outcomes: Counter = Counter()
+
+    async def one_request(client: httpx.AsyncClient, i: int) -> None:
+        async with semaphore:
+            if i % 4 == 3:
+                response = await client.get("/api/profiles")
+            else:
+                response = await client.post("/api/search", json={
+                    "query": f"python nlp mentor {i}",
+                    "use_groq": True,
+                    "groq_api_key": f"benchmark-key-{i}",
+                })
+            # Rejections are an expected outcome under load; anything else aborts the run
+            if response.status_code != 429:
+                response.raise_for_status()
+            outcomes[response.status_code] += 1
+
+    async with httpx.AsyncClient(app=main.app, base_url="http://benchmark") as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(one_request(client, i) for i in range(args.requests)))
+        elapsed = time.perf_counter() - start
+
+    throughput = args.requests / elapsed
+    mode = "blocking" if args.blocking else "async"
+    print(f"mode={mode} requests={args.requests} concurrency={args.concurrency} "
+          f"llm_latency={args.llm_latency}s elapsed={elapsed:.2f}s throughput={throughput:.1f} req/s "
+          f"ok={outcomes[200]} rejected={outcomes[429]}")
+    return throughput
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--profiles", type=int, default=500)
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Simulated Groq latency in seconds")
+    parser.add_argument("--db-latency", type=float, default=0.02, help="Simulated database latency in seconds")
+    parser.add_argument("--max-concurrent", type=int, default=0,
+                        help="Concurrent Groq searches the app allows (default: --concurrency)")
+    parser.add_argument("--blocking", action="store_true", help="Call the blocking clients on the event loop")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
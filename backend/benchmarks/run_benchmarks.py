@@ -0,0 +1,318 @@
+"""
+Benchmark suite for search, listing and profile creation at different dataset sizes.
+
+Each dataset size runs in its own subprocess so app state and memory peaks do
+not leak between sizes. A run loads synthetic profiles into an in-memory
+SQLite store, builds the search indexes, points the Groq client at a local fake
+server with configurable latency and then times every scenario through the
+FastAPI app. Results (p50/p95/p99 latency, throughput, memory peak and prompt
+token counts) are written as JSON; pass --baseline to compare against an
+earlier run and exit non-zero when p95 latency regresses.
+
+Usage (from the backend directory):
+    python -m benchmarks.run_benchmarks --sizes 1000 10000 100000 --requests 100
+    python -m benchmarks.run_benchmarks --sizes 1000 --baseline benchmarks/results/previous.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import httpx
+from app.services.prompt_builder import PromptBuilder
+from benchmarks.datasets import generate_profiles, generate_queries
+from benchmarks.fake_groq import FakeGroqServer
+
+SCENARIOS = (
+    "search_keyword",
+    "search_semantic",
+    "search_groq",
+    "groq_search_profiles",
+    "list_profiles",
+    "list_profiles_projected",
+    "similar_profiles",
+    "create_profile",
+)
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+INSERT_BATCH_SIZE = 1000
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(latencies: List[float], elapsed: float, errors: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+    """Latency percentiles and throughput of the successful calls, with failed calls counted by error."""
+    ordered = sorted(latencies)
+    errors = errors or {}
+    return {
+        "requests": len(latencies),
+        "errors": sum(errors.values()),
+        "error_types": dict(errors),
+        "p50_ms": round(percentile(ordered, 50) * 1000, 2),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 2),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 2),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 2) if ordered else 0.0,
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def error_label(error: Exception) -> str:
+    """Short label grouping failed calls, with the status code for HTTP errors."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return f"HTTP {error.response.status_code}"
+    return type(error).__name__
+
+
+async def measure(requests: int, concurrency: int, call: Callable[[int], Awaitable[None]]) -> Dict[str, float]:
+    """Run call(i) for i in range(requests) with bounded concurrency and collect per-call latencies."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors: Counter = Counter()
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await call(i)
+            except Exception as e:
+                errors[error_label(e)] += 1
+                return
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return summarize(latencies, time.perf_counter() - start, errors)
+
+
+async def run_size(args: argparse.Namespace) -> dict:
+    """Benchmark a single dataset size. Runs inside a dedicated subprocess."""
+    with FakeGroqServer(latency=args.llm_latency) as fake_groq:
+        # Importing app.main constructs the storage backend and Groq clients, so configure them first
+        os.environ["STORAGE_BACKEND"] = "sqlite"
+        os.environ["SQLITE_PATH"] = ":memory:"
+        os.environ["PROFILE_RECONCILE_INTERVAL"] = "0"
+        os.environ["GROQ_BASE_URL"] = fake_groq.url
+        # All Groq searches share one key, so let the limiter admit the whole benchmark
+        # concurrency; search_groq then measures the request path rather than slot queueing
+        os.environ["SEARCH_MAX_CONCURRENT"] = str(args.concurrency)
+        os.environ["SEARCH_MAX_PER_KEY"] = str(args.concurrency)
+        from app import main
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        profiles = generate_profiles(args.size)
+        while batch := list(islice(profiles, INSERT_BATCH_SIZE)):
+            main.db.create_profiles(batch)
+        load_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        await main.build_search_indexes()
+        index_seconds = time.perf_counter() - start
+        _, memory_peak = tracemalloc.get_traced_memory()
+        # Tracing allocations slows everything down, so keep it off while measuring latency
+        tracemalloc.stop()
+
+        queries = generate_queries(max(args.requests, 1))
+        cursors: List[Optional[str]] = [None]
+        new_profiles = list(generate_profiles(args.requests, seed=args.size + 1))
+
+        async with httpx.AsyncClient(app=main.app, base_url="http://benchmark", timeout=None) as client:
+            async def post_search(body: dict) -> None:
+                response = await client.post("/api/search", json=body)
+                response.raise_for_status()
+
+            async def list_page(i: int, fields: Optional[str] = None) -> None:
+                params = {"limit": 20}
+                if cursors[-1]:
+                    params["cursor"] = cursors[-1]
+                if fields:
+                    params["fields"] = fields
+                response = await client.get("/api/profiles", params=params)
+                response.raise_for_status()
+                # Walk forward through the listing, wrapping around at the end
+                cursors.append(response.json()["next_cursor"])
+
+            async def groq_direct(i: int) -> None:
+                candidates = main.candidate_retriever.shortlist(queries[i], main.GROQ_CANDIDATE_K)
+                await main.groq_service.search_profiles_async(queries[i], candidates, "benchmark-key")
+
+            profile_ids = [str(p.id) for p in main.keyword_index.profiles()[:args.requests]]
+
+            async def similar(i: int) -> None:
+                response = await client.get(f"/api/profiles/{profile_ids[i % len(profile_ids)]}/similar")
+                response.raise_for_status()
+
+            async def create(i: int) -> None:
+                response = await client.post("/api/profiles", content=new_profiles[i].model_dump_json(exclude={"id"}),
+                                             headers={"Content-Type": "application/json"})
+                response.raise_for_status()
+
+            calls = {
+                "search_keyword": lambda i: post_search({"query": queries[i]}),
+                "search_semantic": lambda i: post_search({"query": queries[i], "use_semantic": True}),
+                # Unique suffixes keep every request out of the search cache
+                "search_groq": lambda i: post_search({
+                    "query": f"{queries[i]} #{i}", "use_groq": True, "groq_api_key": "benchmark-key",
+                }),
+                "groq_search_profiles": groq_direct,
+                "list_profiles": list_page,
+                "list_profiles_projected": lambda i: list_page(i, "name,technical_skills,ai_expertise"),
+                "similar_profiles": similar,
+                "create_profile": create,
+            }
+
+            scenarios = {}
+            for name in args.scenarios:
+                concurrency = 1 if name == "create_profile" else args.concurrency
+                sent_before = len(fake_groq.prompt_tokens)
+                scenarios[name] = await measure(args.requests, concurrency, calls[name])
+                prompt_tokens = sorted(fake_groq.prompt_tokens[sent_before:])
+                if prompt_tokens:
+                    scenarios[name]["prompt_tokens_p50"] = percentile(prompt_tokens, 50)
+                    scenarios[name]["prompt_tokens_max"] = prompt_tokens[-1]
+
+        # Prompt size if every profile were sent to Groq in the original verbose format
+        unbounded = PromptBuilder(mode="verbose", max_prompt_tokens=sys.maxsize, cache_size=0)
+        full_prompt_tokens = unbounded.build(queries[0], main.db.list_profiles()).tokens
+
+    return {
+        "size": args.size,
+        "load_seconds": round(load_seconds, 3),
+        "index_build_seconds": round(index_seconds, 3),
+        "memory_peak_mb": round(memory_peak / 1024 / 1024, 1),
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "full_prompt_tokens": full_prompt_tokens,
+        "scenarios": scenarios,
+    }
+
+
+def run_in_subprocess(size: int, args: argparse.Namespace) -> dict:
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as handle:
+        result_path = handle.name
+    command = [
+        sys.executable, "-m", "benchmarks.run_benchmarks",
+        "--single-size", str(size),
+        "--result-file", result_path,
+        "--requests", str(args.requests),
+        "--concurrency", str(args.concurrency),
+        "--llm-latency", str(args.llm_latency),
+        "--scenarios", *args.scenarios,
+    ]
+    try:
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL if args.quiet else None)
+        with open(result_path) as f:
+            return json.load(f)
+    finally:
+        os.unlink(result_path)
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> List[str]:
+    """List scenarios whose p95 latency grew by more than tolerance relative to the baseline."""
+    previous = {
+        (result["size"], name): stats
+        for result in baseline.get("results", [])
+        for name, stats in result["scenarios"].items()
+    }
+    regressions = []
+    for result in report["results"]:
+        for name, stats in result["scenarios"].items():
+            old = previous.get((result["size"], name))
+            if old and old["p95_ms"] and stats["p95_ms"] > old["p95_ms"] * (1 + tolerance):
+                regressions.append(
+                    f"size={result['size']} {name}: p95 {old['p95_ms']}ms -> {stats['p95_ms']}ms"
+                )
+    return regressions
+
+
+def print_summary(report: dict) -> None:
+    print(f"{'size':>8} {'scenario':<24} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>8} {'tokens':>8}")
+    for result in report["results"]:
+        for name, stats in result["scenarios"].items():
+            print(f"{result['size']:>8} {name:<24} {stats['p50_ms']:>9} {stats['p95_ms']:>9} "
+                  f"{stats['p99_ms']:>9} {stats['throughput_rps']:>8} {stats.get('prompt_tokens_p50', ''):>8}")
+            if stats.get("errors"):
+                failures = ", ".join(f"{label} x{count}" for label, count in stats["error_types"].items())
+                print(f"{'':>8} {'':<24} {stats['errors']} failed: {failures}")
+        print(f"{result['size']:>8} memory peak {result['memory_peak_mb']} MB, max RSS {result['max_rss_mb']} MB, "
+              f"full prompt {result['full_prompt_tokens']} tokens")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--requests", type=int, default=100, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Fake Groq latency in seconds")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--output", help="Where to write the JSON report (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--baseline", help="Earlier JSON report to compare p95 latencies against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative p95 increase before flagging")
+    parser.add_argument("--quiet", action="store_true", help="Hide app output from the benchmark subprocesses")
+    parser.add_argument("--single-size", dest="size", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.size is not None:
+        result = asyncio.run(run_size(args))
+        with open(args.result_file, "w") as f:
+            json.dump(result, f)
+        return 0
+
+    started_at = datetime.now(timezone.utc)
+    report = {
+        "timestamp": started_at.isoformat(),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "llm_latency": args.llm_latency,
+            "storage": "sqlite:memory",
+        },
+        "results": [run_in_subprocess(size, args) for size in args.sizes],
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{started_at.strftime('%Y%m%dT%H%M%SZ')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print_summary(report)
+    print(f"Wrote {output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
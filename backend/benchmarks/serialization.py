@@ -0,0 +1,84 @@
+"""
+Per-profile CPU cost of the profile read and response paths.
+
+Compares the original response path (FastAPI re-validating results against the
+response model and encoding them with jsonable_encoder and json.dumps) with
+orjson encoding of the already-built models, and with encoding storage rows
+directly as GET /api/profiles now does. Also compares building profiles from
+rows with validation against model_construct, which skips it.
+
+Usage (from the backend directory):
+    python -m benchmarks.serialization --profiles 5000 --repeat 5
+"""
+import argparse
+import json
+import os
+import time
+from typing import Callable, List
+from uuid import UUID
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+# app.main builds the storage backend on import; keep it local and throwaway
+os.environ.setdefault("STORAGE_BACKEND", "sqlite")
+os.environ.setdefault("SQLITE_PATH", ":memory:")
+os.environ.setdefault("PROFILE_RECONCILE_INTERVAL", "0")
+from app.main import SearchResponse
+from app.models.user import UserProfile
+from app.services.serialization import dumps
+from benchmarks.datasets import generate_profiles
+
+
+def cpu_per_item(call: Callable[[], object], items: int, repeat: int) -> float:
+    """Best-of-repeat CPU time of call() in microseconds per item."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.process_time()
+        call()
+        best = min(best, time.process_time() - start)
+    return best / items * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profiles", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = [{**profile.model_dump(), "created_at": "2024-01-01T00:00:00+00:00"}
+            for profile in generate_profiles(args.profiles)]
+    profiles = [UserProfile(**row) for row in rows]
+    fields = tuple(UserProfile.model_fields)
+
+    def construct(row: dict) -> UserProfile:
+        values = {name: row[name] for name in fields}
+        values["id"] = UUID(values["id"])
+        return UserProfile.model_construct(set(values), **values)
+
+    results = [SearchResponse(profile=p, explanation="Matched based on keyword search", score=1.0) for p in profiles]
+    list_model = TypeAdapter(List[UserProfile])
+    search_model = TypeAdapter(List[SearchResponse])
+
+    def validated_list() -> bytes:
+        models = list_model.validate_python([UserProfile(**row) for row in rows])
+        return json.dumps(jsonable_encoder(models)).encode("utf-8")
+
+    def validated_search() -> bytes:
+        return json.dumps(jsonable_encoder(search_model.validate_python(results))).encode("utf-8")
+
+    cases = [
+        ("read rows: validated models", lambda: [UserProfile(**row) for row in rows]),
+        ("read rows: model_construct", lambda: [construct(row) for row in rows]),
+        ("list: validate + jsonable_encoder", validated_list),
+        ("list: validated models + orjson", lambda: dumps([UserProfile(**row) for row in rows])),
+        ("list: rows + orjson", lambda: dumps(rows)),
+        ("search: response_model + jsonable_encoder", validated_search),
+        ("search: orjson", lambda: dumps(results)),
+    ]
+    print(f"{'path':<44} {'us/profile':>10}")
+    for name, call in cases:
+        print(f"{name:<44} {cpu_per_item(call, len(rows), args.repeat):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+Import profiles in bulk from a CSV or JSONL file.
+
+Usage (from the backend directory):
+    python import_profiles.py profiles.csv --batch-size 500
+"""
+import argparse
+import json
+import sys
+from app.services.bulk_import import BulkImporter, detect_format, iter_records
+from app.services.storage import create_database_service
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Import profiles from a CSV or JSONL file.")
+    parser.add_argument("path", help="CSV file with a header row, or JSONL file with one profile per line")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="Input format (default: inferred from extension)")
+    parser.add_argument("--batch-size", type=int, default=500, help="Rows inserted per database request")
+    parser.add_argument("--max-errors", type=int, default=100, help="Maximum number of row errors to report")
+    args = parser.parse_args()
+
+    fmt = args.format or detect_format(args.path)
+    db = create_database_service()
+
+    def report_progress(batch):
+        print(f"Inserted batch of {len(batch)} profiles", file=sys.stderr)
+
+    importer = BulkImporter(db, batch_size=args.batch_size, on_batch=report_progress, max_errors=args.max_errors)
+    with open(args.path, encoding="utf-8", newline="") as f:
+        report = importer.run(iter_records(f, fmt))
+
+    print(json.dumps(report.to_dict(), indent=2))
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,9 +11,37 @@ create table if not exists profiles (
   mentoring_preferences text not null,
   collaboration_interests text[] default '{}',
   portfolio_url text,
+  technical_skill_ids text[] default '{}',
+  ai_expertise_ids text[] default '{}',
+  collaboration_interest_ids text[] default '{}',
+  search_text text,
+  search_terms jsonb,
+  search_context text,
+  search_context_tokens integer,
+  content_hash text,
   created_at timestamp with time zone default timezone('utc'::text, now()) not null
 );
 
 -- Create text search index for better search performance
 create index if not exists profiles_name_idx on profiles using gin (to_tsvector('english', name));
-create index if not exists profiles_mentoring_idx on profiles using gin (to_tsvector('english', mentoring_preferences)); 
\ No newline at end of file
+create index if not exists profiles_mentoring_idx on profiles using gin (to_tsvector('english', mentoring_preferences)); 
+
+-- Keyset pagination index for listing profiles in creation order
+create index if not exists profiles_created_at_id_idx on profiles (created_at, id);
+
+-- Canonical skill ids (added after the first release; no-ops on fresh databases)
+alter table profiles add column if not exists technical_skill_ids text[] default '{}';
+alter table profiles add column if not exists ai_expertise_ids text[] default '{}';
+alter table profiles add column if not exists collaboration_interest_ids text[] default '{}';
+
+-- Exact tag matching on canonical ids (array overlap/containment)
+create index if not exists profiles_technical_skill_ids_idx on profiles using gin (technical_skill_ids);
+create index if not exists profiles_ai_expertise_ids_idx on profiles using gin (ai_expertise_ids);
+create index if not exists profiles_collaboration_interest_ids_idx on profiles using gin (collaboration_interest_ids);
+
+-- Search documents written by the API with each profile (added after the first release)
+alter table profiles add column if not exists search_text text;
+alter table profiles add column if not exists search_terms jsonb;
+alter table profiles add column if not exists search_context text;
+alter table profiles add column if not exists search_context_tokens integer;
+alter table profiles add column if not exists content_hash text;
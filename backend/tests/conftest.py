@@ -0,0 +1,31 @@
+import os
+import sys
+from typing import Callable
+import pytest
+
+# Tests import the app package from the backend directory and use a throwaway SQLite store, never Supabase
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("STORAGE_BACKEND", "sqlite")
+os.environ.setdefault("SQLITE_PATH", ":memory:")
+os.environ.setdefault("PROFILE_RECONCILE_INTERVAL", "0")
+
+from app.models.user import UserProfile  # noqa: E402
+
+
+@pytest.fixture
+def make_profile() -> Callable[..., UserProfile]:
+    """Factory for valid profiles; keyword arguments override the defaults."""
+    def make(name: str = "Ada Lovelace", **fields) -> UserProfile:
+        fields.setdefault("mentoring_preferences", "Happy to mentor on weekends")
+        return UserProfile(name=name, **fields)
+    return make
+
+
+@pytest.fixture
+def client():
+    """Test client for the app, backed by the in-memory SQLite store, with an empty search cache."""
+    from fastapi.testclient import TestClient
+    from app import main
+    main.search_cache.clear()
+    with TestClient(main.app) as test_client:
+        yield test_client
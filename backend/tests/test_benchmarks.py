@@ -0,0 +1,43 @@
+import asyncio
+import httpx
+from benchmarks.run_benchmarks import compare, error_label, measure, percentile, summarize
+
+
+def test_percentile_is_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([3.0], 95) == 3.0
+    assert percentile([], 50) == 0.0
+
+
+def test_summarize_counts_errors_by_type():
+    stats = summarize([0.01, 0.02], elapsed=1.0, errors={"HTTP 429": 3})
+    assert stats["requests"] == 2 and stats["errors"] == 3
+    assert stats["error_types"] == {"HTTP 429": 3}
+    assert stats["throughput_rps"] == 2.0
+    assert summarize([], elapsed=0.0)["errors"] == 0
+
+
+def test_measure_records_failures_in_the_result():
+    request = httpx.Request("POST", "http://benchmark/api/search")
+
+    async def call(i: int) -> None:
+        if i % 2:
+            raise httpx.HTTPStatusError("busy", request=request, response=httpx.Response(429, request=request))
+        if i == 4:
+            raise ValueError("bad input")
+
+    stats = asyncio.run(measure(6, 3, call))
+    assert stats["requests"] == 2
+    assert stats["error_types"] == {"HTTP 429": 3, "ValueError": 1}
+
+
+def test_error_label():
+    assert error_label(RuntimeError("x")) == "RuntimeError"
+
+
+def test_compare_flags_p95_regressions_only():
+    baseline = {"results": [{"size": 10, "scenarios": {"a": {"p95_ms": 10.0}, "b": {"p95_ms": 10.0}}}]}
+    report = {"results": [{"size": 10, "scenarios": {"a": {"p95_ms": 12.5}, "b": {"p95_ms": 10.5}, "c": {"p95_ms": 1.0}}}]}
+    assert compare(report, baseline, tolerance=0.1) == ["size=10 a: p95 10.0ms -> 12.5ms"]
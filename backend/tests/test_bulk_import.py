@@ -0,0 +1,89 @@
+import codecs
+import io
+import pytest
+from app import main
+from app.services.bulk_import import BulkImporter, detect_format, iter_records
+from app.services.sqlite_db import SQLiteDatabaseService
+
+MENTORING = "Happy to mentor on weekends"
+
+
+def _records(data: bytes, fmt: str):
+    # Decoded the way the upload endpoint reads files
+    return list(iter_records(codecs.iterdecode(io.BytesIO(data), "utf-8"), fmt))
+
+
+def test_detect_format():
+    assert detect_format("people.CSV") == "csv"
+    assert detect_format("people.ndjson") == "jsonl"
+    with pytest.raises(ValueError):
+        detect_format("people.xlsx")
+
+
+def test_csv_list_fields_are_split():
+    data = f'name,technical_skills,mentoring_preferences\nAda Lovelace,"Python, Go",{MENTORING}\n'.encode()
+    [(row, record, error)] = _records(data, "csv")
+    assert (row, error) == (2, None)
+    assert record["technical_skills"] == ["Python", "Go"]
+
+
+def test_jsonl_parse_errors_are_per_row():
+    data = b'{"name": "Ada Lovelace"}\n\nnot json\n[1, 2]\n'
+    assert [(row, error) for row, _, error in _records(data, "jsonl")] == [
+        (1, None), (3, "Invalid JSON: Expecting value"), (4, "Expected a JSON object"),
+    ]
+
+
+def test_malformed_csv_row_is_reported_and_skipped():
+    data = f"name,mentoring_preferences\nAda Lovelace,{MENTORING}\n{'x' * 200000},{MENTORING}\nGrace Hopper,{MENTORING}\n"
+    records = _records(data.encode(), "csv")
+    assert [record["name"] for _, record, _ in records if record] == ["Ada Lovelace", "Grace Hopper"]
+    assert [(row, error.startswith("Malformed CSV row")) for row, _, error in records if error] == [(3, True)]
+
+
+@pytest.mark.parametrize("fmt", ["csv", "jsonl"])
+def test_undecodable_bytes_end_the_import_with_an_error(fmt):
+    records = _records(b"name\n\xff\xfe\n", fmt)
+    assert records[-1][1] is None and "not valid UTF-8" in records[-1][2]
+
+
+def test_importer_commits_valid_rows_and_reports_invalid_ones(make_profile):
+    db = SQLiteDatabaseService(":memory:")
+    indexed = []
+    records = [
+        (1, {"name": "Ada Lovelace", "mentoring_preferences": MENTORING}, None),
+        (2, {"name": "X", "mentoring_preferences": MENTORING}, None),
+        (3, None, "Invalid JSON: Expecting value"),
+        (4, {"name": "Grace Hopper", "mentoring_preferences": MENTORING}, None),
+    ]
+    report = BulkImporter(db, batch_size=2, on_batch=indexed.extend).run(records)
+    assert (report.total, report.imported, report.failed) == (4, 2, 2)
+    assert [e.row for e in report.errors] == [2, 3]
+    assert sorted(p.name for p in indexed) == ["Ada Lovelace", "Grace Hopper"]
+
+
+def test_bulk_endpoint_returns_partial_summary_for_undecodable_file(client):
+    # Enough rows that earlier batches are committed before the decoder reaches the bad bytes
+    valid = "".join(f"Bulk Person {i},{MENTORING}\n" for i in range(500))
+    data = ("name,mentoring_preferences\n" + valid).encode() + b"\xff\xfe,broken\n"
+    response = client.post(
+        "/api/profiles/bulk", files={"file": ("people.csv", data, "text/csv")}, params={"batch_size": 100}
+    )
+    assert response.status_code == 200
+    summary = response.json()
+    assert summary["imported"] > 0
+    assert summary["failed"] == 1
+    assert "not valid UTF-8" in summary["errors"][0]["error"]
+
+
+def test_bulk_endpoint_reads_multiline_and_non_ascii_csv(client):
+    data = (
+        "name,technical_skills,mentoring_preferences\n"
+        f'Zoë Bulk,"Python, Rust","{MENTORING},\nand evenings"\n'
+    ).encode("utf-8")
+    response = client.post("/api/profiles/bulk", files={"file": ("people.csv", data, "text/csv")})
+    assert response.json()["imported"] == 1
+    # The app is shared across tests, so look the profile up by name
+    profile = next(p for p in main.db.list_profiles() if p.name == "Zoë Bulk")
+    assert profile.technical_skills == ["Python", "Rust"]
+    assert profile.mentoring_preferences == f"{MENTORING},\nand evenings"
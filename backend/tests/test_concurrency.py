@@ -0,0 +1,148 @@
+import asyncio
+import contextvars
+import threading
+import pytest
+from app.services.concurrency import ConcurrencyLimiter, Overloaded, SingleFlight, run_blocking
+
+request_id = contextvars.ContextVar("request_id", default=None)
+
+
+def test_run_blocking_runs_off_the_event_loop_thread():
+    async def main():
+        loop_thread = threading.get_ident()
+        worker_thread = await run_blocking(threading.get_ident)
+        return loop_thread, worker_thread
+
+    loop_thread, worker_thread = asyncio.run(main())
+    assert loop_thread != worker_thread
+
+
+def test_run_blocking_passes_arguments_and_context():
+    def work(a, b=0):
+        return a + b, request_id.get()
+
+    async def main():
+        request_id.set("req-1")
+        return await run_blocking(work, 1, b=2)
+
+    assert asyncio.run(main()) == (3, "req-1")
+
+
+def test_run_blocking_does_not_block_other_tasks():
+    gate = threading.Event()
+
+    async def main():
+        blocked = asyncio.ensure_future(run_blocking(gate.wait, 5))
+        # The loop stays free while the worker waits, so this task can release it
+        await asyncio.sleep(0)
+        gate.set()
+        return await blocked
+
+    assert asyncio.run(main()) is True
+
+
+def test_run_blocking_propagates_exceptions():
+    def fail():
+        raise ValueError("boom")
+
+    async def main():
+        await run_blocking(fail)
+
+    with pytest.raises(ValueError, match="boom"):
+        asyncio.run(main())
+
+
+def test_single_flight_followers_join_the_leader():
+    flights = SingleFlight()
+
+    async def main():
+        assert flights.join("q") is None
+        with flights.lead("q") as future:
+            assert "q" in flights
+            follower = flights.join("q")
+            future.set_result(["match"])
+        assert "q" not in flights
+        return await follower
+
+    assert asyncio.run(main()) == ["match"]
+    assert flights.stats() == {"in_flight": 0, "led": 1, "joined": 1}
+
+
+def test_single_flight_resolves_to_none_when_the_leader_fails():
+    flights = SingleFlight()
+
+    async def main():
+        follower = None
+        with pytest.raises(RuntimeError):
+            with flights.lead("q"):
+                follower = flights.join("q")
+                raise RuntimeError("groq down")
+        return await follower
+
+    assert asyncio.run(main()) is None
+    assert "q" not in flights
+
+
+def test_limiter_caps_concurrency_per_key_and_globally():
+    limiter = ConcurrencyLimiter(max_concurrent=3, max_per_key=2, max_queue=10, queue_timeout=5)
+    running = {"a": 0, "b": 0}
+    peaks = {"a": 0, "b": 0, "total": 0}
+
+    async def work(key):
+        async with limiter.slot(key):
+            running[key] += 1
+            peaks[key] = max(peaks[key], running[key])
+            peaks["total"] = max(peaks["total"], sum(running.values()))
+            await asyncio.sleep(0.01)
+            running[key] -= 1
+
+    async def main():
+        await asyncio.gather(*(work(key) for key in "aaaabbbb"))
+
+    asyncio.run(main())
+    assert peaks == {"a": 2, "b": 2, "total": 3}
+    assert limiter.stats() == {"active": 0, "waiting": 0, "rejected": 0}
+    # Idle per-key semaphores are dropped
+    assert not limiter._per_key
+
+
+def test_limiter_rejects_when_the_queue_is_full():
+    limiter = ConcurrencyLimiter(max_concurrent=1, max_per_key=1, max_queue=1, queue_timeout=5)
+
+    async def main():
+        release = asyncio.Event()
+
+        async def hold():
+            async with limiter.slot("a"):
+                await release.wait()
+
+        holder = asyncio.ensure_future(hold())
+        queued = asyncio.ensure_future(hold())
+        await asyncio.sleep(0)
+        assert limiter.stats() == {"active": 1, "waiting": 1, "rejected": 0}
+        with pytest.raises(Overloaded):
+            limiter.check("b")
+        with pytest.raises(Overloaded):
+            async with limiter.slot("b"):
+                pass
+        release.set()
+        await asyncio.gather(holder, queued)
+        limiter.check("b")
+
+    asyncio.run(main())
+    assert limiter.stats() == {"active": 0, "waiting": 0, "rejected": 2}
+
+
+def test_limiter_rejects_after_the_queue_timeout():
+    limiter = ConcurrencyLimiter(max_concurrent=1, max_per_key=1, max_queue=5, queue_timeout=0.01)
+
+    async def main():
+        async with limiter.slot("a"):
+            with pytest.raises(Overloaded, match="No free slot"):
+                async with limiter.slot("b"):
+                    pass
+            assert limiter.waiting == 0
+
+    asyncio.run(main())
+    assert limiter.rejected == 1
+    assert not limiter._per_key
@@ -0,0 +1,59 @@
+import numpy as np
+from app.services.embeddings import HashingEmbedder, VectorIndex
+
+
+def test_embeddings_are_normalized_and_deterministic():
+    embedder = HashingEmbedder(dim=256)
+    vector = embedder.embed("Distributed systems in Go")
+
+    assert vector.shape == (256,)
+    assert np.isclose(np.linalg.norm(vector), 1.0)
+    assert np.array_equal(vector, HashingEmbedder(dim=256).embed("Distributed systems in Go"))
+    assert not np.any(embedder.embed(""))
+
+
+def test_related_texts_are_closer_than_unrelated():
+    embedder = HashingEmbedder()
+    query = embedder.embed("deep learning for computer vision")
+
+    related = embedder.embed("computer vision models with deep learning")
+    unrelated = embedder.embed("frontend design systems and accessibility")
+
+    assert query @ related > query @ unrelated
+
+
+def test_search_ranks_the_most_similar_profile_first(make_profile):
+    index = VectorIndex()
+    index.build([
+        make_profile("Vision", ai_expertise=["Computer Vision"], projects=["Image segmentation for drones"]),
+        make_profile("Web", technical_skills=["React", "CSS"], projects=["Design system"]),
+        make_profile("Speech", ai_expertise=["Speech recognition"], projects=["Podcast transcription"]),
+    ])
+
+    results = index.search("image segmentation computer vision", limit=2)
+
+    assert results[0][0].name == "Vision"
+    assert len(results) <= 2
+    assert all(score > 0 for _, score in results)
+
+
+def test_search_respects_allowed_ids(make_profile):
+    vision = make_profile("Vision", ai_expertise=["Computer Vision"])
+    also = make_profile("Also Vision", ai_expertise=["Computer Vision"])
+    index = VectorIndex()
+    index.build([vision, also])
+
+    results = index.search("computer vision", allowed={str(also.id)})
+
+    assert [p.name for p, _ in results] == ["Also Vision"]
+    assert index.search("computer vision", allowed=set()) == []
+
+
+def test_empty_index_and_add(make_profile):
+    index = VectorIndex()
+    assert index.search("anything") == []
+
+    index.add(make_profile("Late", technical_skills=["Scala"]))
+
+    assert len(index) == 1
+    assert index.search("scala")[0][0].name == "Late"
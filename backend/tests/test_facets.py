@@ -0,0 +1,86 @@
+import json
+import pytest
+from app import main
+from app.services.facets import FacetIndex
+
+
+@pytest.fixture
+def index(make_profile):
+    index = FacetIndex()
+    index.build([
+        make_profile("Ann Lee", technical_skills=["Python", "Rust"], ai_expertise=["Machine Learning"]),
+        make_profile("Bea Ray", technical_skills=["python", "Go"], ai_expertise=["NLP"]),
+        make_profile("Cal Fox", technical_skills=["Rust"], collaboration_interests=["Open Source"]),
+    ])
+    return index
+
+
+def names(index, bits):
+    return sorted(p.name for p in index.profiles(bits))
+
+
+def test_and_or_within_a_field(index):
+    assert names(index, index.match([("technical_skills", ["Python", "Rust"], True)])) == ["Ann Lee"]
+    assert names(index, index.match([("technical_skills", ["Go", "Rust"], False)])) == ["Ann Lee", "Bea Ray", "Cal Fox"]
+
+
+def test_clauses_are_anded_across_fields(index):
+    bits = index.match([("technical_skills", ["Rust"], True), ("ai_expertise", ["ML"], True)])
+    assert names(index, bits) == ["Ann Lee"]
+
+
+def test_unknown_values_match_nothing_and_unknown_fields_raise(index):
+    assert index.match([("technical_skills", ["COBOL"], True)]) == 0
+    assert len(index.ids(index.match([]))) == 3
+    with pytest.raises(ValueError):
+        index.match([("name", ["Ann"], True)])
+
+
+def test_counts_use_canonical_labels(index):
+    counts = index.counts()
+    assert counts["technical_skills"] == [("Python", 2), ("Rust", 2), ("Go", 1)]
+    assert counts["ai_expertise"] == [("Machine Learning", 1), ("NLP", 1)]
+    rust = index.match([("technical_skills", ["rust"], True)])
+    assert index.counts(rust, limit=1)["technical_skills"] == [("Rust", 2)]
+
+
+def test_remove_and_re_add(index, make_profile):
+    ann = next(p for p in index.profiles(index.match([])) if p.name == "Ann Lee")
+    index.remove(str(ann.id))
+    assert len(index) == 2
+    assert index.counts()["ai_expertise"] == [("NLP", 1)]
+    index.add(ann)
+    index.add(ann)
+    assert len(index) == 3
+    assert names(index, index.match([("ai_expertise", ["machine-learning"], True)])) == ["Ann Lee"]
+
+
+def test_facets_endpoint_filters_counts(client):
+    client.post("/api/profiles", json={"name": "Facet Person", "technical_skills": ["Elixir"],
+                                        "mentoring_preferences": "Happy to mentor on weekends"})
+    response = client.get("/api/facets", params={"technical_skills": ["elixir"]})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total"] == 1
+    assert body["facets"]["technical_skills"] == [{"value": "Elixir", "count": 1}]
+
+
+def test_profiles_limit_keeps_insertion_order(index):
+    bits = index.match([("technical_skills", ["python", "rust"], False)])
+    assert [p.name for p in index.profiles(bits, limit=2)] == ["Ann Lee", "Bea Ray"]
+    assert len(index.profiles(bits)) == 3
+
+
+def test_filter_only_search_is_capped_with_a_total(client, monkeypatch):
+    monkeypatch.setattr(main, "KEYWORD_SEARCH_LIMIT", 2)
+    for i in range(3):
+        client.post("/api/profiles", json={"name": f"Capped {i}", "technical_skills": ["Clojure"],
+                                            "mentoring_preferences": "Happy to mentor on weekends"})
+    payload = {"query": "", "filters": {"technical_skills": {"values": ["Clojure"]}}}
+    response = client.post("/api/search", json=payload)
+    assert len(response.json()) == 2
+    assert response.headers["X-Total-Count"] == "3"
+
+    with client.stream("POST", "/api/search/stream", json=payload) as stream:
+        provisional = json.loads(next(stream.iter_lines()))
+    assert len(provisional["results"]) == 2 and provisional["total"] == 3
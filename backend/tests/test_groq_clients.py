@@ -0,0 +1,35 @@
+from app.services.groq_clients import GroqClientRegistry, hash_api_key
+
+
+def test_hash_api_key_is_stable_and_ignores_whitespace():
+    assert hash_api_key("gsk_test") == hash_api_key(" gsk_test\n")
+    assert hash_api_key("gsk_test") != hash_api_key("gsk_other")
+    assert "gsk_test" not in hash_api_key("gsk_test")
+
+
+def test_same_key_reuses_client():
+    registry = GroqClientRegistry()
+    client = registry.get("gsk_one")
+    assert registry.get(" gsk_one ") is client
+    assert registry.stats()["hits"] == 1 and registry.stats()["misses"] == 1
+
+
+def test_registry_is_bounded_lru():
+    registry = GroqClientRegistry(max_clients=2)
+    first = registry.get("gsk_one")
+    registry.get("gsk_two")
+    registry.get("gsk_one")
+    registry.get("gsk_three")
+    assert registry.stats()["clients"] == 2
+    assert registry.get("gsk_one") is first
+    assert registry.get("gsk_two") is not None
+    assert registry.stats()["misses"] == 4
+
+
+def test_evicted_client_stays_usable():
+    registry = GroqClientRegistry(max_clients=1)
+    in_use = registry.get("gsk_one")
+    registry.get("gsk_two")
+    assert not in_use.is_closed()
+    registry.close()
+    assert registry.stats()["clients"] == 0
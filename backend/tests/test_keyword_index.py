@@ -0,0 +1,79 @@
+from app.services.keyword_index import KeywordIndex, query_terms
+
+
+def build(profiles):
+    index = KeywordIndex()
+    index.build(profiles)
+    return index
+
+
+def test_ranks_skill_matches_above_free_text(make_profile):
+    skilled = make_profile("Skilled", technical_skills=["Rust"])
+    mention = make_profile("Mention", mentoring_preferences="I might learn rust some day, mostly do design")
+    index = build([mention, skilled])
+
+    results = index.search("rust", min_score_ratio=0)
+
+    assert [p.name for p, _ in results] == ["Skilled", "Mention"]
+    assert results[0][1] > results[1][1] > 0
+
+
+def test_stopwords_do_not_match_every_profile(make_profile):
+    profiles = [make_profile(f"Person {i}", mentoring_preferences="Looking to help someone in the community") for i in range(20)]
+    profiles.append(make_profile("Nlp Expert", technical_skills=["Machine Learning"], ai_expertise=["NLP"]))
+    index = build(profiles)
+
+    results = index.search("Find someone experienced in machine learning and NLP")
+
+    assert [p.name for p, _ in results] == ["Nlp Expert"]
+
+
+def test_query_of_only_stopwords_still_searches():
+    assert query_terms(["who", "is", "it"]) == ["who", "is", "it"]
+    assert query_terms(["find", "a", "mentor"]) == ["mentor"]
+
+
+def test_relative_score_floor_and_limit(make_profile):
+    strong = [make_profile(f"Strong {i}", technical_skills=["Kubernetes", "Go"], ai_expertise=["MLOps"]) for i in range(5)]
+    weak = make_profile("Weak", projects=["go kart"])
+    index = build(strong + [weak])
+
+    assert "Weak" not in [p.name for p, _ in index.search("kubernetes go mlops")]
+    assert "Weak" in [p.name for p, _ in index.search("kubernetes go mlops", min_score_ratio=0)]
+    assert len(index.search("kubernetes go mlops", limit=3)) == 3
+
+
+def test_allowed_restricts_results(make_profile):
+    a = make_profile("Ann", technical_skills=["Python"])
+    b = make_profile("Bea", technical_skills=["Python"])
+    index = build([a, b])
+
+    assert [p.name for p, _ in index.search("python", allowed={str(b.id)})] == ["Bea"]
+
+
+def test_canonical_tags_match_other_spellings(make_profile):
+    index = build([make_profile("Tagged", technical_skills=["Machine Learning"])])
+
+    assert [p.name for p, _ in index.search("ML")] == ["Tagged"]
+
+
+def test_add_replaces_and_remove_drops(make_profile):
+    profile = make_profile("Replaceable", technical_skills=["Haskell"])
+    index = build([profile])
+    index.add(profile)
+    assert len(index) == 1
+
+    index.remove(str(profile.id))
+    assert len(index) == 0
+    assert index.search("haskell") == []
+
+
+def test_snapshot_round_trip(tmp_path, make_profile):
+    index = build([make_profile("Snap", technical_skills=["Elixir"])])
+    path = str(tmp_path / "index.json")
+    index.save_snapshot(path)
+
+    restored = KeywordIndex()
+    restored.load_snapshot(path)
+
+    assert [p.name for p, _ in restored.search("elixir")] == ["Snap"]
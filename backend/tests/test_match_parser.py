@@ -0,0 +1,53 @@
+import pytest
+from app.services.match_parser import LLMMatch, parse_matches, validate_match
+
+
+def test_plain_document():
+    matches = parse_matches('{"matches": [{"profile_id": "abc", "match_score": 87, "explanation": "Knows Rust"}]}')
+    assert matches == [LLMMatch(profile_id="abc", match_score=87.0, explanation="Knows Rust")]
+
+
+@pytest.mark.parametrize("text", [
+    '```json\n{"matches": [{"profile_id": 1, "match_score": 80}]}\n```',
+    'Here are the matches:\n{"matches": [{"profile_id": 1, "match_score": 80},]}\nHope this helps!',
+    '[{"profile_id": 1, "match_score": 80}]',
+])
+def test_repairs_common_formatting_problems(text):
+    assert [(m.profile_id, m.match_score) for m in parse_matches(text)] == [("1", 80.0)]
+
+
+def test_salvages_matches_from_a_truncated_response():
+    text = '{"matches": [{"profile_id": 1, "match_score": 90, "explanation": "a"}, {"profile_id": 2, "match_sc'
+    assert [m.profile_id for m in parse_matches(text)] == ["1"]
+
+
+def test_unparseable_response_has_no_matches():
+    assert parse_matches("Sorry, I cannot help with that.") == []
+    assert parse_matches('{"results": []}') == []
+
+
+def test_scores_are_coerced_and_clamped():
+    assert validate_match({"profile_id": " 7 ", "match_score": "85%"}).match_score == 85.0
+    assert validate_match({"profile_id": 7, "match_score": 150}).match_score == 100.0
+    assert validate_match({"profile_id": 7, "match_score": -5}).match_score == 0.0
+    assert validate_match({"profile_id": 7, "match_score": None}).match_score == 0.0
+    assert validate_match({"profile_id": 7, "explanation": None}).explanation == ""
+
+
+@pytest.mark.parametrize("item", [
+    {"match_score": 50},
+    {"profile_id": True, "match_score": 50},
+    {"profile_id": {"id": 1}},
+    {"profile_id": 1, "match_score": "high"},
+    {"profile_id": 1, "match_score": [90]},
+    {"profile_id": 1, "match_score": {"value": 90}},
+    "not an object",
+])
+def test_invalid_items_are_dropped(item):
+    assert validate_match(item) is None
+
+
+def test_invalid_entries_do_not_sink_the_rest():
+    text = ('{"matches": [{"profile_id": 1, "match_score": "high"}, {"profile_id": 2, "match_score": 60}, '
+            '{"profile_id": 3, "match_score": [90]}]}')
+    assert [m.profile_id for m in parse_matches(text)] == ["2"]
@@ -0,0 +1,50 @@
+from app.services.metrics import Counter, Histogram, MetricsRegistry, format_spans, request_spans, span
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("latency_seconds", "Latency", ["route"], buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        histogram.observe(value, "/api/search")
+    lines = histogram.render()
+    assert 'latency_seconds_bucket{route="/api/search",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/api/search",le="1.0"} 3' in lines
+    assert 'latency_seconds_bucket{route="/api/search",le="+Inf"} 4' in lines
+    assert 'latency_seconds_count{route="/api/search"} 4' in lines
+    assert 'latency_seconds_sum{route="/api/search"} 6.05' in lines
+
+
+def test_counter_escapes_label_values():
+    counter = Counter("requests_total", "Requests", ["route"])
+    counter.inc('/a"b')
+    counter.inc('/a"b', amount=2)
+    assert counter.render()[-1] == 'requests_total{route="/a\\"b"} 3.0'
+
+
+def test_registry_reads_gauges_and_skips_failing_ones():
+    registry = MetricsRegistry()
+    registry.counter("things_total", "Things").inc()
+    registry.gauge("size", "Size", lambda: 7)
+    registry.gauge("broken", "Broken", lambda: 1 / 0)
+    text = registry.render()
+    assert "things_total 1.0" in text
+    assert "size 7.0" in text
+    assert "broken" not in text
+
+
+def test_spans_are_collected_per_request():
+    with span("outside"):
+        pass
+    with request_spans() as spans:
+        with span("db_fetch"):
+            pass
+        with span("groq_call"):
+            pass
+    assert [stage for stage, _ in spans] == ["db_fetch", "groq_call"]
+    assert format_spans([("db_fetch", 0.0123)]) == "db_fetch=12.3ms"
+
+
+def test_metrics_endpoint_reports_requests(client):
+    client.get("/api/profiles")
+    text = client.get("/metrics").text
+    assert 'http_requests_total{method="GET",route="/api/profiles",status="200"}' in text
+    assert "app_stage_duration_seconds_bucket" in text
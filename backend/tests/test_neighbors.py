@@ -0,0 +1,72 @@
+import pytest
+from app.services.embeddings import HashingEmbedder, VectorIndex
+from app.services.neighbors import NeighborIndex
+from app.services.vector_store import VectorStore
+
+
+@pytest.fixture
+def profiles(make_profile):
+    return {
+        "ann": make_profile("Ann Lee", technical_skills=["Python", "PyTorch"], ai_expertise=["NLP", "LLMs"]),
+        "bea": make_profile("Bea Ray", technical_skills=["python", "torch"], ai_expertise=["Natural Language Processing"]),
+        "cal": make_profile("Cal Fox", technical_skills=["Rust"], collaboration_interests=["Open Source"]),
+        "dee": make_profile("Dee Kim", technical_skills=["Python"], ai_expertise=["Computer Vision"]),
+    }
+
+
+def make_index(profiles, **options):
+    vectors = VectorIndex(HashingEmbedder(128), VectorStore(128))
+    vectors.build(profiles)
+    index = NeighborIndex(vectors, **options)
+    index.build(profiles)
+    return index, vectors
+
+
+def test_similar_ranks_by_shared_tags_and_vectors(profiles):
+    index, _ = make_index(profiles.values())
+    similar = index.similar(str(profiles["ann"].id), limit=10)
+    names = [profile.name for profile, _, _ in similar]
+    assert names[0] == "Bea Ray"
+    assert "Ann Lee" not in names
+    scores = [score for _, score, _ in similar]
+    assert scores == sorted(scores, reverse=True) and all(score > 0 for score in scores)
+    # Shared tags are reported with canonical labels, whatever the spelling
+    assert sorted(similar[0][2]) == ["NLP", "PyTorch", "Python"]
+
+
+def test_unknown_profile_and_limit(profiles):
+    index, _ = make_index(profiles.values())
+    assert index.similar("missing", limit=5) is None
+    assert len(index.similar(str(profiles["ann"].id), limit=1)) == 1
+
+
+def test_added_profile_joins_cached_lists(profiles, make_profile):
+    index, vectors = make_index(profiles.values(), max_neighbors=2)
+    ann = str(profiles["ann"].id)
+    index.similar(ann, limit=2)
+    assert index.cached() == 1
+
+    twin = make_profile("Ann Twin", technical_skills=["Python", "PyTorch"], ai_expertise=["NLP", "LLMs"])
+    vectors.add(twin)
+    index.add(twin)
+    names = [profile.name for profile, _, _ in index.similar(ann, limit=2)]
+    assert names[0] == "Ann Twin" and len(names) == 2
+
+
+def test_table_is_bounded(profiles):
+    index, _ = make_index(profiles.values(), max_cached=2)
+    for profile in profiles.values():
+        index.similar(str(profile.id), limit=3)
+    assert index.cached() == 2
+
+
+def test_similar_endpoint(client):
+    first = client.post("/api/profiles", json={"name": "Neighbor One", "technical_skills": ["Clojure", "Lisp"],
+                                               "mentoring_preferences": "Happy to mentor on weekends"}).json()
+    client.post("/api/profiles", json={"name": "Neighbor Two", "technical_skills": ["Clojure", "Lisp"],
+                                       "mentoring_preferences": "Happy to mentor on weekends"})
+    response = client.get(f"/api/profiles/{first['id']}/similar", params={"limit": 3})
+    assert response.status_code == 200
+    assert response.json()[0]["profile"]["name"] == "Neighbor Two"
+    assert sorted(response.json()[0]["shared_tags"]) == ["Clojure", "Lisp"]
+    assert client.get("/api/profiles/00000000-0000-0000-0000-000000000000/similar").status_code == 404
@@ -0,0 +1,67 @@
+from app.services.profile_store import ProfileStore
+from app.services.sqlite_db import SQLiteDatabaseService
+
+
+def test_get_counts_hits_and_misses(make_profile):
+    store = ProfileStore()
+    profile = make_profile()
+    store.put(profile)
+    assert store.get(str(profile.id)) is profile
+    assert store.get("missing") is None
+    assert store.stats()["hits"] == 1 and store.stats()["misses"] == 1
+
+
+def test_load_marks_complete_until_eviction(make_profile):
+    store = ProfileStore(max_profiles=2)
+    first, second = make_profile("Ann Lee"), make_profile("Bea Ray")
+    store.load([first, second])
+    assert store.complete and len(store) == 2
+
+    store.get(str(first.id))
+    store.put(make_profile("Cal Fox"))
+    # The least recently used profile goes, and memory no longer mirrors the whole table
+    assert str(second.id) not in store and str(first.id) in store
+    assert not store.complete
+    assert store.stats()["evictions"] == 1
+
+
+def test_reconcile_picks_up_rows_written_elsewhere(tmp_path, make_profile):
+    path = str(tmp_path / "profiles.db")
+    writer, reader = SQLiteDatabaseService(path), SQLiteDatabaseService(path)
+    writer.create_profile(make_profile("Ann Lee"))
+    assert [p.name for p in reader.warm()] == ["Ann Lee"]
+
+    created = writer.create_profile(make_profile("Bea Ray"))
+    assert reader.get_profile(str(created.id)) is not None
+    new = reader.reconcile()
+    # Already cached by get_profile, but still new to the profile set and so returned for indexing
+    assert [p.name for p in new] == ["Bea Ray"]
+    assert reader.reconcile() == []
+    assert {p.name for p in reader.list_profiles()} == {"Ann Lee", "Bea Ray"}
+
+
+def test_reconcile_after_seed_fetches_only_missing_rows(tmp_path, make_profile):
+    path = str(tmp_path / "profiles.db")
+    writer = SQLiteDatabaseService(path)
+    snapshot = [writer.create_profile(make_profile("Ann Lee"))]
+    writer.create_profile(make_profile("Bea Ray"))
+
+    reader = SQLiteDatabaseService(path)
+    reader.seed(snapshot)
+    assert [p.name for p in reader.reconcile()] == ["Bea Ray"]
+    assert reader.reconcile() == []
+    assert reader.profile_store.stats()["last_reconciled_at"] is not None
+
+
+def test_reconcile_picks_up_rows_sharing_the_high_water_timestamp(tmp_path, make_profile):
+    path = str(tmp_path / "profiles.db")
+    writer, reader = SQLiteDatabaseService(path), SQLiteDatabaseService(path)
+    writer.create_profile(make_profile("Ann Lee", id="ffffffff-ffff-4fff-bfff-ffffffffffff"))
+    reader.warm()
+
+    # Written in the same millisecond as the mark, with an id that sorts before it
+    writer.create_profile(make_profile("Bea Ray", id="00000000-0000-4000-8000-000000000001"))
+    with writer.conn:
+        writer.conn.execute("update profiles set created_at = (select min(created_at) from profiles)")
+    assert [p.name for p in reader.reconcile()] == ["Bea Ray"]
+    assert reader.reconcile() == []
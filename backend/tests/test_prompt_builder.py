@@ -0,0 +1,56 @@
+import pytest
+from app.services.prompt_builder import PromptBuilder
+from app.services.search_document import estimate_tokens
+
+
+@pytest.fixture
+def profiles(make_profile):
+    return [make_profile(f"Person {i}", technical_skills=["Python", "Rust"], ai_expertise=["NLP"]) for i in range(20)]
+
+
+def test_estimate_tokens_is_conservative():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("machine learning") == 2 + 2
+    assert estimate_tokens("12345, ok!") == 2 + 1 + 1 + 1
+
+
+def test_compact_prompt_uses_aliases_that_resolve(profiles):
+    built = PromptBuilder(mode="compact", max_prompt_tokens=100000).build("rust engineers", profiles)
+    assert built.included == built.total == 20
+    assert "\n1|Person 0|" in built.prompt
+    assert str(profiles[0].id) not in built.prompt
+    assert built.resolve(1) is profiles[0]
+    assert built.resolve(" 20 ") is profiles[19]
+    assert built.resolve("21") is None and built.resolve(None) is None
+
+
+def test_verbose_prompt_references_profile_ids(profiles):
+    built = PromptBuilder(mode="verbose", max_prompt_tokens=100000).build("rust", profiles[:2])
+    assert f"Profile ID: {profiles[0].id}" in built.prompt
+    assert built.resolve(str(profiles[1].id)) is profiles[1]
+
+
+def test_budget_keeps_leading_profiles_that_fit(profiles):
+    unbounded = PromptBuilder(max_prompt_tokens=100000).build("rust", profiles)
+    budget = unbounded.tokens // 2
+    built = PromptBuilder(max_prompt_tokens=budget).build("rust", profiles)
+    assert 0 < built.included < built.total
+    assert built.tokens <= budget
+    assert list(built.refs.values()) == profiles[:built.included]
+    assert PromptBuilder(max_prompt_tokens=100000).build("rust", profiles, max_profiles=3).included == 3
+
+
+def test_tiny_budget_includes_no_profiles(profiles):
+    built = PromptBuilder(max_prompt_tokens=10).build("rust", profiles)
+    assert built.included == 0 and built.total == 20
+
+
+def test_compact_prompt_is_smaller_than_verbose(profiles):
+    compact = PromptBuilder(mode="compact", max_prompt_tokens=100000).build("rust", profiles)
+    verbose = PromptBuilder(mode="verbose", max_prompt_tokens=100000).build("rust", profiles)
+    assert compact.tokens < verbose.tokens
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        PromptBuilder(mode="terse")
@@ -0,0 +1,37 @@
+from app.services.embeddings import VectorIndex
+from app.services.keyword_index import KeywordIndex
+from app.services.retrieval import CandidateRetriever
+
+
+def retriever_for(profiles):
+    keyword_index, vector_index = KeywordIndex(), VectorIndex()
+    keyword_index.build(profiles)
+    vector_index.build(profiles)
+    return CandidateRetriever(keyword_index, vector_index)
+
+
+def test_small_communities_are_sent_whole(make_profile):
+    profiles = [make_profile(f"Member {i}") for i in range(3)]
+
+    shortlist = retriever_for(profiles).shortlist("anything at all", k=5)
+
+    assert {p.id for p in shortlist} == {p.id for p in profiles}
+
+
+def test_shortlist_is_capped_and_keeps_relevant_profiles(make_profile):
+    relevant = make_profile("Rust Person", technical_skills=["Rust", "WebAssembly"])
+    others = [make_profile(f"Other {i}", technical_skills=["Excel"], mentoring_preferences=f"Spreadsheets mentoring {i}")
+              for i in range(30)]
+
+    shortlist = retriever_for(others + [relevant]).shortlist("rust webassembly", k=5)
+
+    assert 0 < len(shortlist) <= 5
+    assert shortlist[0].name == "Rust Person"
+
+
+def test_shortlist_only_returns_allowed_profiles(make_profile):
+    profiles = [make_profile(f"Python {i}", technical_skills=["Python"]) for i in range(10)]
+    allowed = {str(p.id) for p in profiles[:4]}
+
+    assert {str(p.id) for p in retriever_for(profiles).shortlist("python", k=2, allowed=allowed)} <= allowed
+    assert {str(p.id) for p in retriever_for(profiles).shortlist("python", k=5, allowed=allowed)} == allowed
@@ -0,0 +1,81 @@
+import sqlite3
+from app.services.search_cache import SearchCache, normalize_query
+from app.services.sqlite_db import SQLiteDatabaseService
+
+
+def test_make_key_normalizes_query_and_orders_params():
+    a = SearchCache.make_key("  Machine   LEARNING!", "3-ab", mode="groq", k=50)
+    b = SearchCache.make_key("machine learning", "3-ab", k=50, mode="groq")
+    assert a == b
+    assert a != SearchCache.make_key("machine learning", "4-cd", mode="groq", k=50)
+    assert normalize_query("Rust, Go & C++") == "rust go c++"
+
+
+def test_lru_evicts_least_recently_used():
+    cache = SearchCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_expired_entries_miss():
+    cache = SearchCache(ttl_seconds=-1)
+    cache.set("a", [1])
+    assert cache.get("a") is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_sqlite_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "cache.db")
+    SearchCache(path=path).set("key", [{"id": "1", "score": 0.5}])
+    reopened = SearchCache(path=path)
+    assert reopened.get("key") == [{"id": "1", "score": 0.5}]
+    reopened.clear()
+    assert SearchCache(path=path).get("key") is None
+
+
+def test_version_is_derived_from_stored_profiles(tmp_path, make_profile):
+    path = str(tmp_path / "profiles.db")
+    writer = SQLiteDatabaseService(path)
+    writer.warm()
+    empty = writer.version
+    writer.create_profile(make_profile("Ada Lovelace"))
+    one = writer.version
+    writer.create_profiles([make_profile("Grace Hopper"), make_profile("Alan Turing")])
+    assert len({empty, one, writer.version}) == 3
+
+    # A restarted or second process that loads the same rows agrees on the version
+    reader = SQLiteDatabaseService(path)
+    reader.warm()
+    assert reader.version == writer.version
+
+    # and one that has not seen the latest rows yet does not collide with it
+    stale = SQLiteDatabaseService(path)
+    stale.warm()
+    writer.create_profile(make_profile("Edsger Dijkstra"))
+    assert stale.version != writer.version
+    stale.reconcile()
+    assert stale.version == writer.version
+
+
+def test_failing_cache_write_keeps_the_groq_results(client, monkeypatch, tmp_path):
+    from app import main
+    client.post("/api/profiles", json={"name": "Cache Locked", "technical_skills": ["Fortran"],
+                                        "mentoring_preferences": "Happy to mentor on weekends"})
+
+    async def fake_search(query, profiles, api_key):
+        return [(profile, 95.0, "Match Score: 95%\ngroq") for profile in profiles]
+
+    def locked(*args):
+        raise sqlite3.OperationalError("database is locked")
+
+    cache = SearchCache(path=str(tmp_path / "cache.db"))
+    monkeypatch.setattr(cache, "set", locked)
+    monkeypatch.setattr(main, "search_cache", cache)
+    monkeypatch.setattr(main.groq_service, "search_profiles_async", fake_search)
+    results = client.post("/api/search", json={"query": "fortran", "use_groq": True, "groq_api_key": "gsk_test"}).json()
+    assert [r["score"] for r in results if r["profile"]["name"] == "Cache Locked"] == [95.0]
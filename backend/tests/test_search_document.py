@@ -0,0 +1,72 @@
+from app.models.user import UserProfile
+from app.services import storage as storage_module
+from app.services.search_document import (
+    TAG_TERM_PREFIX, build_document, content_hash, search_document, stored_document,
+)
+from app.services.sqlite_db import SQLiteDatabaseService
+from app.services.taxonomy import taxonomy
+
+
+def test_content_hash_follows_searchable_fields(make_profile):
+    profile = make_profile(technical_skills=["Python"])
+    assert content_hash(profile) == content_hash(make_profile(technical_skills=["Python"]))
+    assert content_hash(profile) != content_hash(make_profile(technical_skills=["Rust"]))
+    assert content_hash(profile) != content_hash(make_profile(technical_skills=["Python"], technical_skill_ids=["python"]))
+
+
+def test_build_document_weights_terms_and_adds_tag_terms(make_profile):
+    profile = taxonomy.canonicalize_profile(make_profile(technical_skills=["Python"], ai_expertise=["ML"]))
+    document = build_document(profile)
+    assert document.text.split()[:2] == ["ada", "lovelace"]
+    assert document.terms["python"] == 3.0
+    assert document.terms["ada"] == 2.0
+    assert document.terms[TAG_TERM_PREFIX + "machine-learning"] == 3.0
+    assert document.context.startswith("Ada Lovelace|Python|ML|")
+    assert document.context_tokens > 0
+    assert document.content_hash == content_hash(profile)
+
+
+def test_search_document_is_built_once(make_profile):
+    profile = make_profile()
+    assert search_document(profile) is search_document(profile)
+
+
+def test_stored_document_is_attached_only_when_current(make_profile):
+    profile = make_profile(technical_skills=["Python"])
+    columns = build_document(profile).columns()
+
+    fresh = make_profile(technical_skills=["Python"], id=profile.id)
+    attached = stored_document(fresh, columns)
+    assert attached is not None and search_document(fresh) is attached
+
+    changed = make_profile(technical_skills=["Rust"], id=profile.id)
+    assert stored_document(changed, columns) is None
+    assert stored_document(fresh, {**columns, "search_terms": None}) is None
+
+
+def test_warm_backfills_missing_documents_in_batches(make_profile, monkeypatch):
+    storage = SQLiteDatabaseService(":memory:")
+    created = storage.create_profiles([make_profile(f"Person {i}", technical_skills=["Python"]) for i in range(5)])
+    with storage.conn:
+        storage.conn.execute("update profiles set search_text = null, content_hash = null")
+
+    batches = []
+    update_documents = storage._update_documents
+    def record(rows):
+        batches.append(len(rows))
+        update_documents(rows)
+    monkeypatch.setattr(storage, "_update_documents", record)
+    monkeypatch.setattr(storage_module, "DOCUMENT_BACKFILL_BATCH_SIZE", 2)
+
+    profiles = storage.warm()
+    assert batches == [2, 2, 1]
+    assert {p.id for p in profiles} == {p.id for p in created}
+
+    rows = storage._fetch_all()
+    assert all(row["content_hash"] == content_hash(UserProfile(**row)) for row in rows)
+    assert all(row["search_text"].startswith("person") for row in rows)
+
+    # Rows are current now, so the next load writes nothing
+    batches.clear()
+    storage.warm()
+    assert batches == []
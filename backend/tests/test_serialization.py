@@ -0,0 +1,42 @@
+import json
+import pytest
+from fastapi.encoders import jsonable_encoder
+from app.main import SearchResponse
+from app.services.serialization import FastJSONResponse, dumps
+
+
+def test_profiles_encode_like_fastapi(make_profile):
+    profile = make_profile(technical_skills=["Python"], portfolio_url="https://example.com")
+    results = [SearchResponse(profile=profile, explanation="Matched", score=0.5)]
+    assert json.loads(dumps(results)) == jsonable_encoder(results)
+    assert json.loads(dumps(profile))["id"] == str(profile.id)
+
+
+def test_search_document_stays_private(make_profile):
+    from app.services.search_document import search_document
+    profile = make_profile()
+    search_document(profile)
+    assert "search_text" not in json.loads(dumps(profile))
+
+
+def test_rows_and_plain_values_pass_through():
+    page = {"items": [{"id": "1", "name": "Ada Lovelace"}], "next_cursor": None}
+    assert json.loads(dumps(page)) == page
+
+
+def test_unknown_types_raise():
+    with pytest.raises(TypeError):
+        dumps({"value": object()})
+
+
+def test_fast_json_response_renders_with_orjson(make_profile):
+    response = FastJSONResponse([make_profile()])
+    assert response.media_type == "application/json"
+    assert json.loads(response.body)[0]["name"] == "Ada Lovelace"
+
+
+def test_get_profile_endpoint_round_trips(client):
+    created = client.post("/api/profiles", json={"name": "Serial Person", "projects": ["A compiler"],
+                                                 "mentoring_preferences": "Happy to mentor on weekends"}).json()
+    fetched = client.get(f"/api/profiles/{created['id']}").json()
+    assert fetched == created
@@ -0,0 +1,85 @@
+import json
+import re
+import threading
+import time
+from types import SimpleNamespace
+import pytest
+from app.services.groq_search import GroqSearchService
+from app.services.prompt_builder import PromptBuilder
+
+
+class FakeClient:
+    """Scores every profile alias in the prompt; prompts containing `fail_on` raise, `slow_on` sleep."""
+
+    def __init__(self, fail_on=None, slow_on=None):
+        self.fail_on = fail_on
+        self.slow_on = slow_on
+        self.prompts = []
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, messages, **options):
+        prompt = messages[-1]["content"]
+        with self._lock:
+            self.prompts.append(prompt)
+        if self.fail_on and self.fail_on in prompt:
+            raise RuntimeError("shard failed")
+        if self.slow_on and self.slow_on in prompt:
+            time.sleep(1)
+        matches = [
+            {"profile_id": int(alias), "match_score": int(number), "explanation": "fits"}
+            for alias, number in re.findall(r"^(\d+)\|Person (\d+)\|", prompt, re.MULTILINE)
+        ]
+        content = json.dumps({"matches": matches})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def service(client, **options):
+    registry = SimpleNamespace(get=lambda api_key: client)
+    return GroqSearchService(client_registry=registry, prompt_builder=PromptBuilder(max_prompt_tokens=100000), **options)
+
+
+@pytest.fixture
+def profiles(make_profile):
+    return [make_profile(f"Person {i}", technical_skills=["Python"]) for i in range(10)]
+
+
+def test_shards_cover_profiles_in_order(profiles):
+    shards = PromptBuilder(max_prompt_tokens=100000).shard("python", profiles, max_profiles=3)
+    assert [shard.included for shard in shards] == [3, 3, 3, 1]
+    assert [p for shard in shards for p in shard.refs.values()] == profiles
+
+
+def test_max_shards_drops_the_tail(profiles):
+    shards = PromptBuilder(max_prompt_tokens=100000).shard("python", profiles, max_profiles=3, max_shards=2)
+    assert sum(shard.included for shard in shards) == 6
+
+
+def test_oversized_profile_is_skipped(make_profile):
+    small = make_profile("Person 1")
+    huge = make_profile("Person 2", projects=[f"project {i} " * 20 for i in range(200)])
+    builder = PromptBuilder(mode="verbose", max_prompt_tokens=800)
+    shards = builder.shard("python", [huge, small])
+    assert [p for shard in shards for p in shard.refs.values()] == [small]
+
+
+def test_shard_results_are_merged_by_score(profiles):
+    client = FakeClient()
+    results = service(client, shard_size=3, max_shards=4).search_profiles("python", profiles, "gsk_test")
+    assert len(client.prompts) == 4
+    assert [score for _, score, _ in results] == sorted(range(10), reverse=True)
+    assert {str(p.id) for p, _, _ in results} == {str(p.id) for p in profiles}
+
+
+def test_failed_shard_is_left_out(profiles):
+    client = FakeClient(fail_on="|Person 3|")
+    results = service(client, shard_size=3).search_profiles("python", profiles, "gsk_test")
+    assert sorted(score for _, score, _ in results) == [0, 1, 2, 6, 7, 8, 9]
+
+
+def test_slow_shard_misses_the_timeout(profiles):
+    client = FakeClient(slow_on="|Person 0|")
+    start = time.monotonic()
+    results = service(client, shard_size=5, shard_timeout=0.3).search_profiles("python", profiles, "gsk_test")
+    assert time.monotonic() - start < 0.9
+    assert sorted(score for _, score, _ in results) == [5, 6, 7, 8, 9]
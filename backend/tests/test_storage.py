@@ -0,0 +1,97 @@
+import os
+import uuid
+import pytest
+from app.services import storage as storage_module
+from app.services.sqlite_db import SQLiteDatabaseService
+from app.services.storage import document_row
+
+
+@pytest.fixture(params=["sqlite-memory", "sqlite-file", "supabase"])
+def storage(request, tmp_path, monkeypatch):
+    """Every storage backend; Supabase only runs against a project configured for tests."""
+    if request.param == "sqlite-memory":
+        return SQLiteDatabaseService(":memory:")
+    if request.param == "sqlite-file":
+        return SQLiteDatabaseService(str(tmp_path / "profiles.db"))
+    if not os.getenv("SUPABASE_TEST_URL") or not os.getenv("SUPABASE_TEST_KEY"):
+        pytest.skip("SUPABASE_TEST_URL and SUPABASE_TEST_KEY are not set")
+    from app.services.db import DatabaseService
+    monkeypatch.setenv("SUPABASE_URL", os.environ["SUPABASE_TEST_URL"])
+    monkeypatch.setenv("SUPABASE_KEY", os.environ["SUPABASE_TEST_KEY"])
+    return DatabaseService()
+
+
+@pytest.fixture
+def run_name():
+    """Name prefix unique to the test, since a shared Supabase table may hold other rows."""
+    return f"Test {uuid.uuid4().hex[:8]}"
+
+
+def test_create_and_get(storage, make_profile, run_name):
+    created = storage.create_profile(make_profile(run_name, technical_skills=["Python"], ai_expertise=["ML"]))
+    assert created.name == run_name
+    assert created.ai_expertise_ids == ["machine-learning"]
+
+    # Drop the in-memory copy so the row is read back from the backend
+    storage.profile_store.load([])
+    fetched = storage.get_profile(str(created.id))
+    assert fetched == created
+    assert storage.get_profile(str(uuid.uuid4())) is None
+
+
+def test_create_profiles_and_list(storage, make_profile, run_name):
+    created = storage.create_profiles([make_profile(f"{run_name} {i}") for i in range(3)])
+    assert storage.create_profiles([]) == []
+    warmed = {str(p.id) for p in storage.warm()}
+    assert {str(p.id) for p in created} <= warmed
+    assert storage.profile_store.complete
+    assert {str(p.id) for p in storage.list_profiles()} == warmed
+
+
+def test_pagination_visits_each_profile_once(storage, make_profile, run_name):
+    created = {str(p.id) for p in storage.create_profiles([make_profile(f"{run_name} {i}") for i in range(5)])}
+    seen, cursor = [], None
+    while True:
+        rows, cursor = storage.list_profiles_page(2, cursor, ["name"])
+        assert all(set(row) == {"id", "name"} for row in rows)
+        seen.extend(row["id"] for row in rows)
+        if cursor is None:
+            break
+    assert len(seen) == len(set(seen))
+    assert created <= set(seen)
+    with pytest.raises(ValueError):
+        storage.list_profiles_page(2, "garbage")
+
+
+def test_reconcile_returns_only_unknown_profiles(storage, make_profile, run_name):
+    first, *rest = storage.create_profiles([make_profile(f"{run_name} {i}") for i in range(3)])
+    storage.seed([first])
+    new = {str(p.id) for p in storage.reconcile()}
+    assert {str(p.id) for p in rest} <= new
+    assert str(first.id) not in new
+    assert storage.reconcile() == []
+
+
+def test_full_reads_page_past_the_per_request_row_cap(storage, make_profile, run_name, monkeypatch):
+    fetch_page = storage._fetch_page
+    pages = []
+
+    def capped(columns, limit, after):
+        # Like Supabase's max-rows: never more than two rows per select, whatever the limit
+        pages.append(after)
+        return fetch_page(columns, min(limit, 2), after)
+
+    monkeypatch.setattr(storage_module, "FETCH_PAGE_SIZE", 3)
+    monkeypatch.setattr(storage, "_fetch_page", capped)
+    created = storage.create_profiles([make_profile(f"{run_name} {i}") for i in range(7)])
+    assert {p.id for p in created} <= {p.id for p in storage.warm()}
+    assert len(pages) >= 5
+
+    # Rows written by another process after the high-water mark, more than one page of them
+    later = [make_profile(f"{run_name} later {i}") for i in range(5)]
+    storage._insert_rows([document_row(p) for p in later])
+    assert {p.id for p in storage.reconcile()} == {p.id for p in later}
+
+    # Without a high-water mark, the id scan is paged as well
+    storage.seed(created[:1])
+    assert {p.id for p in created[1:] + later} <= {p.id for p in storage.reconcile()}
@@ -0,0 +1,78 @@
+import json
+from app import main
+from app.services.stream_parser import MatchStreamParser
+
+DOCUMENT = json.dumps({"matches": [
+    {"profile_id": "1", "match_score": 90, "explanation": "Knows {Rust} and \"Go\""},
+    {"profile_id": "2", "match_score": 70, "explanation": "Nested [brackets] \\ too"},
+]})
+
+
+def test_parser_yields_each_object_once_complete():
+    parser = MatchStreamParser()
+    completed = []
+    for i in range(0, len(DOCUMENT), 7):
+        completed.extend(parser.feed(DOCUMENT[i:i + 7]))
+    assert completed == json.loads(DOCUMENT)["matches"]
+
+
+def test_parser_returns_object_before_document_ends():
+    parser = MatchStreamParser()
+    first_end = DOCUMENT.index("}, {") + 1
+    assert parser.feed(DOCUMENT[:first_end - 1]) == []
+    assert [m["profile_id"] for m in parser.feed(DOCUMENT[first_end - 1:first_end])] == ["1"]
+
+
+def test_parser_ignores_text_around_the_document_and_bad_objects():
+    parser = MatchStreamParser()
+    text = 'Sure! {"matches": [{"profile_id": 1, oops}, {"profile_id": "3"}]} Done.'
+    assert parser.feed(text) == [{"profile_id": "3"}]
+
+
+def _events(client, payload):
+    with client.stream("POST", "/api/search/stream", json=payload) as response:
+        assert response.status_code == 200
+        return [json.loads(line) for line in response.iter_lines() if line]
+
+
+def test_stream_endpoint_emits_provisional_matches_and_done(client, monkeypatch):
+    client.post("/api/profiles", json={"name": "Stream Tester", "technical_skills": ["Haskell"],
+                                        "mentoring_preferences": "Happy to mentor on weekends"})
+    calls = []
+
+    def fake_stream(query, profiles, api_key):
+        calls.append(query)
+        for profile in profiles:
+            yield profile, 80.0, "Match Score: 80%\nstreamed"
+
+    monkeypatch.setattr(main.groq_service, "stream_search_profiles", fake_stream)
+    payload = {"query": "haskell", "use_groq": True, "groq_api_key": "gsk_test"}
+    events = _events(client, payload)
+    assert events[0]["type"] == "provisional"
+    # The app is shared across tests, so other profiles may be shortlisted too
+    matches = [e["result"]["profile"]["name"] for e in events if e["type"] == "match"]
+    assert matches.count("Stream Tester") == 1
+    assert events[-1] == {"type": "done", "count": len(matches)}
+
+    # The repeat is replayed from the cache without another Groq call
+    assert _events(client, payload)[1:] == events[1:]
+    assert len(calls) == 1
+
+
+def test_streamed_results_are_not_served_to_batch_search(client, monkeypatch):
+    client.post("/api/profiles", json={"name": "Stream Only", "technical_skills": ["Erlang"],
+                                        "mentoring_preferences": "Happy to mentor on weekends"})
+
+    def fake_stream(query, profiles, api_key):
+        for profile in profiles:
+            yield profile, 60.0, "Match Score: 60%\nstreamed"
+
+    async def fake_search(query, profiles, api_key):
+        return [(profile, 95.0, "Match Score: 95%\nbatch") for profile in profiles]
+
+    monkeypatch.setattr(main.groq_service, "stream_search_profiles", fake_stream)
+    monkeypatch.setattr(main.groq_service, "search_profiles_async", fake_search)
+    payload = {"query": "erlang", "use_groq": True, "groq_api_key": "gsk_test"}
+    _events(client, payload)
+    results = client.post("/api/search", json=payload).json()
+    assert [r["score"] for r in results if r["profile"]["name"] == "Stream Only"] == [95.0]
@@ -0,0 +1,76 @@
+import pytest
+from app.services.facets import FacetIndex
+from app.services.neighbors import profile_tags
+from app.services.taxonomy import SkillTaxonomy, tag_key
+
+
+@pytest.fixture
+def taxonomy():
+    return SkillTaxonomy()
+
+
+@pytest.mark.parametrize("raw", ["ML", "machine learning", "Machine-Learning", "machinelearning", " MACHINE_LEARNING "])
+def test_spelling_variants_share_an_id(taxonomy, raw):
+    assert taxonomy.canonicalize(raw).id == "machine-learning"
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("Pytorhc", "pytorch"),
+    ("Kubernets", "kubernetes"),
+    ("Machine Lerning", "machine-learning"),
+])
+def test_fuzzy_matching_fixes_typos(taxonomy, raw, expected):
+    assert taxonomy.canonicalize(raw).id == expected
+
+
+@pytest.mark.parametrize("raw", ["Generative Art", "Generative Arts", "Deep Sea Learning"])
+def test_fuzzy_matching_needs_every_word_to_match(taxonomy, raw):
+    tag = taxonomy.canonicalize(raw)
+    assert not tag.known
+    assert tag.label == raw
+
+
+def test_unknown_tags_keep_a_slug_and_blank_tags_are_dropped(taxonomy):
+    assert taxonomy.canonicalize("Quantum  Knitting") == ("quantum-knitting", "Quantum Knitting", False)
+    assert taxonomy.canonicalize("  ") is None
+    assert tag_key("CI/CD") == "ci cd"
+
+
+def test_canonical_ids_deduplicate_in_order(taxonomy):
+    assert taxonomy.canonical_ids(["Py", "Rust", "python3", ""]) == ["python", "rust"]
+
+
+def test_find_in_text_prefers_longest_alias(taxonomy):
+    assert taxonomy.find_in_text("node js and natural language processing mentors") == ["node-js", "nlp"]
+    assert taxonomy.find_in_text("pytorhc") == []
+
+
+def test_load_extends_the_taxonomy(taxonomy, tmp_path):
+    path = tmp_path / "taxonomy.json"
+    path.write_text('{"elixir": {"label": "Elixir", "aliases": ["ex"]}}')
+    taxonomy.load(str(path))
+    assert taxonomy.canonicalize("EX") == ("elixir", "Elixir", True)
+
+
+def test_profile_ids_prefer_stored_ids(taxonomy, make_profile):
+    legacy = make_profile(technical_skills=["Py"])
+    assert taxonomy.profile_ids(legacy, "technical_skills") == ["python"]
+    stored = make_profile(technical_skills=["Py"], technical_skill_ids=["python", "snake-charming"])
+    assert taxonomy.profile_ids(stored, "technical_skills") == ["python", "snake-charming"]
+
+
+def test_profile_labels_use_taxonomy_label_or_own_spelling(taxonomy, make_profile):
+    profile = taxonomy.canonicalize_profile(make_profile(technical_skills=["py", "Quantum Knitting"]))
+    assert taxonomy.profile_labels(profile, "technical_skills") == {
+        "python": "Python", "quantum-knitting": "Quantum Knitting",
+    }
+
+
+def test_facets_and_neighbors_read_stored_ids(make_profile):
+    # The ids stored at write time win over re-canonicalizing the raw tags
+    profile = make_profile(technical_skills=["Py"], technical_skill_ids=["rust"])
+    index = FacetIndex()
+    index.add(profile)
+    assert index.counts()["technical_skills"] == [("Rust", 1)]
+    assert index.match([("technical_skills", ["Python"], True)]) == 0
+    assert profile_tags(profile) == {"rust": "Rust"}
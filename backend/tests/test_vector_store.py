@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+from app.services.embeddings import HashingEmbedder, VectorIndex
+from app.services.vector_store import VectorStore, dequantize, quantize
+
+
+def unit_vectors(count: int, dim: int = 8) -> np.ndarray:
+    vectors = np.random.default_rng(0).normal(size=(count, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+@pytest.mark.parametrize("dtype, tolerance", [("int8", 0.01), ("float16", 0.001)])
+def test_quantization_round_trips(dtype, tolerance):
+    vectors = unit_vectors(5)
+    assert np.abs(dequantize(quantize(vectors, dtype)) - vectors).max() < tolerance
+
+
+def test_in_memory_store_appends_and_replaces():
+    store = VectorStore(8)
+    a, b, c = unit_vectors(3)
+    assert store.append([("a", a), ("b", b)]) == 2
+    assert store.append([("a", c)], skip_existing=True) == 0
+    assert np.allclose(store.get("a"), a, atol=0.01)
+    store.append([("a", c)])
+    assert np.allclose(store.get("a"), c, atol=0.01)
+    assert len(store) == 2 and store.get("missing") is None
+    scores = store.scores(b, np.array([store.offset("b"), store.offset("a")]))
+    assert scores[0] == pytest.approx(1.0, abs=0.02)
+
+
+def test_file_store_is_shared_between_processes(tmp_path):
+    path = str(tmp_path / "vectors.bin")
+    writer, reader = VectorStore(8, path), VectorStore(8, path)
+    reader.open()
+    a, b = unit_vectors(2)
+    writer.append([("a", a)])
+    assert "a" not in reader
+    assert reader.refresh() == 1
+    assert np.allclose(reader.get("a"), a, atol=0.01)
+
+    # A record written without its key (a writer that died mid-append) is dropped by the next append
+    with open(path, "ab") as f:
+        f.write(b"\0" * 5)
+    writer.append([("b", b)])
+    reopened = VectorStore(8, path)
+    reopened.open()
+    assert np.allclose(reopened.get("b"), b, atol=0.01)
+
+
+def test_file_with_other_layout_is_rejected(tmp_path):
+    path = str(tmp_path / "vectors.bin")
+    VectorStore(8, path).open()
+    with pytest.raises(ValueError):
+        VectorStore(16, path).open()
+    with pytest.raises(ValueError):
+        VectorStore(8, path, dtype="float16").open()
+
+
+class LockCheckingEmbedder(HashingEmbedder):
+    """Fails if a vector is embedded while the store's file lock is held."""
+
+    def __init__(self, store: VectorStore):
+        super().__init__(dim=64)
+        self.store = store
+        self.embedded = 0
+
+    def embed(self, text: str) -> np.ndarray:
+        assert self.store._lock_depth == 0, "embedding while holding the store lock"
+        self.embedded += 1
+        return super().embed(text)
+
+
+def test_index_embeds_outside_the_store_lock(tmp_path, make_profile):
+    store = VectorStore(64, str(tmp_path / "vectors.bin"))
+    embedder = LockCheckingEmbedder(store)
+    index = VectorIndex(embedder, store)
+    assert index.build([make_profile("Ann Lee"), make_profile("Bea Ray")]) == 2
+    index.add(make_profile("Cal Fox"))
+    assert embedder.embedded == 3 and len(index) == 3
+
+
+def test_vectors_are_keyed_by_content(tmp_path, make_profile):
+    path = str(tmp_path / "vectors.bin")
+    index = VectorIndex(HashingEmbedder(64), VectorStore(64, path))
+    profile = make_profile("Ann Lee", technical_skills=["Rust"])
+    index.add(profile)
+    assert [p.name for p, _ in index.search("rust")] == ["Ann Lee"]
+
+    # The same id with new content gets a new vector instead of the stale one
+    updated = make_profile("Ann Lee", id=profile.id, technical_skills=["Haskell"])
+    index.add(updated)
+    assert len(index) == 1
+    assert index.search("rust") == []
+    assert [p.technical_skills for p, _ in index.search("haskell")] == [["Haskell"]]
+
+    # A second worker finds both vectors in the shared file and embeds nothing
+    other = VectorIndex(HashingEmbedder(64), VectorStore(64, path))
+    assert other.build([updated]) == 0
@@ -1,8 +1,10 @@
 import streamlit as st
 import requests
-from typing import Dict, List
+import json
+from typing import Dict, Iterator, List, Optional
 import os
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
 
 # Load environment variables
 load_dotenv()
@@ -15,6 +17,19 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Seconds that list, profile and keyword search responses are reused across reruns
+CACHE_TTL = int(os.getenv("FRONTEND_CACHE_TTL", "60"))
+MIN_QUERY_LENGTH = 2
+
+@st.cache_resource
+def get_session() -> requests.Session:
+    """One pooled HTTP session shared by every rerun and browser session."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=int(os.getenv("API_POOL_SIZE", "20")))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
 # API client setup
 class APIClient:
     def __init__(self):
@@ -33,6 +48,7 @@ class APIClient:
         
         # Remove trailing slash if present and add /api prefix
         self.base_url = f"{base_url.rstrip('/')}/api"
+        self.session = get_session()
         
         # Display API URL in sidebar (only in development)
         if environment == "development":
@@ -64,7 +80,7 @@ class APIClient:
     def get(self, endpoint: str):
         try:
             url = self._get_endpoint_url(endpoint)
-            response = requests.get(url)
+            response = self.session.get(url)
             return self._handle_response(response)
         except requests.ConnectionError:
             st.error("Could not connect to the API. Please check if the server is running.")
@@ -75,10 +91,40 @@ class APIClient:
 
 api = APIClient()
 
+# Cached fetches raise on failure so errors are reported by the callers and never cached
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _fetch_profiles_page(url: str, cursor: Optional[str], fields: str, limit: int) -> dict:
+    params = {"limit": limit, "fields": fields}
+    if cursor:
+        params["cursor"] = cursor
+    response = get_session().get(url, params=params)
+    response.raise_for_status()
+    return response.json()
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _fetch_keyword_search(url: str, query: str) -> List[dict]:
+    response = get_session().post(url, json={"query": query, "use_groq": False})
+    response.raise_for_status()
+    return response.json()
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _fetch_profile(url: str) -> dict:
+    response = get_session().get(url)
+    response.raise_for_status()
+    return response.json()
+
+def invalidate_profile_caches():
+    """Drop cached listings and searches so a newly created profile shows up immediately."""
+    _fetch_profiles_page.clear()
+    _fetch_keyword_search.clear()
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.split())
+
 def create_profile(profile_data: dict):
     try:
         url = api._get_endpoint_url('profiles')
-        response = requests.post(url, json=profile_data)
+        response = api.session.post(url, json=profile_data)
         if response.status_code == 422:
             error_detail = response.json().get('detail', [])
             if isinstance(error_detail, list):
@@ -90,6 +136,7 @@ def create_profile(profile_data: dict):
         elif not response.ok:
             st.error(f"Server Error: {response.status_code}")
             return None
+        invalidate_profile_caches()
         return response.json()
     except requests.exceptions.ConnectionError:
         st.error("Could not connect to the server. Please make sure the backend is running.")
@@ -101,21 +148,26 @@ def create_profile(profile_data: dict):
 def search_profiles(query: str, groq_api_key: str = None):
     try:
         url = api._get_endpoint_url('search')
+        if not groq_api_key:
+            # Keyword results are cached per normalized query
+            return _fetch_keyword_search(url, normalize_query(query))
         # Include Groq API key in request if provided
         payload = {
             "query": query,
-            "use_groq": bool(groq_api_key),
+            "use_groq": True,
             "groq_api_key": groq_api_key
         }
-        response = requests.post(url, json=payload)
-        
-        if not response.ok:
-            if response.status_code == 422:
-                st.error("Invalid search query format")
-            else:
-                st.error(f"Search failed with status code: {response.status_code}")
-            return []
+        response = api.session.post(url, json=payload)
+        response.raise_for_status()
         return response.json()
+    except requests.HTTPError as e:
+        if e.response.status_code == 422:
+            st.error("Invalid search query format")
+        elif e.response.status_code == 429:
+            st.warning("Search is busy right now, please try again in a moment.")
+        else:
+            st.error(f"Search failed with status code: {e.response.status_code}")
+        return []
     except requests.ConnectionError:
         st.error("Could not connect to the server. Please make sure the backend is running.")
         return []
@@ -123,20 +175,83 @@ def search_profiles(query: str, groq_api_key: str = None):
         st.error(f"An unexpected error occurred during search: {str(e)}")
         return []
 
-def list_profiles():
+def search_profiles_stream(query: str, groq_api_key: str) -> Iterator[dict]:
+    """Yield search events from the streaming endpoint as they arrive."""
     try:
-        url = api._get_endpoint_url('profiles')
-        response = requests.get(url)
-        if not response.ok:
-            st.error(f"Failed to fetch profiles: {response.status_code}")
-            return []
-        return response.json()
+        url = api._get_endpoint_url('search/stream')
+        payload = {
+            "query": query,
+            "use_groq": True,
+            "groq_api_key": groq_api_key
+        }
+        with api.session.post(url, json=payload, stream=True) as response:
+            if not response.ok:
+                if response.status_code == 422:
+                    st.error("Invalid search query format")
+                elif response.status_code == 429:
+                    st.warning("Search is busy right now, please try again in a moment.")
+                else:
+                    st.error(f"Search failed with status code: {response.status_code}")
+                return
+            for line in response.iter_lines(decode_unicode=True):
+                if line:
+                    yield json.loads(line)
+    except requests.ConnectionError:
+        st.error("Could not connect to the server. Please make sure the backend is running.")
+    except Exception as e:
+        st.error(f"An unexpected error occurred during search: {str(e)}")
+
+# Fields fetched for the profile list view; full profiles are loaded on demand
+LIST_FIELDS = "name,technical_skills,ai_expertise"
+PAGE_SIZE = 20
+
+def list_profiles(cursor: str = None, fields: str = LIST_FIELDS, limit: int = PAGE_SIZE) -> Optional[dict]:
+    """Fetch one page of profiles. Returns a dict with "items" and "next_cursor", or None if the fetch failed."""
+    try:
+        return _fetch_profiles_page(api._get_endpoint_url('profiles'), cursor, fields, limit)
+    except requests.HTTPError as e:
+        st.error(f"Failed to fetch profiles: {e.response.status_code}")
     except requests.ConnectionError:
         st.error("Could not connect to the server. Please make sure the backend is running.")
-        return []
     except Exception as e:
         st.error(f"An unexpected error occurred while fetching profiles: {str(e)}")
-        return []
+    return None
+
+def get_profile(profile_id: str):
+    try:
+        return _fetch_profile(api._get_endpoint_url(f"profiles/{profile_id}"))
+    except requests.HTTPError as e:
+        # Reuse the client's error reporting for failed lookups
+        return api._handle_response(e.response)
+    except requests.ConnectionError:
+        st.error("Could not connect to the API. Please check if the server is running.")
+        return None
+
+def render_profile_details(profile: dict):
+    st.write("**Technical Skills:**", ", ".join(profile.get("technical_skills", [])))
+    st.write("**AI Expertise:**", ", ".join(profile.get("ai_expertise", [])))
+    if "projects" in profile:
+        st.write("**Projects:**", ", ".join(profile["projects"]))
+    if "mentoring_preferences" in profile:
+        st.write("**Mentoring Preferences:**", profile["mentoring_preferences"])
+    if "collaboration_interests" in profile:
+        st.write("**Collaboration Interests:**", ", ".join(profile["collaboration_interests"]))
+    if profile.get("portfolio_url"):
+        st.write("**Portfolio:**", profile["portfolio_url"])
+
+def render_search_results(results: List[dict], title: str):
+    st.subheader(title)
+    for result in results:
+        profile = result['profile']
+        explanation = result.get('explanation', 'Matched based on keyword search')
+        
+        with st.expander(f"{profile['name']}"):
+            # Display match explanation
+            st.markdown(f"**Match Analysis:**\n{explanation}")
+            st.markdown("---")
+            
+            # Display profile details
+            render_profile_details(profile)
 
 # UI Components
 st.title("100xEngineers Discovery Platform 🚀")
@@ -205,51 +320,83 @@ elif page == "Search Profiles":
     - "Need a collaborator for an open source AI project"
     """)
     
-    # Search interface
-    query = st.text_input("Enter your search query")
+    # Search interface; the text input only reruns the page once Enter is pressed or it loses focus,
+    # and repeated keyword queries are answered from the cache
+    query = normalize_query(st.text_input("Enter your search query"))
     
-    if query:
+    if query and len(query) < MIN_QUERY_LENGTH:
+        st.info(f"Enter at least {MIN_QUERY_LENGTH} characters to search.")
+    elif query:
         if not groq_api_key:
             st.info("ℹ️ Using basic keyword search. For better results, configure Groq API key above.")
-        
-        results = search_profiles(query, groq_api_key)
-        
-        if results:
-            st.subheader(f"Found {len(results)} matches")
-            for result in results:
-                profile = result['profile']
-                explanation = result.get('explanation', 'Matched based on keyword search')
-                
-                with st.expander(f"{profile['name']}"):
-                    # Display match explanation
-                    st.markdown(f"**Match Analysis:**\n{explanation}")
-                    st.markdown("---")
-                    
-                    # Display profile details
-                    st.write("**Technical Skills:**", ", ".join(profile["technical_skills"]))
-                    st.write("**AI Expertise:**", ", ".join(profile["ai_expertise"]))
-                    st.write("**Projects:**", ", ".join(profile["projects"]))
-                    st.write("**Mentoring Preferences:**", profile["mentoring_preferences"])
-                    st.write("**Collaboration Interests:**", ", ".join(profile["collaboration_interests"]))
-                    if profile.get("portfolio_url"):
-                        st.write("**Portfolio:**", profile["portfolio_url"])
+            
+            results = search_profiles(query, groq_api_key)
+            
+            if results:
+                render_search_results(results, f"Found {len(results)} matches")
+            else:
+                st.info("No matching profiles found. Try adjusting your search query.")
         else:
-            st.info("No matching profiles found. Try adjusting your search query.")
+            # Render keyword matches immediately, then replace them with Groq matches as they stream in
+            results_placeholder = st.empty()
+            matches = []
+            provisional = []
+            finished = False
+            with st.spinner("Analyzing profiles with Groq..."):
+                for event in search_profiles_stream(query, groq_api_key):
+                    if event["type"] == "provisional":
+                        provisional = event["results"]
+                        if provisional:
+                            with results_placeholder.container():
+                                render_search_results(provisional, f"Quick keyword matches ({len(provisional)})")
+                    elif event["type"] == "match":
+                        matches.append(event["result"])
+                        with results_placeholder.container():
+                            render_search_results(matches, f"Found {len(matches)} matches so far...")
+                    elif event["type"] == "error":
+                        st.warning("Groq search failed, showing keyword matches instead.")
+                    elif event["type"] == "done":
+                        finished = True
+            
+            if matches:
+                with results_placeholder.container():
+                    render_search_results(matches, f"Found {len(matches)} matches")
+            elif finished and not provisional:
+                st.info("No matching profiles found. Try adjusting your search query.")
 
 else:  # View All Profiles
     st.header("All Profiles")
     
-    profiles = list_profiles()
+    # Every shown page is re-read through the TTL-cached fetcher on each run, so new
+    # profiles show up once the cache expires; session state only keeps the cursors
+    # of the pages added with "Load more"
+    st.session_state.setdefault("profile_cursors", [])
+    st.session_state.setdefault("profile_details", {})
+    profiles, next_cursor, failed = [], None, False
+    for page_cursor in [None] + st.session_state.profile_cursors:
+        page = list_profiles(cursor=page_cursor)
+        if page is None:
+            failed = True
+            break
+        profiles.extend(page["items"])
+        next_cursor = page["next_cursor"]
+        if not next_cursor:
+            break
     
     if profiles:
         for profile in profiles:
             with st.expander(f"{profile['name']}"):
-                st.write("**Technical Skills:**", ", ".join(profile["technical_skills"]))
-                st.write("**AI Expertise:**", ", ".join(profile["ai_expertise"]))
-                st.write("**Projects:**", ", ".join(profile["projects"]))
-                st.write("**Mentoring Preferences:**", profile["mentoring_preferences"])
-                st.write("**Collaboration Interests:**", ", ".join(profile["collaboration_interests"]))
-                if profile.get("portfolio_url"):
-                    st.write("**Portfolio:**", profile["portfolio_url"])
-    else:
-        st.info("No profiles found. Create one to get started!") 
\ No newline at end of file
+                details = st.session_state.profile_details.get(profile["id"], profile)
+                render_profile_details(details)
+                if profile["id"] not in st.session_state.profile_details:
+                    if st.button("Show full profile", key=f"details_{profile['id']}"):
+                        if full_profile := get_profile(profile["id"]):
+                            st.session_state.profile_details[profile["id"]] = full_profile
+                            st.rerun()
+        
+        if next_cursor and not failed:
+            if st.button("Load more profiles"):
+                st.session_state.profile_cursors.append(next_cursor)
+                st.rerun()
+    elif not failed:
+        st.info("No profiles found. Create one to get started!")